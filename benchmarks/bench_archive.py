@@ -0,0 +1,114 @@
+"""
+Benchmark: compression ratio and read latency of the archive cold tier.
+
+Writes N synthetic job summaries (100k by default) into a segmented
+archive in batches of five, as job_logs/recent.md sweeps would, then
+compares the hot tier against the zlib and lzma cold tiers:
+
+- bytes on disk and compression ratio
+- point-read latency (by_id on random job IDs, index already loaded)
+- full scan latency (streaming every segment, as render() does)
+
+Usage:
+    python benchmarks/bench_archive.py [--entries N] [--reads N]
+"""
+import argparse
+import pathlib
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from contextcascade.archive import Archive  # noqa: E402
+from contextcascade.buffers import format_entry  # noqa: E402
+
+DOMAINS = ("client", "server", "schema")
+VERBS = ("Append route for", "Update schema of", "Prune stale notes in", "Merge summary for", "Refresh index of")
+
+
+def job_entry(n, rng):
+    domain = rng.choice(DOMAINS)
+    component = f"component_{rng.randrange(500):03d}"
+    return format_entry([
+        ("JobID", f"{n:012x}"),
+        ("Intent", f"{rng.choice(VERBS)} /{component} in the {domain} domain."),
+        ("Outcomes", f"`/cascade/domains/{domain}/index.md`, `/cascade/domains/{domain}/{component}.md`"),
+        ("Status", "success"),
+        ("Timestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1700000000 + n * 60))),
+    ])
+
+
+def build(root, entries, codec):
+    """
+    Fills a fresh archive with `entries` summaries. Returns (archive,
+    seconds).
+    """
+    summary = root / "job_logs" / "summary.md"
+    summary.parent.mkdir(parents=True, exist_ok=True)
+    summary.write_text("# Job Logs Summary\n\n---\n", encoding="utf-8")
+    archive = Archive(str(root), "cascade/job_logs/summary.md", codec=codec)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for batch in range(0, entries, 5):
+        blob = "".join(job_entry(n, rng) for n in range(batch, min(batch + 5, entries)))
+        archive.append(blob.encode("utf-8"))
+    if codec:
+        archive.compress_closed()
+    return archive, time.perf_counter() - start
+
+
+def point_reads(archive, entries, reads):
+    """
+    Returns per-read latencies in seconds for `reads` random by_id calls.
+    """
+    archive._load()
+    rng = random.Random(1)
+    latencies = []
+    for _ in range(reads):
+        job_id = f"{rng.randrange(entries):012x}"
+        start = time.perf_counter()
+        found = archive.by_id(job_id)
+        latencies.append(time.perf_counter() - start)
+        assert len(found) == 1, job_id
+    return latencies
+
+
+def full_scan(archive):
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in archive.iter_chunks())
+    return time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.entries} job summaries, {args.reads} random point reads")
+    print(f"{'tier':<6} {'write s':>8} {'stored':>12} {'ratio':>7} {'p50 read':>10} {'p99 read':>10} {'scan s':>8}")
+    for label, codec in (("hot", None), ("zlib", "zlib"), ("lzma", "lzma")):
+        tmp = tempfile.mkdtemp()
+        try:
+            root = pathlib.Path(tmp) / "cascade"
+            archive, write_time = build(root, args.entries, codec)
+            stats = archive.stats()
+            latencies = sorted(point_reads(archive, args.entries, args.reads))
+            scan_time, size = full_scan(archive)
+            assert size == stats["size"]
+            print(
+                f"{label:<6} {write_time:8.2f} {stats['stored']:12,d} {stats['size'] / stats['stored']:6.1f}x "
+                f"{statistics.median(latencies) * 1e6:8.1f}us {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f}us "
+                f"{scan_time:8.3f}"
+            )
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: serial vs parallel file emission in create_repo_structure().
+
+Builds a synthetic REPO_FILES-style mapping (10k entries by default, spread
+across nested directories) and scaffolds it into fresh temporary
+directories, once serially and once through the worker pool.
+
+Usage:
+    python benchmarks/bench_emit.py [--files N] [--workers N] [--size BYTES]
+"""
+import argparse
+import contextlib
+import io
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import create_repo  # noqa: E402
+
+
+def synthetic_files(count, size):
+    """
+    Returns a dict shaped like REPO_FILES with `count` entries of roughly
+    `size` bytes, 100 files per leaf directory.
+    """
+    body = ("lorem ipsum dolor sit amet " * (size // 27 + 1))[:size]
+    files = {}
+    for i in range(count):
+        domain = f"domain_{i // 1000:02d}"
+        group = f"group_{(i // 100) % 10:02d}"
+        files[f"cascade/domains/{domain}/{group}/file_{i:05d}.md"] = f"<!-- {i} -->\n{body}"
+    return files
+
+
+def run(files, workers, parent_dir=None):
+    """
+    Scaffolds `files` into a fresh temporary directory (under `parent_dir`
+    if given) and returns (elapsed seconds, summary). Console output is
+    captured so terminal speed does not skew the comparison.
+    """
+    with tempfile.TemporaryDirectory(dir=parent_dir) as tmp:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = create_repo.create_repo_structure(tmp, workers=workers, files=files)
+        return time.perf_counter() - start, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=create_repo.DEFAULT_EMIT_WORKERS)
+    parser.add_argument("--size", type=int, default=2048, help="Approximate bytes per file.")
+    parser.add_argument("--dir", default=None, help="Scaffold under this directory (e.g. a network mount).")
+    args = parser.parse_args()
+
+    files = synthetic_files(args.files, args.size)
+    print(f"{len(files)} files, ~{args.size} bytes each, {os.cpu_count()} CPUs")
+
+    serial_time, _ = run(files, None, args.dir)
+    parallel_time, summary = run(files, args.workers, args.dir)
+    print(f"serial:            {serial_time:8.3f} s")
+    print(f"parallel ({args.workers:>2} w):   {parallel_time:8.3f} s  ({serial_time / parallel_time:.2f}x)")
+    if summary["errors"]:
+        print(f"warning: {summary['errors']} files failed to write")
+
+
+if __name__ == "__main__":
+    main()
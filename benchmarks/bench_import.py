@@ -0,0 +1,129 @@
+"""
+Benchmark: import cost of create_repo and scaling of the template registry.
+
+1. Imports create_repo in fresh interpreters and reports the median import
+   time, the memory allocated during import, and the cost of materializing
+   a single template versus the whole set.
+2. Registers N on-disk templates through add_file_loader() and compares
+   registration time and memory against eagerly reading and stripping them,
+   for growing N.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--sizes 100,1000,10000]
+"""
+import argparse
+import functools
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import create_repo  # noqa: E402
+
+# Executed in a fresh interpreter so each run pays the real import cost.
+IMPORT_PROBE = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, sys.argv[1])
+tracemalloc.start()
+start = time.perf_counter()
+import create_repo
+import_s = time.perf_counter() - start
+import_bytes = tracemalloc.get_traced_memory()[0]
+start = time.perf_counter()
+create_repo.REPO_FILES["cascade/index.md"]
+one_s = time.perf_counter() - start
+start = time.perf_counter()
+for path in create_repo.REPO_FILES:
+    create_repo.REPO_FILES[path]
+all_s = time.perf_counter() - start
+print(json.dumps({"import_s": import_s, "import_bytes": import_bytes, "one_s": one_s, "all_s": all_s}))
+"""
+
+
+def probe_import(runs):
+    """
+    Returns the per-run probe results for `runs` fresh interpreters.
+    """
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE, str(REPO_ROOT)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(out))
+    return results
+
+
+def measure(fn):
+    """
+    Returns (elapsed seconds, bytes still allocated) for calling fn().
+    The return value of fn() is kept alive until measurement ends.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = fn()
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return elapsed, allocated
+
+
+def scaling(sizes, template_bytes=4096):
+    """
+    Compares lazy loader registration against eager read+strip as the
+    number of templates grows.
+    """
+    body = "x" * template_bytes
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(max(sizes)):
+            path = pathlib.Path(tmp) / f"template_{i:05d}.md"
+            path.write_text(f"\n{body}\n", encoding="utf-8")
+            paths.append(path)
+
+        for n in sizes:
+            def lazy():
+                registry = create_repo.TemplateRegistry()
+                for path in paths[:n]:
+                    registry.register(path.name, functools.partial(path.read_text, encoding="utf-8"))
+                return registry
+
+            def eager():
+                return {path.name: path.read_text(encoding="utf-8").strip() for path in paths[:n]}
+
+            lazy_s, lazy_bytes = measure(lazy)
+            eager_s, eager_bytes = measure(eager)
+            print(
+                f"{n:>6} templates   lazy: {lazy_s * 1000:8.2f} ms {lazy_bytes / 1024:9.1f} KiB"
+                f"   eager: {eager_s * 1000:8.2f} ms {eager_bytes / 1024:9.1f} KiB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    args = parser.parse_args()
+
+    results = probe_import(args.runs)
+    median = lambda key: statistics.median(r[key] for r in results)  # noqa: E731
+    print(f"create_repo: {len(create_repo.REPO_FILES)} templates, {args.runs} fresh interpreters")
+    print(f"  import:             {median('import_s') * 1000:8.2f} ms, {median('import_bytes') / 1024:.1f} KiB allocated")
+    print(f"  one template:       {median('one_s') * 1e6:8.2f} us")
+    print(f"  all templates:      {median('all_s') * 1000:8.2f} ms")
+    print()
+    scaling([int(n) for n in args.sizes.split(",")])
+
+
+if __name__ == "__main__":
+    main()
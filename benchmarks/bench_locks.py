@@ -0,0 +1,148 @@
+"""
+Benchmark: concurrent loops on disjoint domains, per-scope vs single lock.
+
+Copies the cascade into a temporary directory, adds one synthetic domain
+per agent, and runs the agents as separate processes. Each agent runs
+LoopController.run() repeatedly with a job plan that rewrites several
+files in its own domain. The same workload is run twice: with the
+per-routeScope locks, and with every target mapped to the global scope
+(one lock for the whole WRITE, as before per-domain locking).
+
+On a single CPU with fast local storage both runs are CPU bound and come
+out alike; --io-delay adds simulated storage latency to step B (as on a
+network mount), which is the time per-scope locking lets agents overlap.
+
+Usage:
+    python benchmarks/bench_locks.py [--agents N] [--loops N] [--targets N] [--size BYTES] [--io-delay MS]
+"""
+import argparse
+import multiprocessing
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from contextcascade.locks import GLOBAL_SCOPE  # noqa: E402
+from contextcascade.loop import LoopController  # noqa: E402
+from contextcascade.tree import CACHE_DIR, INTERNAL_DIRS  # noqa: E402
+
+DOMAIN_META = """<!-- @meta {{
+  "fileType": "structural",
+  "subtype": "index",
+  "purpose": "Synthetic benchmark domain.",
+  "editPolicy": "appendOrReplace",
+  "routeScope": "{scope}"
+}} -->
+
+# {scope}
+"""
+
+
+class DelayedController(LoopController):
+    """
+    Adds `io_delay` seconds of simulated storage latency to step B.
+    """
+
+    io_delay = 0.0
+
+    def execute(self, edits):
+        time.sleep(self.io_delay)
+        super().execute(edits)
+
+
+class SingleLockController(DelayedController):
+    """
+    Baseline: every target is treated as global, so WRITEs serialize.
+    """
+
+    def scope_of(self, key):
+        return GLOBAL_SCOPE
+
+
+def prepare(tmp, agents, targets):
+    """
+    Copies the cascade into `tmp` and adds `agents` synthetic domains.
+    Returns the cascade root.
+    """
+    root = pathlib.Path(tmp) / "cascade"
+    shutil.copytree(REPO_ROOT / "cascade", root, ignore=shutil.ignore_patterns(*INTERNAL_DIRS))
+    for agent in range(agents):
+        scope = f"bench_{agent:02d}"
+        for n in range(targets):
+            path = root / "domains" / scope / f"file_{n:02d}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(DOMAIN_META.format(scope=scope), encoding="utf-8")
+    return root
+
+
+def agent(args):
+    """
+    Runs `loops` loops for one agent. Returns the loop wall times.
+    """
+    root, index, loops, targets, size, io_delay, single = args
+    scope = f"bench_{index:02d}"
+    paths = [f"cascade/domains/{scope}/file_{n:02d}.md" for n in range(targets)]
+    controller = (SingleLockController if single else DelayedController)(str(root), holder=f"agent{index}")
+    controller.io_delay = io_delay
+    body = DOMAIN_META.format(scope=scope) + ("x" * 79 + "\n") * (size // 80)
+    times = []
+    for loop in range(loops):
+        plan = {
+            "jobId": f"{scope}-{loop}",
+            "intent": f"Benchmark write {loop} in {scope}",
+            "targets": [{"path": path, "editPolicy": "appendOrReplace"} for path in paths],
+            "requiresReview": False,
+        }
+        start = time.perf_counter()
+        controller.run({path: f"{body}<!-- {loop} -->\n" for path in paths}, plan=plan)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(agents, loops, targets, size, io_delay, single):
+    """
+    Runs all agents concurrently against a fresh cascade copy. Returns
+    (elapsed seconds, per-loop times).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = prepare(tmp, agents, targets)
+        # Warm the metadata and hash caches so both runs start equal.
+        LoopController(str(root)).index.refresh()
+        jobs = [(root, index, loops, targets, size, io_delay, single) for index in range(agents)]
+        start = time.perf_counter()
+        with multiprocessing.Pool(agents) as pool:
+            results = pool.map(agent, jobs)
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(root / CACHE_DIR, ignore_errors=True)
+    return elapsed, [t for times in results for t in times]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--loops", type=int, default=10, help="Loops per agent.")
+    parser.add_argument("--targets", type=int, default=8, help="Files written per job.")
+    parser.add_argument("--size", type=int, default=65536, help="Approximate bytes per written file.")
+    parser.add_argument("--io-delay", type=float, default=0.0, help="Simulated storage latency per job, in ms.")
+    args = parser.parse_args()
+
+    total = args.agents * args.loops
+    print(
+        f"{args.agents} agents x {args.loops} loops, {args.targets} x ~{args.size} byte targets per job, "
+        f"{args.io_delay:g} ms I/O delay"
+    )
+    for label, single in (("single lock", True), ("per-scope locks", False)):
+        elapsed, times = run(args.agents, args.loops, args.targets, args.size, args.io_delay / 1000, single)
+        times.sort()
+        print(
+            f"{label:<16} {elapsed:8.3f} s  {total / elapsed:7.1f} loops/s  "
+            f"p50 {times[len(times) // 2] * 1000:7.1f} ms  max {times[-1] * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -59,7 +59,8 @@ const ALLOWED_EDIT_POLICIES = new Set([
 // -------------------- Helper Functions -----------
 
 function extractMeta(raw: string): { meta?: MetaBlock; remainder: string } {
-  const match = raw.match(/<!--\s*@meta\s*({[\s\S]*?})\s*-->/m);
+  // The block must open the file, as in contextcascade/meta.py.
+  const match = raw.match(/^\s*<!--\s*@meta\s*({[\s\S]*?})\s*-->/);
   if (!match) return { remainder: raw };
   try {
     const meta = JSON.parse(match[1]);
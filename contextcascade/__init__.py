@@ -0,0 +1,44 @@
+"""
+Python tooling for the ContextCascade memory system.
+
+Modules:
+    atomic   Crash-safe file replacement shared by the scaffolder and
+             WRITE-phase executors.
+    tree     Cascade tree walking, index keys and the `_cache/` location.
+    meta     Header-only `@meta` parsing, the persistent metadata index and
+             its routeScope / fileType inverted indexes.
+    validate Batch `@meta` validator with a hash-keyed result cache.
+    integrity
+             Stat-cached, parallel SHA-256 engine for the integrity snapshot.
+    merkle   Directory Merkle tree and root for `unexpectedMutation` checks.
+    jobplan  Parsing and validation of `job_logs/temp_job.md`.
+    buffers  Entry handling for rolling buffers and append-only logs.
+    rolling  Sidecar entry index for O(1) log appends and buffer sweeps.
+    archive  Segmented, indexed storage for the summary.md archives.
+    counters Lifecycle counter files.
+    counterstore
+             Binary lifecycle counter store with atomic batched increments;
+             renders the lifecycle/*.md counters.
+    lifespans
+             Compiled file_lifespans.md thresholds and the ACT-phase
+             lifecycle action check.
+    tokens   Token estimates with a pluggable tokenizer and hash-keyed
+             cache; renders audit/token_summary.md.
+    loadplan Budget-constrained load plan optimizer (auto_plan_<scope>.md).
+    loadmode Lean / Domain / Full load-mode resolver over the routeScope
+             index.
+    gates    Compiled write-gate trie for security/write_gates.md with an LRU
+             decision cache.
+    spans    Protected-span index and `protectedOverlap` edit checks.
+    audit    Meta-audit event log: JSONL sidecar with type / severity /
+             Loop ID / time indexes; renders audit/meta_audit.md.
+    checkpoints
+             Fixed-width checkpoint index: LoopID / time lookups, last good
+             checkpoint and gap detection.
+    objects  Content-addressed object store (`_objects/`): per-checkpoint
+             tree snapshots, point-in-time restore and Phase C repair.
+    loop     LoopController: READ → ACT → WRITE with per-step timings.
+    journal  Write-ahead journal: WRITE rollback and crash recovery.
+    locks    Per-routeScope kernel reader/writer locks with leases; renders
+             active_edit.lock.
+"""
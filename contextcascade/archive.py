@@ -0,0 +1,557 @@
+"""
+Segmented, indexed storage for the append-only summary archives.
+
+Sweeps from `change_log/recent.md` and `job_logs/recent.md` no longer
+append to their `summary.md` files. They append to an Archive instead:
+
+    _archive/<log>/segments/000001.seg   raw entries, appended in order
+    _archive/<log>/index.jsonl           one line per entry: id, timestamp,
+                                         touched paths, segment, offset, length
+
+where <log> is the summary's path without `.md`, e.g. `change_log/summary`.
+A segment is closed once it reaches SEGMENT_SIZE bytes, and later batches
+go to the next one. Writes stay sequential. A lookup by job ID, path or
+time range reads only the index and the matching byte ranges.
+
+`summary.md` keeps its header. The full single-file view (header plus
+every entry) is produced on demand by render().
+
+Closed segments move to a cold tier: `000001.segz` holds the segment as
+independently compressed 64 KiB blocks (zlib by default, or lzma). A
+footer records the codec, the block table and the SHA-256 of the
+uncompressed content. Reads are transparent: a point read decompresses
+only the blocks it spans. Segments are compressed when they close, or
+with `--compress`. ColdSegment.verify() checks a cold segment against its
+recorded digest (see `integrity --archives`). The token ledger counts cold
+segments through the same reader, keyed by that recorded digest, so an
+unchanged segment is never decompressed twice (see tokens.py).
+
+Usage:
+    archive = Archive("cascade", "cascade/change_log/summary.md")
+    archive.append(entry_bytes)
+    archive.by_id("3f2a9c1b7d40")
+    archive.by_path("cascade/domains/client/index.md")
+    archive.between("2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z")
+
+    python -m contextcascade.archive [--log change_log/summary.md]
+        [--id ID | --path PATH | --since TS [--until TS] | --render [--output FILE] | --absorb
+         | --compress [--codec zlib|lzma]]
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import lzma
+import os
+import pathlib
+import re
+import struct
+import sys
+import zlib
+
+from contextcascade.atomic import atomic_write
+from contextcascade.buffers import PLACEHOLDER_RE, split_entries
+from contextcascade.rolling import scan
+from contextcascade.tree import ARCHIVE_DIR, DEFAULT_ROOT, file_key, key_path
+
+# Summary logs whose entries live in segmented archives.
+ARCHIVED_LOGS = ("change_log/summary.md", "job_logs/summary.md")
+
+SEGMENT_SIZE = 1 << 20
+SEGMENT_SUFFIX = ".seg"
+INDEX_FILE = "index.jsonl"
+
+COLD_SUFFIX = ".segz"
+COLD_MAGIC = b"CCSEGZ01"
+COLD_BLOCK = 64 << 10
+DEFAULT_CODEC = "zlib"
+
+# codec name -> (compress, decompress)
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+# Footer: JSON block table, then its length and the magic.
+_TRAILER = struct.Struct(">Q8s")
+
+# Fields that identify an entry, in order of preference.
+ID_FIELDS = ("ChangeID", "JobID", "LoopID")
+
+FIELD_RE = re.compile(r"^(?:- |\s+)\*\*([A-Za-z][\w-]*):\*\*[ \t]*(.*)$", re.M)
+PATH_RE = re.compile(r"`(/?[\w.-]+(?:/[\w.-]+)+)`")
+
+
+def describe_entry(text, root_name=DEFAULT_ROOT):
+    """
+    Returns (id, timestamp, paths) for one entry. Paths are tree keys.
+    """
+    fields = {}
+    for key, value in FIELD_RE.findall(text):
+        fields.setdefault(key, value.strip())
+    entry_id = next((fields[name] for name in ID_FIELDS if name in fields), None)
+    if entry_id is None and fields:
+        entry_id = next(iter(fields.values()))
+    paths = []
+    for path in PATH_RE.findall(text):
+        path = path.lstrip("/")
+        if not path.startswith(f"{root_name}/"):
+            path = f"{root_name}/{path}"
+        if path not in paths:
+            paths.append(path)
+    return entry_id, fields.get("Timestamp"), paths
+
+
+def compress_segment(data, codec=DEFAULT_CODEC):
+    """
+    Returns the cold-tier encoding of segment bytes `data`.
+    """
+    compress = CODECS[codec][0]
+    out = []
+    blocks = []
+    pos = 0
+    for start in range(0, len(data), COLD_BLOCK):
+        block = compress(data[start : start + COLD_BLOCK])
+        blocks.append([pos, len(block)])
+        out.append(block)
+        pos += len(block)
+    footer = json.dumps({
+        "codec": codec,
+        "block": COLD_BLOCK,
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "blocks": blocks,
+    }).encode("utf-8")
+    return b"".join(out) + footer + _TRAILER.pack(len(footer), COLD_MAGIC)
+
+
+class ColdSegment:
+    """
+    Random access to a compressed segment. The most recently decompressed
+    block is kept, so reading consecutive entries costs one decompression
+    per block.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != COLD_MAGIC:
+                raise ValueError(f"{self.path} is not a cold segment")
+            f.seek(-_TRAILER.size - length, os.SEEK_END)
+            footer = json.loads(f.read(length))
+        self.codec = footer["codec"]
+        self.block = footer["block"]
+        self.size = footer["size"]
+        self.sha256 = footer["sha256"]
+        self.blocks = footer["blocks"]
+        self._decompress = CODECS[self.codec][1]
+        self._cached = (None, b"")
+
+    def _block(self, f, index):
+        if self._cached[0] != index:
+            start, length = self.blocks[index]
+            f.seek(start)
+            self._cached = (index, self._decompress(f.read(length)))
+        return self._cached[1]
+
+    def read(self, offset, length):
+        """
+        Returns `length` uncompressed bytes from `offset`.
+        """
+        end = min(offset + length, self.size)
+        parts = []
+        with open(self.path, "rb") as f:
+            for index in range(offset // self.block, (end - 1) // self.block + 1 if end > offset else 0):
+                data = self._block(f, index)
+                base = index * self.block
+                parts.append(data[max(offset - base, 0) : end - base])
+        return b"".join(parts)
+
+    def chunks(self):
+        """
+        Yields the uncompressed content block by block.
+        """
+        with open(self.path, "rb") as f:
+            for start, length in self.blocks:
+                f.seek(start)
+                yield self._decompress(f.read(length))
+
+    def verify(self):
+        """
+        Returns True if the decompressed content matches the recorded
+        SHA-256.
+        """
+        digest = hashlib.sha256()
+        for chunk in self.chunks():
+            digest.update(chunk)
+        return digest.hexdigest() == self.sha256
+
+
+def is_archived(root, key):
+    """
+    Returns True if tree key `key` is one of ARCHIVED_LOGS.
+    """
+    return any(key == file_key(root, key_path(root, log)) for log in ARCHIVED_LOGS)
+
+
+def archive_files(root):
+    """
+    Returns the path of every segment and index file of the ARCHIVED_LOGS
+    archives. The tree walk skips `_archive/`, so snapshots add these.
+    """
+    paths = []
+    for log in ARCHIVED_LOGS:
+        archive = Archive(root, file_key(root, key_path(root, log)))
+        paths.extend(archive.segment_files())
+        if archive.index_path.exists():
+            paths.append(archive.index_path)
+    return paths
+
+
+def archive_dirs(root):
+    """
+    Returns the directory of each ARCHIVED_LOGS archive, relative to the
+    cascade root.
+    """
+    return [
+        Archive(root, file_key(root, key_path(root, log))).directory.relative_to(root).as_posix()
+        for log in ARCHIVED_LOGS
+    ]
+
+
+class Archive:
+    """
+    One segmented archive, with its index loaded lazily.
+    """
+
+    def __init__(self, root, log_key, codec=DEFAULT_CODEC):
+        self.root = root
+        self.log_key = log_key
+        self.codec = codec
+        rel = key_path(root, log_key).relative_to(root).with_suffix("")
+        self.directory = pathlib.Path(root) / ARCHIVE_DIR / rel
+        self.segments = self.directory / "segments"
+        self.index_path = self.directory / INDEX_FILE
+        self._entries = None
+        self._cold = {}
+
+    # -------------------- Writing ----------------------
+
+    def _segment_path(self, number):
+        return self.segments / f"{number:06d}{SEGMENT_SUFFIX}"
+
+    def _cold_path(self, number):
+        return self.segments / f"{number:06d}{COLD_SUFFIX}"
+
+    def _segment_numbers(self):
+        if not self.segments.is_dir():
+            return []
+        return sorted({
+            int(path.stem)
+            for path in self.segments.iterdir()
+            if path.suffix in (SEGMENT_SUFFIX, COLD_SUFFIX) and path.stem.isdigit()
+        })
+
+    def segment_files(self):
+        """
+        Returns the path of every segment, oldest first: the raw file of a
+        hot segment or the `.segz` file of a cold one.
+        """
+        paths = []
+        for number in self._segment_numbers():
+            path = self._segment_path(number)
+            paths.append(path if path.exists() else self._cold_path(number))
+        return paths
+
+    def _cold_segment(self, number):
+        if number not in self._cold:
+            self._cold[number] = ColdSegment(self._cold_path(number))
+        return self._cold[number]
+
+    def compress(self, number, codec=None):
+        """
+        Moves closed segment `number` to the cold tier. The compressed
+        file is complete on disk before the raw segment is removed.
+        """
+        raw = self._segment_path(number)
+        cold = self._cold_path(number)
+        if not cold.exists():
+            atomic_write(cold, compress_segment(raw.read_bytes(), codec or self.codec or DEFAULT_CODEC))
+        raw.unlink()
+
+    def compress_closed(self, codec=None):
+        """
+        Compresses every closed segment still in the hot tier. Returns the
+        segment numbers compressed.
+        """
+        numbers = self._segment_numbers()
+        done = []
+        for number in numbers[:-1]:
+            if self._segment_path(number).exists():
+                self.compress(number, codec)
+                done.append(number)
+        return done
+
+    def _open_segment(self):
+        """
+        Returns the path of the segment the next append() writes to,
+        creating it (and closing the current one if it is full).
+        """
+        self.segments.mkdir(parents=True, exist_ok=True)
+        numbers = self._segment_numbers()
+        number = numbers[-1] if numbers else 1
+        path = self._segment_path(number)
+        if path.exists() and path.stat().st_size >= SEGMENT_SIZE:
+            if self.codec:
+                self.compress(number)
+            path = self._segment_path(number + 1)
+        elif not path.exists() and self._cold_path(number).exists():
+            path = self._segment_path(number + 1)
+        path.touch()
+        return path
+
+    def prepare(self):
+        """
+        Creates the segment the next append() writes to and the index
+        file. Returns their tree keys with current sizes, for journaling
+        before the append.
+        """
+        path = self._open_segment()
+        self.index_path.touch()
+        return {
+            file_key(self.root, path): path.stat().st_size,
+            file_key(self.root, self.index_path): self.index_path.stat().st_size,
+        }
+
+    def append(self, blob):
+        """
+        Appends a run of entries (bytes, as moved by a buffer sweep) to the
+        current segment and indexes each entry. Returns the number of
+        entries.
+        """
+        if not blob:
+            return 0
+        if not blob.endswith(b"\n"):
+            blob += b"\n"
+        path = self._open_segment()
+        number = int(path.stem)
+        with open(path, "ab") as f:
+            base = f.tell()
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+
+        offsets, _ = scan(blob)
+        if not offsets or offsets[0]:
+            offsets = [0] + offsets
+        bounds = offsets + [len(blob)]
+        lines = []
+        records = []
+        for start, end in zip(bounds, bounds[1:]):
+            entry_id, timestamp, paths = describe_entry(
+                blob[start:end].decode("utf-8", "replace"), pathlib.Path(self.root).name
+            )
+            record = {"id": entry_id, "ts": timestamp, "paths": paths, "seg": number, "off": base + start, "len": end - start}
+            records.append(record)
+            lines.append(json.dumps(record, sort_keys=True) + "\n")
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._entries is not None:
+            for record in records:
+                self._add(record)
+        return len(records)
+
+    def absorb_view(self):
+        """
+        Moves entries still stored in the summary.md view (written before
+        archiving was enabled) into the archive, leaving its header.
+        Returns the number of entries moved.
+        """
+        path = key_path(self.root, self.log_key)
+        header, entries = split_entries(path.read_text(encoding="utf-8"))
+        if not entries:
+            return 0
+        self.append("".join(entries).encode("utf-8"))
+        atomic_write(path, header)
+        return len(entries)
+
+    # -------------------- Reading ----------------------
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = []
+        self._by_id = {}
+        self._by_path = {}
+        self._times = []
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line), sort=False)
+        except FileNotFoundError:
+            pass
+        self._times.sort()
+
+    def _add(self, record, sort=True):
+        position = len(self._entries)
+        self._entries.append(record)
+        if record.get("id") is not None:
+            self._by_id.setdefault(str(record["id"]), []).append(position)
+        for path in record.get("paths", ()):
+            self._by_path.setdefault(path, []).append(position)
+        if record.get("ts"):
+            if sort:
+                bisect.insort(self._times, (record["ts"], position))
+            else:
+                self._times.append((record["ts"], position))
+
+    def __len__(self):
+        self._load()
+        return len(self._entries)
+
+    def read(self, record):
+        """
+        Returns the text of one indexed entry with a single positioned
+        read, decompressing only the blocks it spans if the segment is
+        cold.
+        """
+        path = self._segment_path(record["seg"])
+        try:
+            with open(path, "rb") as f:
+                f.seek(record["off"])
+                return f.read(record["len"]).decode("utf-8")
+        except FileNotFoundError:
+            return self._cold_segment(record["seg"]).read(record["off"], record["len"]).decode("utf-8")
+
+    def records(self, positions):
+        self._load()
+        return [self._entries[position] for position in positions]
+
+    def by_id(self, entry_id):
+        """
+        Returns the texts of the entries with ID `entry_id`.
+        """
+        self._load()
+        return [self.read(record) for record in self.records(self._by_id.get(str(entry_id), []))]
+
+    def by_path(self, key):
+        """
+        Returns the texts of the entries that mention tree key `key`.
+        """
+        self._load()
+        key = file_key(self.root, key_path(self.root, key))
+        return [self.read(record) for record in self.records(self._by_path.get(key, []))]
+
+    def between(self, since=None, until=None):
+        """
+        Returns the texts of the entries with since <= Timestamp < until
+        (ISO 8601 strings), in time order.
+        """
+        self._load()
+        lo = 0 if since is None else bisect.bisect_left(self._times, (since, -1))
+        hi = len(self._times) if until is None else bisect.bisect_left(self._times, (until, -1))
+        return [self.read(record) for record in self.records(position for _, position in self._times[lo:hi])]
+
+    def iter_chunks(self):
+        """
+        Yields the uncompressed content of every segment, oldest first, in
+        chunks of at most a segment (hot) or a block (cold).
+        """
+        for number in self._segment_numbers():
+            path = self._segment_path(number)
+            if path.exists():
+                yield path.read_bytes()
+            else:
+                yield from self._cold_segment(number).chunks()
+
+    def stats(self):
+        """
+        Returns {"segments", "cold", "size", "stored"}: segment counts,
+        uncompressed bytes and bytes on disk.
+        """
+        stats = {"segments": 0, "cold": 0, "size": 0, "stored": 0}
+        for number in self._segment_numbers():
+            stats["segments"] += 1
+            path = self._segment_path(number)
+            if path.exists():
+                size = path.stat().st_size
+                stats["size"] += size
+                stats["stored"] += size
+            else:
+                stats["cold"] += 1
+                stats["size"] += self._cold_segment(number).size
+                stats["stored"] += self._cold_path(number).stat().st_size
+        return stats
+
+    def render(self):
+        """
+        Returns the single-file markdown view: the summary.md header
+        followed by every archived entry.
+        """
+        header = key_path(self.root, self.log_key).read_text(encoding="utf-8")
+        body = b"".join(self.iter_chunks()).decode("utf-8")
+        if not body:
+            return header
+        header = PLACEHOLDER_RE.sub("", header)
+        if header and not header.endswith("\n"):
+            header += "\n"
+        return header + body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query a segmented summary archive.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--log", default=ARCHIVED_LOGS[0], help="Archived summary (default: %(default)s).")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--id", help="Entries with this job / change ID.")
+    group.add_argument("--path", help="Entries touching this path.")
+    group.add_argument("--since", help="Entries at or after this timestamp.")
+    group.add_argument("--render", action="store_true", help="Print the full markdown view.")
+    group.add_argument("--absorb", action="store_true", help="Move entries still in the summary file into the archive.")
+    group.add_argument("--compress", action="store_true", help="Move closed segments to the compressed cold tier.")
+    parser.add_argument("--codec", choices=sorted(CODECS), default=DEFAULT_CODEC, help="With --compress (default: %(default)s).")
+    parser.add_argument("--until", help="With --since: entries before this timestamp.")
+    parser.add_argument("--output", help="With --render: write the view to this file.")
+    args = parser.parse_args(argv)
+
+    archive = Archive(args.root, args.log)
+    if args.absorb:
+        print(f"Moved {archive.absorb_view()} entries into {archive.directory}")
+        return 0
+    if args.compress:
+        done = archive.compress_closed(args.codec)
+        print(f"Compressed {len(done)} segment(s) with {args.codec}")
+        return 0
+    if args.render:
+        view = archive.render()
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(view)
+        else:
+            sys.stdout.write(view)
+        return 0
+    if args.id:
+        entries = archive.by_id(args.id)
+    elif args.path:
+        entries = archive.by_path(args.path)
+    elif args.since:
+        entries = archive.between(args.since, args.until)
+    else:
+        stats = archive.stats()
+        ratio = stats["size"] / stats["stored"] if stats["stored"] else 1.0
+        print(
+            f"{len(archive)} entries in {stats['segments']} segment(s), {stats['cold']} cold; "
+            f"{stats['size']} bytes stored as {stats['stored']} ({ratio:.1f}x)"
+        )
+        return 0
+    sys.stdout.write("".join(entries))
+    return 0 if entries else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
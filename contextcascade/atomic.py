@@ -0,0 +1,160 @@
+"""
+Crash-safe file writes.
+
+Every write goes to a temporary file in the target's own directory, is
+fsync'd, and is then renamed over the target. A crash at any point leaves
+either the old content or the new content on disk, never a torn file.
+
+AtomicBatch stages many files first and publishes them together, issuing a
+single fsync per affected directory instead of one per file.
+
+Usage:
+    from contextcascade.atomic import AtomicBatch, atomic_write
+
+    atomic_write("cascade/job_logs/temp_job.md", text)
+
+    with AtomicBatch() as batch:
+        batch.stage("cascade/change_log/recent.md", recent)
+        batch.stage("cascade/lifecycle/counter.md", counter)
+"""
+import os
+import pathlib
+import secrets
+import threading
+
+
+def _to_bytes(data):
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return data
+
+
+def fsync_dir(dir_path):
+    """
+    Flushes a directory entry table to disk so completed renames survive a
+    crash. A no-op on platforms that cannot open directories (Windows).
+    """
+    try:
+        fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some filesystems (and all of Windows) reject fsync on directories.
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_temp(path, data):
+    """
+    Writes `data` to a fresh temporary file next to `path` and fsyncs it.
+    The temp file takes over the target's permission bits if it exists.
+    Returns the temp file path.
+    """
+    tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(6)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
+
+
+def atomic_write(path, data):
+    """
+    Atomically replaces `path` with `data` (str is encoded as UTF-8).
+    The parent directory must exist.
+    """
+    path = pathlib.Path(path)
+    tmp_path = _write_temp(path, _to_bytes(data))
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    fsync_dir(path.parent)
+
+
+class AtomicBatch:
+    """
+    Stages several file replacements and publishes them together.
+
+    stage() writes and fsyncs each temp file immediately and may be called
+    from multiple threads. commit() renames every staged file into place
+    and then fsyncs each affected directory once. Each rename is atomic on
+    its own; a crash during commit() can leave some files already
+    replaced, but never a partially written one.
+
+    Used as a context manager, the batch commits on normal exit and
+    discards its temp files if the block raises.
+    """
+
+    def __init__(self):
+        self._staged = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._staged)
+
+    def stage(self, path, data):
+        """
+        Writes `data` to a temp file beside `path`. The target is not
+        touched until commit(). The parent directory must exist.
+        """
+        path = pathlib.Path(path)
+        tmp_path = _write_temp(path, _to_bytes(data))
+        with self._lock:
+            self._staged.append((tmp_path, path))
+
+    def commit(self):
+        """
+        Renames all staged files over their targets, then fsyncs each
+        affected directory once. If a rename fails, the remaining temp
+        files are removed and the error is re-raised.
+        """
+        with self._lock:
+            staged, self._staged = self._staged, []
+
+        dirs = set()
+        for index, (tmp_path, path) in enumerate(staged):
+            try:
+                os.replace(tmp_path, path)
+            except BaseException:
+                for leftover, _ in staged[index:]:
+                    leftover.unlink(missing_ok=True)
+                for dir_path in dirs:
+                    fsync_dir(dir_path)
+                raise
+            dirs.add(path.parent)
+
+        for dir_path in dirs:
+            fsync_dir(dir_path)
+
+    def abort(self):
+        """
+        Discards all staged temp files, leaving every target untouched.
+        """
+        with self._lock:
+            staged, self._staged = self._staged, []
+        for tmp_path, _ in staged:
+            tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,691 @@
+"""
+Structured event log behind `audit/meta_audit.md`.
+
+Every meta-audit event is appended as one JSON line to the sidecar
+`_archive/audit/meta_audit/events.jsonl`, which is the record of truth:
+
+    {"action": "...", "details": "...", "loop": 157, "severity": "CRITICAL",
+     "source": "...", "ts": "2025-01-01T00:00:00Z", "type": "hashMismatch"}
+
+meta_audit.md is a rendered view: its header and maintenance notes around
+the newest VIEW_LIMIT events. The view is re-rendered after each append,
+reading only those events. Entries written into the view by hand, in the
+"Current Audit Log" section or below the last section, are moved into the
+sidecar before it is re-rendered. render() produces the full markdown log
+on demand.
+
+AuditIndex stores, in `_cache/audit_index.bin`:
+
+- per-event columns: sidecar offset, Loop ID, timestamp, type code and
+  severity code
+- a posting list per type and per severity
+- the events ordered by Loop ID and by timestamp
+
+The index is rebuildable. Because the sidecar only grows, loading the
+index parses only the lines past the indexed length. A query starts from
+its smallest candidate set, either a posting list or a bisected range,
+and checks the remaining filters against the columns. Its cost therefore
+depends on the number of candidates, not on the size of the log.
+
+Usage:
+    log = AuditLog("cascade")
+    log.append([make_event("hashMismatch", "CRITICAL", "...", "Pre-WRITE validation", loop=157)])
+    log.render_view()
+    log.query(type="hashMismatch", severity="CRITICAL", loops=(100, 200))
+    log.save()
+
+    python -m contextcascade.audit [--type TYPE] [--severity SEVERITY] [--loops FIRST-LAST]
+        [--since TS] [--until TS] [--limit N] [--json | --count] | --render | --view | --absorb
+"""
+import argparse
+import bisect
+import calendar
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+import struct
+import sys
+import time
+from array import array
+
+from contextcascade import buffers
+from contextcascade.archive import FIELD_RE
+from contextcascade.atomic import atomic_write
+from contextcascade.tree import ARCHIVE_DIR, DEFAULT_ROOT, cache_path, key_path
+
+AUDIT_FILE = "audit/meta_audit.md"
+EVENTS_FILE = "events.jsonl"
+INDEX_FILE = "audit_index.bin"
+INDEX_VERSION = 1
+INDEX_MAGIC = b"CCAUDX01"
+
+SECTION_HEADING = "## Current Audit Log:"
+VIEW_LIMIT = 100
+
+# Bytes of the sidecar hashed to tell a rewritten file from a grown one.
+HEAD_BYTES = 4096
+
+# Magic, then the length of the JSON layout that precedes the arrays.
+_HEADER = struct.Struct("<8sI")
+
+FOOTER_RE = re.compile(r"^---[ \t]*\n+## ", re.M)
+TIMESTAMP_RE = re.compile(r"\s*(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?Z?)?\s*$")
+LOOP_RE = re.compile(r"\s*\(Loop ID:\s*(\d+)\)")
+# The note view() puts above the rendered events; group 1 is their count.
+NOTE_RE = re.compile(r"^\*\(Rendered from `[^`\n]*`: the newest (\d+) of \d+ events\.", re.M)
+
+# Markdown field -> event key, in rendering order.
+FIELDS = (
+    ("Timestamp", "ts"),
+    ("Type", "type"),
+    ("Severity", "severity"),
+    ("Details", "details"),
+    ("Source", "source"),
+    ("ActionTaken", "action"),
+)
+
+# Columns: name -> array typecode. Missing Loop IDs and timestamps are -1.
+COLUMNS = {"offsets": "Q", "loops": "q", "times": "q", "types": "H", "severities": "B"}
+
+
+def parse_timestamp(value):
+    """
+    Returns the epoch seconds of an ISO 8601 UTC timestamp
+    (`YYYY-MM-DDTHH:MM:SSZ`, or just the date), or -1 if it is not one.
+    """
+    match = TIMESTAMP_RE.match(value) if isinstance(value, str) else None
+    if match is None:
+        return -1
+    year, month, day, hour, minute, second = match.groups()
+    seconds = _day_start(year, month, day)
+    if hour is not None:
+        seconds += int(hour) * 3600 + int(minute) * 60 + int(second)
+    return seconds
+
+
+def _bound(value):
+    """
+    Returns query bound `value` (ISO 8601, or None) in epoch seconds.
+    Raises ValueError if it is not a timestamp parse_timestamp() accepts.
+    """
+    if value is None:
+        return None
+    seconds = parse_timestamp(value)
+    if seconds < 0:
+        raise ValueError(f"Not an ISO 8601 UTC timestamp: {value!r}")
+    return seconds
+
+
+@functools.lru_cache(maxsize=4096)
+def _day_start(year, month, day):
+    return calendar.timegm((int(year), int(month), int(day), 0, 0, 0))
+
+
+def _loop_number(value):
+    if isinstance(value, bool):
+        return -1
+    if isinstance(value, int):
+        return value if value >= 0 else -1
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return -1
+
+
+def make_event(event_type, severity, details, source, action=None, loop=None, ts=None):
+    """
+    Returns an event dict. `ts` defaults to now.
+    """
+    event = {
+        "ts": ts or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "type": event_type,
+        "severity": severity.upper(),
+        "details": details,
+        "source": source,
+        "loop": loop,
+    }
+    if action:
+        event["action"] = action
+    return event
+
+
+def format_event(event):
+    """
+    Renders one event in the markdown entry format of meta_audit.md.
+    """
+    fields = []
+    for name, key in FIELDS:
+        value = event.get(key)
+        if key == "type" and value:
+            value = f"`{value}`"
+        elif key == "source" and event.get("loop") is not None:
+            value = f"{value or 'Unknown'} (Loop ID: {event['loop']})"
+        if value not in (None, ""):
+            fields.append((name, value))
+    return buffers.format_entry(fields)
+
+
+def parse_entry(text):
+    """
+    Inverse of format_event() for a markdown entry. Returns an event dict.
+    """
+    fields = {}
+    for name, value in FIELD_RE.findall(text):
+        fields.setdefault(name, value.strip())
+    event = {key: fields.get(name) for name, key in FIELDS}
+    if event["type"]:
+        event["type"] = event["type"].strip("`")
+    event["severity"] = (event["severity"] or "INFO").upper()
+    event["loop"] = None
+    match = LOOP_RE.search(event["source"] or "")
+    if match:
+        event["loop"] = int(match.group(1))
+        event["source"] = (event["source"][: match.start()] + event["source"][match.end() :]).strip()
+    if event["action"] is None:
+        del event["action"]
+    return event
+
+
+def split_view(text):
+    """
+    Splits meta_audit.md into (head, body, footer): the text through the
+    "Current Audit Log" heading, the rendered events, and the sections
+    after them. A file without the heading gets one appended.
+    """
+    start = text.find(SECTION_HEADING)
+    if start < 0:
+        if text and not text.endswith("\n"):
+            text += "\n"
+        return text + f"\n---\n{SECTION_HEADING}\n", "", ""
+    head_end = text.find("\n", start)
+    head_end = len(text) if head_end < 0 else head_end + 1
+    match = FOOTER_RE.search(text, head_end)
+    footer_start = match.start() if match else len(text)
+    return text[:head_end], text[head_end:footer_start], text[footer_start:]
+
+
+def legacy_entries(body):
+    """
+    Returns the entries in the "Current Audit Log" section `body` that
+    were not rendered from the sidecar: all of them if the body has no
+    rendered note, else those after the rendered events.
+    """
+    _, entries = buffers.split_entries(body)
+    match = NOTE_RE.search(body)
+    return entries[int(match.group(1)):] if match else entries
+
+
+class AuditIndex:
+    """
+    Columns, posting lists and sorted orders over the sidecar's events,
+    by position (line number, counting parsed events only).
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.head = ""
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.type_names = []
+        self.severity_names = []
+        self._type_codes = {}
+        self._severity_codes = {}
+        self.by_type = []
+        self.by_severity = []
+        self.loop_keys = array("q")
+        self.loop_order = array("I")
+        self.time_keys = array("q")
+        self.time_order = array("I")
+
+    def __len__(self):
+        return len(self.columns["offsets"])
+
+    @staticmethod
+    def _code(codes, names, postings, name, limit):
+        code = codes.get(name)
+        if code is None:
+            if len(names) >= limit:
+                raise ValueError(f"More than {limit} distinct audit values")
+            code = codes[name] = len(names)
+            names.append(name)
+            postings.append(array("I"))
+        return code
+
+    @staticmethod
+    def _insert(keys, order, key, position):
+        if not keys or key >= keys[-1]:
+            keys.append(key)
+            order.append(position)
+        else:
+            i = bisect.bisect_right(keys, key)
+            keys.insert(i, key)
+            order.insert(i, position)
+
+    def add(self, offset, event):
+        position = len(self)
+        type_code = self._code(self._type_codes, self.type_names, self.by_type, str(event.get("type") or ""), 1 << 16)
+        severity_code = self._code(
+            self._severity_codes, self.severity_names, self.by_severity, str(event.get("severity") or "").upper(), 1 << 8
+        )
+        loop = _loop_number(event.get("loop"))
+        timestamp = parse_timestamp(event.get("ts"))
+        columns = self.columns
+        columns["offsets"].append(offset)
+        columns["loops"].append(loop)
+        columns["times"].append(timestamp)
+        columns["types"].append(type_code)
+        columns["severities"].append(severity_code)
+        self.by_type[type_code].append(position)
+        self.by_severity[severity_code].append(position)
+        if loop >= 0:
+            self._insert(self.loop_keys, self.loop_order, loop, position)
+        if timestamp >= 0:
+            self._insert(self.time_keys, self.time_order, timestamp, position)
+
+    def _arrays(self):
+        arrays = dict(self.columns)
+        arrays.update({f"type.{code}": postings for code, postings in enumerate(self.by_type)})
+        arrays.update({f"severity.{code}": postings for code, postings in enumerate(self.by_severity)})
+        arrays.update({
+            "loop_keys": self.loop_keys,
+            "loop_order": self.loop_order,
+            "time_keys": self.time_keys,
+            "time_order": self.time_order,
+        })
+        return arrays
+
+    def dump(self):
+        """
+        Returns the binary encoding of the index.
+        """
+        arrays = self._arrays()
+        layout = json.dumps({
+            "version": INDEX_VERSION,
+            "byteorder": sys.byteorder,
+            "size": self.size,
+            "head": self.head,
+            "types": self.type_names,
+            "severities": self.severity_names,
+            "arrays": [[name, values.typecode, len(values)] for name, values in arrays.items()],
+        }).encode("utf-8")
+        return b"".join([_HEADER.pack(INDEX_MAGIC, len(layout)), layout] + [values.tobytes() for values in arrays.values()])
+
+    @classmethod
+    def load(cls, f):
+        """
+        Reads an index written by dump() from binary file `f`. Returns
+        None if it is missing pieces or was written by another version.
+        """
+        magic, length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != INDEX_MAGIC:
+            return None
+        layout = json.loads(f.read(length))
+        if layout.get("version") != INDEX_VERSION or layout.get("byteorder") != sys.byteorder:
+            return None
+        index = cls()
+        index.size = layout["size"]
+        index.head = layout["head"]
+        index.type_names = layout["types"]
+        index.severity_names = layout["severities"]
+        index._type_codes = {name: code for code, name in enumerate(index.type_names)}
+        index._severity_codes = {name: code for code, name in enumerate(index.severity_names)}
+        index.by_type = [None] * len(index.type_names)
+        index.by_severity = [None] * len(index.severity_names)
+        for name, code, count in layout["arrays"]:
+            values = array(code)
+            values.fromfile(f, count)
+            kind, _, number = name.partition(".")
+            if kind == "type":
+                index.by_type[int(number)] = values
+            elif kind == "severity":
+                index.by_severity[int(number)] = values
+            elif name in index.columns:
+                index.columns[name] = values
+            else:
+                setattr(index, name, values)
+        if None in index.by_type or None in index.by_severity:
+            return None
+        return index
+
+    def _range(self, keys, order, lo, hi):
+        start = 0 if lo is None else bisect.bisect_left(keys, lo)
+        end = len(keys) if hi is None else bisect.bisect_right(keys, hi)
+        return order[start:end] if end > start else array("I")
+
+    def select(self, type=None, severity=None, loops=None, since=None, until=None):
+        """
+        Returns the positions, in log order, of the events that match
+        every given filter: type, severity, loops (first, last) inclusive,
+        since <= timestamp < until (epoch seconds).
+        """
+        sources = []
+        if type is not None:
+            if type not in self._type_codes:
+                return []
+            sources.append((self.by_type[self._type_codes[type]], True))
+        if severity is not None:
+            severity = severity.upper()
+            if severity not in self._severity_codes:
+                return []
+            sources.append((self.by_severity[self._severity_codes[severity]], True))
+        if loops is not None:
+            sources.append((self._range(self.loop_keys, self.loop_order, *loops), False))
+        if since is not None or until is not None:
+            sources.append((self._range(self.time_keys, self.time_order, since, None if until is None else until - 1), False))
+        if not sources:
+            return list(range(len(self)))
+
+        # Posting lists are in log order; ranges are in key order.
+        positions, ordered = min(sources, key=lambda source: len(source[0]))
+        columns = self.columns
+        if type is not None:
+            code = self._type_codes[type]
+            types = columns["types"]
+            positions = [p for p in positions if types[p] == code]
+        if severity is not None:
+            code = self._severity_codes[severity]
+            severities = columns["severities"]
+            positions = [p for p in positions if severities[p] == code]
+        if loops is not None:
+            first = 0 if loops[0] is None else max(loops[0], 0)
+            last = sys.maxsize if loops[1] is None else loops[1]
+            values = columns["loops"]
+            positions = [p for p in positions if first <= values[p] <= last]
+        if since is not None or until is not None:
+            lo = 0 if since is None else since
+            hi = sys.maxsize if until is None else until
+            times = columns["times"]
+            positions = [p for p in positions if lo <= times[p] < hi]
+        if not ordered:
+            positions.sort()
+        return positions
+
+
+class AuditLog:
+    """
+    The meta-audit sidecar of one cascade root, with its index loaded
+    lazily.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        rel = key_path(root, AUDIT_FILE).relative_to(root).with_suffix("")
+        self.path = pathlib.Path(root) / ARCHIVE_DIR / rel / EVENTS_FILE
+        self.index_path = cache_path(root, INDEX_FILE)
+        self.view_path = key_path(root, AUDIT_FILE)
+        self._index = None
+        self.dirty = False
+
+    def _head(self, length):
+        with open(self.path, "rb") as f:
+            return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+    @property
+    def index(self):
+        """
+        The AuditIndex, loaded on first use and caught up with lines
+        appended since it was saved.
+        """
+        if self._index is None:
+            try:
+                with open(self.index_path, "rb") as f:
+                    self._index = AuditIndex.load(f)
+            except (FileNotFoundError, ValueError, struct.error, EOFError):
+                self._index = None
+            if self._index is None:
+                self._index = AuditIndex()
+                self.dirty = True
+        self.refresh()
+        return self._index
+
+    def refresh(self):
+        """
+        Indexes lines appended to the sidecar since the last refresh, or
+        rebuilds the index if the sidecar was rewritten.
+        """
+        index = self._index
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size == index.size:
+            return
+        if size < index.size or (index.size and self._head(index.size) != index.head):
+            # Rewritten, or truncated or removed by a WRITE rollback.
+            index = self._index = AuditIndex()
+            self.dirty = True
+            if not size:
+                return
+        with open(self.path, "rb") as f:
+            f.seek(index.size)
+            data = f.read()
+        pos = 0
+        while True:
+            end = data.find(b"\n", pos)
+            if end < 0:
+                break
+            line = data[pos:end].strip()
+            if line:
+                try:
+                    index.add(index.size + pos, json.loads(line))
+                except ValueError:
+                    pass  # a torn line from an interrupted append
+            pos = end + 1
+        index.size += pos
+        index.head = self._head(index.size)
+        self.dirty = True
+
+    def save(self):
+        if self.dirty and self._index is not None:
+            atomic_write(self.index_path, self._index.dump())
+            self.dirty = False
+
+    def __len__(self):
+        return len(self.index)
+
+    # -------------------- Writing ----------------------
+
+    def append(self, events):
+        """
+        Appends event dicts (see make_event()) to the sidecar and indexes
+        them. Returns their positions.
+        """
+        if not events:
+            return []
+        index = self.index
+        lines = [json.dumps(event, sort_keys=True, ensure_ascii=False).encode("utf-8") + b"\n" for event in events]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            base = f.tell()
+            if base > index.size:
+                # An interrupted append left a partial line; end it.
+                f.write(b"\n")
+                base += 1
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        first = len(index)
+        for line in lines:
+            index.add(base, json.loads(line))
+            base += len(line)
+        index.size = base
+        index.head = self._head(index.size)
+        self.dirty = True
+        return list(range(first, len(index)))
+
+    def absorb_view(self, limit=VIEW_LIMIT):
+        """
+        Moves entries written directly to meta_audit.md into the sidecar:
+        legacy entries in the "Current Audit Log" section (see
+        legacy_entries()), then any below the last section. The view is
+        rewritten without them, with the newest `limit` events. Returns
+        the number of entries moved.
+        """
+        head, body, footer = split_view(self.view_path.read_text(encoding="utf-8"))
+        footer_head, entries = buffers.split_entries(footer)
+        entries = legacy_entries(body) + entries
+        if not entries:
+            return 0
+        self.append([parse_entry(entry) for entry in entries])
+        atomic_write(self.view_path, self._render(head, footer_head, limit))
+        return len(entries)
+
+    # -------------------- Reading ----------------------
+
+    def events(self, positions):
+        """
+        Returns the event dicts at `positions`.
+        """
+        if not len(positions):
+            return []
+        offsets = self.index.columns["offsets"]
+        found = []
+        with open(self.path, "rb") as f:
+            for position in positions:
+                f.seek(offsets[position])
+                found.append(json.loads(f.readline()))
+        return found
+
+    def tail(self, count):
+        """
+        Returns the newest `count` events, oldest first, with one read.
+        """
+        index = self.index
+        if not count or not len(index):
+            return []
+        start = index.columns["offsets"][max(len(index) - count, 0)]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(index.size - start)
+        events = []
+        for line in data.splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events[-count:]
+
+    def query(self, type=None, severity=None, loops=None, since=None, until=None, limit=None):
+        """
+        Returns the events matching every given filter, in log order:
+        `type`, `severity`, `loops` as (first, last) inclusive (either may
+        be None), and since <= Timestamp < until as ISO 8601 strings. With
+        `limit`, only the newest `limit` matches are read. Raises
+        ValueError if `since` or `until` is not a timestamp.
+        """
+        positions = self.index.select(type, severity, loops, _bound(since), _bound(until))
+        if limit is not None:
+            positions = positions[-limit:] if limit else []
+        return self.events(positions)
+
+    def _render(self, head, footer, limit, legacy=()):
+        events = self.tail(limit)
+        note = (
+            f"*(Rendered from `{self.path.relative_to(self.root).as_posix()}`: "
+            f"the newest {len(events)} of {len(self.index)} events. "
+            f"`python -m contextcascade.audit` queries the full log.)*"
+        )
+        body = "\n" + note + "\n\n" + "".join(format_event(event) for event in events) + "".join(legacy)
+        if footer:
+            body += "\n"
+        return head + body + footer
+
+    def view(self, limit=VIEW_LIMIT):
+        """
+        Returns meta_audit.md rendered with the newest `limit` events.
+        Legacy entries, in the "Current Audit Log" section or below the
+        last section, are kept until absorbed.
+        """
+        text = self.view_path.read_text(encoding="utf-8")
+        if not len(self.index):
+            return text
+        head, body, footer = split_view(text)
+        return self._render(head, footer, limit, legacy_entries(body))
+
+    def render_view(self, limit=VIEW_LIMIT):
+        """
+        Absorbs legacy entries (see absorb_view()), then rewrites
+        meta_audit.md from the sidecar. Returns True if it changed.
+        """
+        absorbed = self.absorb_view(limit)
+        text = self.view(limit)
+        if text == self.view_path.read_text(encoding="utf-8"):
+            return bool(absorbed)
+        atomic_write(self.view_path, text)
+        return True
+
+    def render(self):
+        """
+        Returns the full markdown log: the view with every event.
+        """
+        return self.view(limit=len(self.index))
+
+
+def _loop_range(value):
+    first, dash, last = value.partition("-")
+    try:
+        first = int(first) if first else None
+        last = int(last) if last else None if dash else first
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIRST-LAST, got {value!r}") from None
+    return first, last
+
+
+def _timestamp(value):
+    try:
+        return _bound(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the meta-audit event log.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--type", help="Event type, e.g. hashMismatch.")
+    parser.add_argument("--severity", help="Severity, e.g. CRITICAL.")
+    parser.add_argument("--loops", type=_loop_range, metavar="FIRST-LAST", help="Loop ID range (inclusive).")
+    parser.add_argument("--since", type=_timestamp, help="Events at or after this timestamp.")
+    parser.add_argument("--until", type=_timestamp, help="Events before this timestamp.")
+    parser.add_argument("--limit", type=int, help="Only the newest N matches.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Print matches as JSON lines.")
+    output.add_argument("--count", action="store_true", help="Print the number of matches only.")
+    output.add_argument("--render", action="store_true", help="Print the full markdown log.")
+    output.add_argument("--view", action="store_true", help="Re-render audit/meta_audit.md from the sidecar.")
+    output.add_argument("--absorb", action="store_true", help="Move entries written to meta_audit.md into the sidecar.")
+    args = parser.parse_args(argv)
+
+    log = AuditLog(args.root)
+    try:
+        if args.absorb:
+            print(f"Moved {log.absorb_view()} entries into {log.path}")
+            log.render_view()
+            return 0
+        if args.view:
+            print(f"/{AUDIT_FILE} {'rendered' if log.render_view() else 'unchanged'} ({len(log)} events)")
+            return 0
+        if args.render:
+            sys.stdout.write(log.render())
+            return 0
+
+        start = time.perf_counter()
+        positions = log.index.select(args.type, args.severity, args.loops, args.since, args.until)
+        elapsed = time.perf_counter() - start
+        if args.count:
+            print(f"{len(positions)} of {len(log)} events ({elapsed * 1000:.2f} ms)")
+            return 0 if positions else 1
+        if args.limit is not None:
+            positions = positions[-args.limit:] if args.limit else []
+        for event in log.events(positions):
+            if args.json:
+                print(json.dumps(event, sort_keys=True, ensure_ascii=False))
+            else:
+                sys.stdout.write(format_event(event))
+        return 0 if positions else 1
+    finally:
+        log.save()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Entry handling for rolling buffers and append-only logs.
+
+An entry is a top-level list item led by a single-word bold key, as in the
+formats documented in the log files themselves:
+
+    - **JobID:** 3f2a9c1b7d40
+      **Intent:** ...
+
+Entries are appended at the end of the file, so only items after the last
+markdown heading count; bold-keyed prose bullets in earlier sections and
+examples inside fenced code blocks belong to the header.
+"""
+import re
+
+ENTRY_START_RE = re.compile(r"^- \*\*[A-Za-z][\w-]*:\*\*")
+FENCE_PREFIX = "```"
+HEADING_RE = re.compile(r"^#{1,6} ")
+
+# The "*(No entries yet ...)*" line that ships in empty logs.
+PLACEHOLDER_RE = re.compile(r"^\*\(No .*\)\*[ \t]*\n?", re.M)
+
+
+def entry_offsets(text):
+    """
+    Returns the character offsets at which entries start.
+    """
+    offsets = []
+    in_fence = False
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        if line.startswith(FENCE_PREFIX):
+            in_fence = not in_fence
+        elif in_fence:
+            pass
+        elif HEADING_RE.match(line):
+            offsets = []
+        elif ENTRY_START_RE.match(line):
+            offsets.append(pos)
+        pos += len(line)
+    return offsets
+
+
+def split_entries(text):
+    """
+    Returns (header, [entry, ...]).
+    """
+    offsets = entry_offsets(text)
+    if not offsets:
+        return text, []
+    bounds = offsets + [len(text)]
+    return text[: offsets[0]], [text[bounds[i] : bounds[i + 1]] for i in range(len(offsets))]
+
+
+def format_entry(fields):
+    """
+    Renders an ordered sequence of (key, value) pairs as one entry. A value
+    starting with a newline is emitted as an indented block under its key.
+    """
+    lines = []
+    for i, (key, value) in enumerate(fields):
+        prefix = "- " if i == 0 else "  "
+        value = str(value)
+        sep = "" if value.startswith("\n") else " "
+        lines.append(f"{prefix}**{key}:**{sep}{value}")
+    return "\n".join(lines) + "\n"
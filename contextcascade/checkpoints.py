@@ -0,0 +1,495 @@
+"""
+Fixed-width binary index for `checkpoints/loop_checkpoint.md`.
+
+`_cache/checkpoint_index.bin` holds a header followed by one 64-byte
+record per checkpoint entry, in log order:
+
+    loop        u64   LoopID (NO_LOOP if it is not an integer)
+    timestamp   i64   epoch seconds (-1 if unparsable)
+    offset      u64   byte offset of the entry in the log
+    plan        32s   SHA-256 of the executed job plan
+    flags       u32   GOOD, WARNING and the gap bits
+    last_good   u32   1 + position of the newest good record at or
+                      before this one (0: none)
+
+The index is updated as entries are appended. refresh() parses only the
+bytes the log gained since it was indexed. It writes the new records, and
+then the header, in place. A log that shrank or was rewritten is indexed
+again from the start. Records are read with positioned reads, so:
+
+- by_loop(loop_id) and at(timestamp) are binary searches, O(log n).
+  The index falls back to a scan if the log ever went out of order.
+- last_good() comes from the header, O(1). last_good(before=T) is one
+  binary search plus one record.
+
+Gap detection runs as each record is appended, comparing it with the one
+before. A record gets a gap flag when:
+
+- its LoopID skips ahead or does not increase;
+- its timestamp goes backwards;
+- more than TIME_GAP seconds passed since the previous checkpoint.
+
+refresh() returns the gaps found among records past the previously
+indexed log size, and gaps() lists all of them. A rebuild re-flags every
+record but only returns gaps for entries the old index had not seen, so a
+caller that reports refresh() results does not repeat older ones; without
+an old index there is nothing to compare against and none are returned.
+
+A checkpoint is good if its Outcome is `success` and its PostHashCheck is
+not `warning`.
+
+Usage:
+    index = CheckpointIndex("cascade")
+    new_gaps = index.refresh()
+    index.by_loop(157)
+    index.last_good(before="2025-01-01T00:00:00Z")
+
+    python -m contextcascade.checkpoints [--loop ID | --at TS | --last-good [--before TS] | --gaps]
+"""
+import argparse
+import bisect
+import hashlib
+import os
+import re
+import struct
+import sys
+
+from contextcascade.archive import FIELD_RE
+from contextcascade.audit import parse_timestamp
+from contextcascade.buffers import FENCE_PREFIX
+from contextcascade.tree import DEFAULT_ROOT, cache_path, key_path
+
+CHECKPOINT_LOG = "checkpoints/loop_checkpoint.md"
+INDEX_FILE = "checkpoint_index.bin"
+INDEX_MAGIC = b"CCCKPT01"
+INDEX_VERSION = 1
+
+# Magic, version, flags, indexed log bytes, SHA-256 of the log's first
+# HEAD_BYTES, count, 1 + position of the newest good record.
+HEADER = struct.Struct("<8sIIQ32sQQ")
+HEADER_FIELDS = ("magic", "version", "flags", "size", "head", "count", "last_good")
+RECORD = struct.Struct("<QqQ32sII")
+
+HEAD_BYTES = 4096
+SCAN_RECORDS = 4096
+NO_LOOP = (1 << 64) - 1
+
+# Two checkpoints further apart than this (seconds) are a timestamp gap.
+TIME_GAP = 86400
+
+# Record flags.
+GOOD = 1
+WARNING = 2
+LOOP_SKIP = 4
+LOOP_REPEAT = 8
+TIME_GAP_FLAG = 16
+TIME_BACK = 32
+GAP_KINDS = {
+    LOOP_SKIP: "loopSkip",
+    LOOP_REPEAT: "loopRepeat",
+    TIME_GAP_FLAG: "timeGap",
+    TIME_BACK: "timeBack",
+}
+GAP_FLAGS = LOOP_SKIP | LOOP_REPEAT | TIME_GAP_FLAG | TIME_BACK
+
+# Header flags: the records are in LoopID / timestamp order.
+LOOPS_SORTED = 1
+TIMES_SORTED = 2
+
+ENTRY_RE = re.compile(rb"^- \*\*LoopID:\*\*", re.M)
+DIGEST_RE = re.compile(r"\b([0-9a-fA-F]{64})\b")
+
+
+def entry_offsets(data, base=0):
+    """
+    Returns the offsets (plus `base`) of the checkpoint entries in log
+    bytes `data`, skipping fenced examples.
+    """
+    offsets = []
+    in_fence = False
+    pos = 0
+    fence = FENCE_PREFIX.encode("ascii")
+    for line in data.splitlines(keepends=True):
+        if line.startswith(fence):
+            in_fence = not in_fence
+        elif not in_fence and ENTRY_RE.match(line):
+            offsets.append(base + pos)
+        pos += len(line)
+    return offsets
+
+
+def describe(text):
+    """
+    Returns (loop, timestamp, plan digest bytes, flags) for one entry.
+    """
+    fields = {}
+    for name, value in FIELD_RE.findall(text):
+        fields.setdefault(name, value.strip())
+    loop = fields.get("LoopID", "").strip("`")
+    loop = int(loop) if loop.isdigit() else NO_LOOP
+    reference = fields.get("JobPlanReference", "")
+    match = DIGEST_RE.search(reference)
+    plan = bytes.fromhex(match.group(1)) if match else hashlib.sha256(reference.encode("utf-8")).digest()
+    flags = 0
+    if "warning" in fields.get("PostHashCheck", "").lower():
+        flags |= WARNING
+    elif "success" in fields.get("Outcome", "").lower():
+        flags |= GOOD
+    return loop, parse_timestamp(fields.get("Timestamp", "").strip("`")), plan, flags
+
+
+def _as_dict(position, record):
+    loop, timestamp, offset, plan, flags, last_good = record
+    return {
+        "position": position,
+        "loop": None if loop == NO_LOOP else loop,
+        "timestamp": None if timestamp < 0 else timestamp,
+        "offset": offset,
+        "plan": plan.hex(),
+        "good": bool(flags & GOOD),
+        "gaps": [kind for flag, kind in GAP_KINDS.items() if flags & flag],
+    }
+
+
+class _Column:
+    """
+    One record field as a read-only sequence, for bisect.
+    """
+
+    def __init__(self, f, count, field):
+        self.f = f
+        self.count = count
+        self.field = field
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        self.f.seek(HEADER.size + position * RECORD.size)
+        return RECORD.unpack(self.f.read(RECORD.size))[self.field]
+
+
+class CheckpointIndex:
+    """
+    The checkpoint index of one cascade root.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.log_path = key_path(root, CHECKPOINT_LOG)
+        self.path = cache_path(root, INDEX_FILE)
+        self.header = None
+
+    def _log_head(self, length):
+        with open(self.log_path, "rb") as f:
+            return hashlib.sha256(f.read(min(length, HEAD_BYTES))).digest()
+
+    def _read_header(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read(HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        header = dict(zip(HEADER_FIELDS, HEADER.unpack(data)))
+        if header["magic"] != INDEX_MAGIC or header["version"] != INDEX_VERSION:
+            return None
+        if size < HEADER.size + header["count"] * RECORD.size:
+            return None
+        return header
+
+    def _empty_header(self):
+        return {
+            "magic": INDEX_MAGIC,
+            "version": INDEX_VERSION,
+            "flags": LOOPS_SORTED | TIMES_SORTED,
+            "size": 0,
+            "head": b"",
+            "count": 0,
+            "last_good": 0,
+        }
+
+    def _record(self, f, position):
+        f.seek(HEADER.size + position * RECORD.size)
+        return RECORD.unpack(f.read(RECORD.size))
+
+    def _scan(self, f, start=0, reverse=False):
+        """
+        Yields (position, record) from position `start` on (or from the
+        last record back to `start`), reading SCAN_RECORDS at a time.
+        """
+        count = self.header["count"]
+        chunks = range(start, count, SCAN_RECORDS)
+        for first in reversed(chunks) if reverse else chunks:
+            f.seek(HEADER.size + first * RECORD.size)
+            records = list(RECORD.iter_unpack(f.read(min(SCAN_RECORDS, count - first) * RECORD.size)))
+            pairs = enumerate(records, first)
+            yield from reversed(list(pairs)) if reverse else pairs
+
+    def refresh(self):
+        """
+        Indexes checkpoint entries appended since the last refresh (or
+        the whole log if it was rewritten). Returns the gaps among the
+        records past the previously indexed size, as gaps() does.
+        """
+        header = self._read_header()
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if header is not None and size == header["size"]:
+            self.header = header
+            return []
+        # Records starting before this offset were indexed (and their gaps
+        # returned) by an earlier refresh.
+        reported = size if header is None else header["size"]
+        if header is None or size < header["size"] or (header["size"] and self._log_head(header["size"]) != header["head"]):
+            header = self._empty_header()
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(*(header[name] for name in HEADER_FIELDS)))
+
+        with open(self.log_path, "rb") as f:
+            f.seek(header["size"])
+            data = f.read(size - header["size"])
+        offsets = entry_offsets(data, header["size"])
+        bounds = offsets + [size]
+
+        with open(self.path, "r+b") as f:
+            previous = self._record(f, header["count"] - 1) if header["count"] else None
+            first = header["count"]
+            records = []
+            gaps = []
+            for start, end in zip(bounds, bounds[1:]):
+                text = data[start - header["size"] : end - header["size"]].decode("utf-8", "replace")
+                loop, timestamp, plan, flags = describe(text)
+                if previous is not None:
+                    flags |= self._gap_flags(header, previous, loop, timestamp)
+                position = first + len(records)
+                if flags & GOOD:
+                    header["last_good"] = position + 1
+                record = (loop, timestamp, start, plan, flags, header["last_good"])
+                records.append(record)
+                if flags & GAP_FLAGS and start >= reported:
+                    gaps.append(self._gap(position, record, previous))
+                previous = record
+            f.seek(HEADER.size + first * RECORD.size)
+            f.write(b"".join(RECORD.pack(*record) for record in records))
+            f.truncate()
+            header["count"] = first + len(records)
+            header["size"] = size
+            header["head"] = self._log_head(size) if size else b""
+            f.seek(0)
+            f.write(HEADER.pack(*(header[name] for name in HEADER_FIELDS)))
+        self.header = header
+        return gaps
+
+    @staticmethod
+    def _gap_flags(header, previous, loop, timestamp):
+        flags = 0
+        if loop == NO_LOOP or previous[0] == NO_LOOP:
+            header["flags"] &= ~LOOPS_SORTED
+        elif loop > previous[0] + 1:
+            flags |= LOOP_SKIP
+        elif loop <= previous[0]:
+            flags |= LOOP_REPEAT
+            if loop < previous[0]:
+                header["flags"] &= ~LOOPS_SORTED
+        if timestamp < 0 or previous[1] < 0:
+            header["flags"] &= ~TIMES_SORTED
+        elif timestamp < previous[1]:
+            flags |= TIME_BACK
+            header["flags"] &= ~TIMES_SORTED
+        elif timestamp - previous[1] > TIME_GAP:
+            flags |= TIME_GAP_FLAG
+        return flags
+
+    @staticmethod
+    def _gap(position, record, previous):
+        gap = _as_dict(position, record)
+        gap["previousLoop"] = None if previous[0] == NO_LOOP else previous[0]
+        gap["previousTimestamp"] = None if previous[1] < 0 else previous[1]
+        return gap
+
+    def _ensure(self):
+        if self.header is None:
+            self.refresh()
+        return self.header
+
+    def __len__(self):
+        return self._ensure()["count"]
+
+    def record(self, position):
+        """
+        Returns record `position` as a dict: position, loop, timestamp,
+        offset, plan (hex), good, gaps (kinds).
+        """
+        self._ensure()
+        with open(self.path, "rb") as f:
+            return _as_dict(position, self._record(f, position))
+
+    def _search(self, field, value, sorted_flag, right):
+        """
+        Returns the number of records whose `field` is <= `value` (right)
+        or < `value`, by binary search; None if the records are not in
+        order on that field.
+        """
+        header = self._ensure()
+        if not header["flags"] & sorted_flag:
+            return None
+        search = bisect.bisect_right if right else bisect.bisect_left
+        with open(self.path, "rb") as f:
+            return search(_Column(f, header["count"], field), value)
+
+    def by_loop(self, loop_id):
+        """
+        Returns the record of LoopID `loop_id`, or None.
+        """
+        header = self._ensure()
+        found = self._search(0, loop_id, LOOPS_SORTED, right=False)
+        with open(self.path, "rb") as f:
+            if found is None:
+                for position, record in self._scan(f):
+                    if record[0] == loop_id:
+                        return _as_dict(position, record)
+            elif found < header["count"]:
+                record = self._record(f, found)
+                if record[0] == loop_id:
+                    return _as_dict(found, record)
+        return None
+
+    def _at_or_before(self, f, timestamp):
+        """
+        Returns the position of the newest record at or before
+        `timestamp` (epoch seconds), or -1.
+        """
+        found = self._search(1, timestamp, TIMES_SORTED, right=True)
+        if found is not None:
+            return found - 1
+        for position, record in self._scan(f, reverse=True):
+            if 0 <= record[1] <= timestamp:
+                return position
+        return -1
+
+    def at(self, timestamp):
+        """
+        Returns the newest checkpoint at or before `timestamp` (ISO 8601
+        or epoch seconds), or None.
+        """
+        self._ensure()
+        if isinstance(timestamp, str):
+            timestamp = parse_timestamp(timestamp)
+        with open(self.path, "rb") as f:
+            position = self._at_or_before(f, timestamp)
+            return _as_dict(position, self._record(f, position)) if position >= 0 else None
+
+    def last_good(self, before=None):
+        """
+        Returns the newest good checkpoint, or the newest one at or before
+        `before` (ISO 8601 or epoch seconds), or None.
+        """
+        header = self._ensure()
+        if isinstance(before, str):
+            before = parse_timestamp(before)
+        with open(self.path, "rb") as f:
+            if before is None:
+                last = header["last_good"]
+            elif header["flags"] & TIMES_SORTED:
+                position = self._at_or_before(f, before)
+                last = self._record(f, position)[5] if position >= 0 else 0
+            else:
+                # Out of order: the log-order pointer may point past
+                # `before`, so look for the newest good record in time.
+                last = 0
+                for position, record in self._scan(f, reverse=True):
+                    if record[4] & GOOD and 0 <= record[1] <= before:
+                        last = position + 1
+                        break
+            return _as_dict(last - 1, self._record(f, last - 1)) if last else None
+
+    def gaps(self, start=0):
+        """
+        Returns the records from position `start` on that follow a gap,
+        each with previousLoop and previousTimestamp.
+        """
+        self._ensure()
+        found = []
+        with open(self.path, "rb") as f:
+            previous = self._record(f, start - 1) if start > 0 else None
+            for position, record in self._scan(f, start):
+                if record[4] & GAP_FLAGS:
+                    found.append(self._gap(position, record, previous))
+                previous = record
+        return found
+
+    def entry(self, record):
+        """
+        Returns the markdown text of the checkpoint `record` (a dict from
+        this index).
+        """
+        header = self._ensure()
+        position = record["position"]
+        with open(self.path, "rb") as f:
+            end = self._record(f, position + 1)[2] if position + 1 < header["count"] else header["size"]
+        with open(self.log_path, "rb") as f:
+            f.seek(record["offset"])
+            return f.read(end - record["offset"]).decode("utf-8")
+
+
+def describe_gap(gap):
+    """
+    Returns a one-line description of a gap from gaps() or refresh().
+    """
+    parts = []
+    if "loopSkip" in gap["gaps"]:
+        parts.append(f"LoopIDs {gap['previousLoop'] + 1}-{gap['loop'] - 1} missing")
+    if "loopRepeat" in gap["gaps"]:
+        parts.append(f"LoopID {gap['loop']} after {gap['previousLoop']}")
+    if "timeBack" in gap["gaps"]:
+        parts.append("timestamp earlier than the previous checkpoint")
+    if "timeGap" in gap["gaps"]:
+        parts.append(f"{(gap['timestamp'] - gap['previousTimestamp']) // 3600} h since the previous checkpoint")
+    return f"checkpoint {gap['position']} (LoopID {gap['loop']}): " + "; ".join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the loop checkpoint index.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--loop", type=int, help="The checkpoint of this LoopID.")
+    group.add_argument("--at", help="The newest checkpoint at or before this timestamp.")
+    group.add_argument("--last-good", action="store_true", help="The newest good checkpoint.")
+    group.add_argument("--gaps", action="store_true", help="List LoopID and timestamp gaps.")
+    parser.add_argument("--before", help="With --last-good: at or before this timestamp.")
+    args = parser.parse_args(argv)
+
+    index = CheckpointIndex(args.root)
+    index.refresh()
+    if args.gaps:
+        gaps = index.gaps()
+        for gap in gaps:
+            print(describe_gap(gap))
+        return 1 if gaps else 0
+    if args.loop is not None:
+        record = index.by_loop(args.loop)
+    elif args.at:
+        record = index.at(args.at)
+    elif args.last_good:
+        record = index.last_good(args.before)
+    else:
+        last = index.record(len(index) - 1) if len(index) else None
+        good = index.last_good()
+        print(
+            f"{len(index)} checkpoints; last LoopID {last['loop'] if last else '-'}, "
+            f"last good LoopID {good['loop'] if good else '-'}, {len(index.gaps())} gap(s)"
+        )
+        return 0
+    if record is None:
+        return 1
+    sys.stdout.write(index.entry(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Lifecycle counter files (`lifecycle/*.md`).
+
+Each counter file holds its value in a "Current Count" paragraph, written
+either as
+
+    **Current Count:**
+
+    0
+
+or inline as `**Current Count**: 0`.
+"""
+import re
+
+COUNT_RE = re.compile(r"(\*\*Current Count:?\*\*:?\s*)(\d+)")
+
+
+class CounterError(ValueError):
+    """
+    Raised when a counter file has no readable "Current Count" value.
+    """
+
+
+def read_count(text):
+    match = COUNT_RE.search(text)
+    if not match:
+        raise CounterError("No 'Current Count' value found")
+    return int(match.group(2))
+
+
+def write_count(text, value):
+    """
+    Returns `text` with its count replaced by `value`.
+    """
+    if value < 0:
+        raise CounterError("Counter values must be non-negative")
+    new_text, replaced = COUNT_RE.subn(lambda m: f"{m.group(1)}{value}", text, count=1)
+    if not replaced:
+        raise CounterError("No 'Current Count' value found")
+    return new_text
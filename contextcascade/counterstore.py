@@ -0,0 +1,237 @@
+"""
+Binary lifecycle counter store.
+
+All lifecycle counters live in one small fixed-layout file,
+`_state/counters.bin`, which is memory-mapped. The file holds two slots,
+each a complete copy of every counter with a generation number, a CRC32
+and a tag. A batch of increments writes the whole counter set into the
+inactive slot with the next generation and syncs it once. That is the
+commit: readers use the valid slot with the highest generation, so a torn
+write is simply ignored. The previous state stays in the other slot,
+which makes revert(tag) (used by journal recovery) a single slot
+invalidation.
+
+The markdown counter files (`lifecycle/*.md`) are rendered views of the
+store; see render_views(), which the loop calls after each commit.
+Counters missing from the store are seeded from their view on first use.
+
+Layout (little-endian):
+    header   magic "CCCNT001", capacity (u32), reserved (u32)
+    slot x2  generation (u64), crc32 (u32), count (u32), tag (32 bytes),
+             then `capacity` records of name (48 bytes) + value (u64)
+
+Usage:
+    store = CounterStore("cascade")
+    values = store.preview(["cascade/lifecycle/counter.md", "cascade/lifecycle/client.md"])
+    store.commit(values, tag=txid)
+    store.revert(txid)                      # undo that commit
+
+    python -m contextcascade.counterstore [--render]
+"""
+import argparse
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import zlib
+
+from contextcascade import counters
+from contextcascade.atomic import AtomicBatch
+from contextcascade.counters import CounterError
+from contextcascade.tree import DEFAULT_ROOT, STATE_DIR, key_path
+
+STORE_FILE = "counters.bin"
+MAGIC = b"CCCNT001"
+CAPACITY = 512
+
+_HEADER = struct.Struct("<8sII")
+_SLOT_HEAD = struct.Struct("<QII32s")
+_RECORD = struct.Struct("<48sQ")
+SLOT_SIZE = _SLOT_HEAD.size + CAPACITY * _RECORD.size
+
+
+def _slot_offset(index):
+    return _HEADER.size + index * SLOT_SIZE
+
+
+def _encode(text, size):
+    data = text.encode("utf-8")
+    if len(data) > size:
+        raise CounterError(f"Counter store field too long: {text!r}")
+    return data
+
+
+class CounterStore:
+    """
+    The memory-mapped counter file of one cascade root. Counters are
+    named by the tree key of their view, e.g.
+    "cascade/lifecycle/client.md".
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.path = pathlib.Path(root) / STATE_DIR / STORE_FILE
+        size = _HEADER.size + 2 * SLOT_SIZE
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "xb") as f:
+                f.write(_HEADER.pack(MAGIC, CAPACITY, 0) + bytes(2 * SLOT_SIZE))
+                f.flush()
+                os.fsync(f.fileno())
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        magic, capacity, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or capacity != CAPACITY:
+            self.close()
+            raise CounterError(f"{self.path} is not a counter store")
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # -------------------- Slots ------------------------
+
+    def _read_slot(self, index):
+        """
+        Returns (generation, tag, {name: value}) or None if the slot is
+        empty or torn.
+        """
+        offset = _slot_offset(index)
+        generation, crc, count, tag = _SLOT_HEAD.unpack_from(self._map, offset)
+        if not generation or count > CAPACITY:
+            return None
+        body = self._map[offset + 12 : offset + SLOT_SIZE]
+        if zlib.crc32(struct.pack("<Q", generation) + body) != crc:
+            return None
+        values = {}
+        for i in range(count):
+            name, value = _RECORD.unpack_from(self._map, offset + _SLOT_HEAD.size + i * _RECORD.size)
+            values[name.rstrip(b"\0").decode("utf-8")] = value
+        return generation, tag.rstrip(b"\0").decode("utf-8"), values
+
+    def _active(self):
+        """
+        Returns (slot index, generation, tag, values) of the newest valid
+        slot, or (None, 0, "", {}) for an empty store.
+        """
+        best = (None, 0, "", {})
+        for index in (0, 1):
+            slot = self._read_slot(index)
+            if slot and slot[0] > best[1]:
+                best = (index,) + slot
+        return best
+
+    def _sync(self, offset, length):
+        # msync needs a page-aligned start.
+        start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        self._map.flush(start, offset + length - start)
+
+    def values(self):
+        return dict(self._active()[3])
+
+    def get(self, name, default=None):
+        return self._active()[3].get(name, default)
+
+    # -------------------- Updates ----------------------
+
+    def _seed(self, name):
+        with open(key_path(self.root, name), encoding="utf-8") as f:
+            return counters.read_count(f.read())
+
+    def preview(self, names, by=1):
+        """
+        Returns the full counter set with `names` incremented by `by`,
+        without committing it. Unknown counters are seeded from their
+        markdown view.
+        """
+        values = self.values()
+        for name in names:
+            if name not in values:
+                values[name] = self._seed(name)
+            values[name] += by
+        return values
+
+    def commit(self, values, tag=""):
+        """
+        Atomically replaces the counter set with `values` (as returned by
+        preview()). `tag` identifies the commit for revert().
+        """
+        if len(values) > CAPACITY:
+            raise CounterError(f"Counter store holds at most {CAPACITY} counters")
+        index, generation, _, current = self._active()
+        for name, value in values.items():
+            if value < current.get(name, 0):
+                raise CounterError(f"Counter {name} may only increase")
+        target = 1 if index == 0 else 0
+        records = b"".join(
+            _RECORD.pack(_encode(name, 48), value) for name, value in sorted(values.items())
+        ).ljust(CAPACITY * _RECORD.size, b"\0")
+        generation += 1
+        body = struct.pack("<I32s", len(values), _encode(tag, 32)) + records
+        crc = zlib.crc32(struct.pack("<Q", generation) + body)
+        offset = _slot_offset(target)
+        self._map[offset : offset + SLOT_SIZE] = struct.pack("<QI", generation, crc) + body
+        self._sync(offset, SLOT_SIZE)
+        return values
+
+    def revert(self, tag):
+        """
+        Undoes the newest commit if it carries `tag`, making the previous
+        slot current again. Returns True if a commit was undone.
+        """
+        index, _, active_tag, _ = self._active()
+        if index is None or not tag or active_tag != tag:
+            return False
+        offset = _slot_offset(index)
+        self._map[offset : offset + 8] = bytes(8)
+        self._sync(offset, 8)
+        return True
+
+
+def render_views(root=DEFAULT_ROOT, store=None):
+    """
+    Rewrites the "Current Count" of every markdown view whose value
+    differs from the store. Returns the keys rewritten.
+    """
+    own = store is None
+    store = store or CounterStore(root)
+    try:
+        changed = []
+        with AtomicBatch() as batch:
+            for name, value in sorted(store.values().items()):
+                path = key_path(root, name)
+                text = path.read_text(encoding="utf-8")
+                if counters.read_count(text) != value:
+                    batch.stage(path, counters.write_count(text, value))
+                    changed.append(name)
+        return changed
+    finally:
+        if own:
+            store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the lifecycle counter store or render its markdown views.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--render", action="store_true", help="Rewrite lifecycle/*.md from the store.")
+    args = parser.parse_args(argv)
+
+    with CounterStore(args.root) as store:
+        for name, value in sorted(store.values().items()):
+            print(f"{name}: {value}")
+        if args.render:
+            for key in render_views(args.root, store):
+                print(f"rendered /{key}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
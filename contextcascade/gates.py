@@ -0,0 +1,293 @@
+"""
+Compiled write-gate engine for `security/write_gates.md`.
+
+The rules in the "Current Gate Configuration" section are parsed once
+into a trie keyed by path segment. Literal segments are dictionary
+children, `*`-style segments (`*`, `*.md`) are pattern children and `**`
+matches any number of segments. The trie is rebuilt only when the file's
+SHA-256 changes. A lookup walks the trie along the path, so its cost
+depends on path depth, not on the number of rules. Decisions are kept in
+an LRU cache.
+
+Precedence: the most specific matching rule wins. Specificity is compared
+by literal segments, then pattern segments, then fewer `**`, then literal
+characters. On a tie `deny` beats `allow`, then the earlier rule wins. An
+`allow` with an `editPolicy` admits only that policy (and the policies it
+implies, see POLICY_IMPLIES). A path inside the cascade root that no
+rule matches is allowed: the configuration's catch-all
+`deny: "/cascade/**"` is opt-in. A path outside the root is always
+denied. `.` and `..` segments are resolved before matching, so
+`/cascade/domains/../00_BOOTSTRAP.md` is checked as
+`/cascade/00_BOOTSTRAP.md`, and a path whose `..` climbs above the root
+is denied.
+
+Usage:
+    gates = WriteGates("cascade")
+    gates.refresh()                         # once per loop
+    gates.check("cascade/domains/client/index.md", "appendOrReplace")
+    # -> {"allowed": True, "rule": {...}, "reason": "..."}
+
+    python -m contextcascade.gates PATH[=EDIT_POLICY] ...
+"""
+import argparse
+import fnmatch
+import functools
+import pathlib
+import re
+import sys
+
+from contextcascade.hashcache import HashCache
+from contextcascade.tree import DEFAULT_ROOT, file_key, key_path
+
+GATES_FILE = "security/write_gates.md"
+SECTION_HEADING = "## Current Gate Configuration"
+CACHE_SIZE = 4096
+
+RULE_RE = re.compile(r"^\s*-\s*(allow|deny)\s*:\s*[\"']?([^\"'#\s]+)[\"']?")
+POLICY_RE = re.compile(r"^\s+editPolicy\s*:\s*[\"']?([^\"'#\s]+)[\"']?")
+
+# A rule's editPolicy also admits these weaker policies.
+POLICY_IMPLIES = {
+    "overwrite": {"overwrite", "replaceOnly", "appendOrReplace", "appendOnly", "incrementOnly"},
+    "appendOrReplace": {"appendOrReplace", "appendOnly", "incrementOnly"},
+    "replaceOnly": {"replaceOnly"},
+    "appendOnly": {"appendOnly", "incrementOnly"},
+    "incrementOnly": {"incrementOnly"},
+}
+
+
+class GateError(ValueError):
+    """
+    Raised when the gate configuration cannot be parsed.
+    """
+
+
+def parse_rules(text):
+    """
+    Returns the rules of the "Current Gate Configuration" section as
+    dicts: action, pattern, editPolicy (or None), line.
+    """
+    head, marker, section = text.partition(SECTION_HEADING)
+    if not marker:
+        raise GateError(f"No '{SECTION_HEADING}' section in {GATES_FILE}")
+    section = re.split(r"^---\s*$", section, maxsplit=1, flags=re.M)[0]
+    first_line = head.count("\n") + 1
+    rules = []
+    for offset, line in enumerate(section.splitlines()):
+        match = RULE_RE.match(line)
+        if match:
+            rules.append({
+                "action": match.group(1),
+                "pattern": match.group(2),
+                "editPolicy": None,
+                "line": first_line + offset,
+            })
+            continue
+        match = POLICY_RE.match(line)
+        if match:
+            if not rules or rules[-1]["editPolicy"] is not None:
+                raise GateError(f"{GATES_FILE}:{first_line + offset}: editPolicy without a rule")
+            rules[-1]["editPolicy"] = match.group(1)
+    return rules
+
+
+def _segments(path):
+    """
+    Splits `path` into segments with `.` and `..` resolved. Raises
+    GateError if a `..` climbs above the first segment.
+    """
+    segments = []
+    for segment in path.split("/"):
+        if segment in ("", "."):
+            continue
+        if segment == "..":
+            if not segments:
+                raise GateError(f"{path} climbs above the cascade root")
+            segments.pop()
+        else:
+            segments.append(segment)
+    return segments
+
+
+def specificity(rule):
+    """
+    Sort key of a rule: higher is more specific.
+    """
+    segments = _segments(rule["pattern"])
+    literal = [segment for segment in segments if not any(c in segment for c in "*?[")]
+    wild = [segment for segment in segments if segment != "**" and segment not in literal and segment != "*"]
+    return (
+        len(literal),
+        len(wild),
+        -segments.count("**"),
+        sum(len(segment) for segment in literal) + sum(len(segment.replace("*", "")) for segment in wild),
+        rule["action"] == "deny",
+        -rule["line"],
+    )
+
+
+class _Node:
+    __slots__ = ("literal", "patterns", "globstar", "rules")
+
+    def __init__(self):
+        self.literal = {}
+        self.patterns = []
+        self.globstar = None
+        self.rules = []
+
+
+class GateTrie:
+    """
+    Compiled rules, keyed by path segment. With `top` (the cascade root's
+    name), paths outside `/<top>/` are denied.
+    """
+
+    def __init__(self, rules, top=None):
+        self.rules = rules
+        self.top = top
+        self.root = _Node()
+        for rule in rules:
+            node = self.root
+            for segment in _segments(rule["pattern"]):
+                if segment == "**":
+                    node.globstar = node.globstar or _Node()
+                    node = node.globstar
+                elif any(c in segment for c in "*?["):
+                    for pattern, regex, child in node.patterns:
+                        if pattern == segment:
+                            node = child
+                            break
+                    else:
+                        child = _Node()
+                        node.patterns.append((segment, re.compile(fnmatch.translate(segment)), child))
+                        node = child
+                else:
+                    node = node.literal.setdefault(segment, _Node())
+            node.rules.append(rule)
+
+    def matches(self, path):
+        """
+        Returns every rule whose pattern matches `path`.
+        """
+        segments = _segments(path)
+        found = []
+        stack = [(self.root, 0)]
+        seen = set()
+        while stack:
+            node, i = stack.pop()
+            if (id(node), i) in seen:
+                continue
+            seen.add((id(node), i))
+            if node.globstar is not None:
+                # `**` consumes zero or more segments.
+                for j in range(i, len(segments) + 1):
+                    stack.append((node.globstar, j))
+            if i == len(segments):
+                found.extend(node.rules)
+                continue
+            segment = segments[i]
+            child = node.literal.get(segment)
+            if child is not None:
+                stack.append((child, i + 1))
+            for _, regex, child in node.patterns:
+                if regex.match(segment):
+                    stack.append((child, i + 1))
+        return found
+
+    def decide(self, path, edit_policy=None):
+        """
+        Returns the decision dict for writing `path` with `edit_policy`.
+        """
+        try:
+            segments = _segments(path)
+        except GateError:
+            segments = None
+        if segments is None or (self.top and segments[:1] != [self.top]):
+            return {"allowed": False, "rule": None, "reason": "outside the cascade root"}
+        matched = self.matches(path)
+        if not matched:
+            return {"allowed": True, "rule": None, "reason": "no write gate matches"}
+        rule = max(matched, key=specificity)
+        where = f'{rule["action"]}: "{rule["pattern"]}" ({GATES_FILE}:{rule["line"]})'
+        if rule["action"] == "deny":
+            return {"allowed": False, "rule": rule, "reason": f"denied by {where}"}
+        allowed = rule["editPolicy"]
+        if allowed and edit_policy and edit_policy not in POLICY_IMPLIES.get(allowed, {allowed}):
+            return {
+                "allowed": False,
+                "rule": rule,
+                "reason": f"editPolicy {edit_policy} not permitted by {where} (allows {allowed})",
+            }
+        return {"allowed": True, "rule": rule, "reason": f"allowed by {where}"}
+
+
+class WriteGates:
+    """
+    The write gates of one cascade root, recompiled when write_gates.md
+    changes.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, hashes=None, cache_size=CACHE_SIZE):
+        self.root = root
+        self.hashes = hashes or HashCache(root)
+        self.key = file_key(root, key_path(root, GATES_FILE))
+        self.cache_size = cache_size
+        self.digest = None
+        self._trie = None
+        self._decide = None
+
+    def refresh(self):
+        """
+        Recompiles the rules if write_gates.md changed since the last
+        refresh. Returns the GateTrie.
+        """
+        entry = self.hashes.hash_keys([self.key]).get(self.key)
+        if entry is None:
+            raise GateError(f"Missing /{self.key}")
+        if entry["sha256"] != self.digest:
+            with open(key_path(self.root, self.key), encoding="utf-8") as f:
+                self._trie = GateTrie(parse_rules(f.read()), pathlib.Path(self.root).name)
+            self._decide = functools.lru_cache(maxsize=self.cache_size)(self._trie.decide)
+            self.digest = entry["sha256"]
+        return self._trie
+
+    def check(self, key, edit_policy=None):
+        """
+        Returns {"allowed", "rule", "reason"} for writing tree key `key`
+        with `edit_policy`, against the rules as of the last refresh().
+        Decisions are shared through the cache; do not modify them.
+        """
+        if self._decide is None:
+            self.refresh()
+        return self._decide("/" + key.lstrip("/"), edit_policy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check paths against security/write_gates.md.")
+    parser.add_argument("paths", nargs="*", metavar="PATH[=EDIT_POLICY]")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--rules", action="store_true", help="List the compiled rules by precedence.")
+    args = parser.parse_args(argv)
+
+    gates = WriteGates(args.root)
+    try:
+        trie = gates.refresh()
+    except GateError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.rules:
+        for rule in sorted(trie.rules, key=specificity, reverse=True):
+            policy = f" [{rule['editPolicy']}]" if rule["editPolicy"] else ""
+            print(f"{rule['line']:4d} {rule['action']:<5} {rule['pattern']}{policy}")
+    denied = 0
+    for item in args.paths:
+        path, _, policy = item.partition("=")
+        decision = gates.check(file_key(args.root, key_path(args.root, path)), policy or None)
+        denied += not decision["allowed"]
+        print(f"{'allow' if decision['allowed'] else 'DENY '} /{path.lstrip('/')}: {decision['reason']}")
+    gates.hashes.save()
+    return 2 if denied else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
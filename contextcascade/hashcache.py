@@ -0,0 +1,156 @@
+"""
+Stat-cached SHA-256 digests for the files of a cascade tree.
+
+HashCache remembers the digest of each file against its
+(inode, size, mtime_ns) in `_cache/hash_cache.json`, so only files that
+actually changed are re-read. Changed files are hashed in parallel, using
+mmap for large files and 1 MiB buffered reads otherwise. The
+protected-block check is folded into the same pass, so files with a
+protected block are found without a second read.
+
+The integrity snapshot (integrity.py), the Merkle record, the metadata
+index, the token ledger and the write gates all take their digests from
+here.
+
+Usage:
+    cache = HashCache("cascade")
+    cache.hash_tree()["cascade/00_BOOTSTRAP.md"]["sha256"]
+    cache.save()
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from contextcascade.atomic import atomic_write
+from contextcascade.tree import DEFAULT_ROOT, cache_path, iter_files, key_path
+
+CACHE_FILE = "hash_cache.json"
+
+# A protected block opens with the marker at the start of a line; inline
+# mentions of the syntax (e.g. in backticks) do not count. spans.py
+# locates spans with the same marker.
+PROTECTED_MARKER = b"\n<!-- PROTECTED -->"
+
+# Files at least this large are hashed through mmap instead of read().
+MMAP_THRESHOLD = 4 * 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+# A digest is only trusted on later runs if the file's mtime was at least
+# this far in the past when it was hashed. Otherwise a write landing in
+# the same timestamp tick right after hashing would go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def hash_file(path):
+    """
+    Returns (sha256 hex digest, has_protected_block) for `path`.
+    """
+    digest = hashlib.sha256()
+    protected = False
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+                protected = mm[: len(PROTECTED_MARKER) - 1] == PROTECTED_MARKER[1:] or mm.find(PROTECTED_MARKER) >= 0
+        else:
+            # Seeding the tail with a newline lets a marker on line 1 match.
+            tail = b"\n"
+            for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+                digest.update(chunk)
+                if not protected:
+                    protected = PROTECTED_MARKER in tail + chunk
+                    tail = chunk[-(len(PROTECTED_MARKER) - 1):]
+    return digest.hexdigest(), protected
+
+
+class HashCache:
+    """
+    Persistent (inode, size, mtime_ns) -> digest cache for a cascade tree.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, workers=None):
+        self.root = root
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.path = cache_path(root, CACHE_FILE)
+        self._entries = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+
+    def save(self):
+        if self._dirty:
+            atomic_write(self.path, json.dumps(self._entries, sort_keys=True))
+            self._dirty = False
+
+    def _lookup(self, key, st):
+        entry = self._entries.get(key)
+        if (
+            entry
+            and entry["ino"] == st.st_ino
+            and entry["size"] == st.st_size
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["mtime_ns"] + RACY_WINDOW_NS < entry["hashed_ns"]
+        ):
+            return entry
+        return None
+
+    def hash_keys(self, keys):
+        """
+        Returns {key: entry} for the given tree keys, where each entry
+        holds "sha256" and "protected". Only files whose stat signature
+        changed are re-hashed; those are hashed in parallel. Missing files
+        are omitted.
+        """
+        results = {}
+        stale = []
+        for key in keys:
+            try:
+                st = os.stat(key_path(self.root, key))
+            except FileNotFoundError:
+                continue
+            entry = self._lookup(key, st)
+            if entry is not None:
+                results[key] = entry
+            else:
+                stale.append((key, st))
+
+        if stale:
+            paths = [key_path(self.root, key) for key, _ in stale]
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                hashed = list(pool.map(hash_file, paths))
+            now = time.time_ns()
+            for (key, st), (digest, protected) in zip(stale, hashed):
+                entry = {
+                    "ino": st.st_ino,
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "hashed_ns": now,
+                    "sha256": digest,
+                    "protected": protected,
+                }
+                self._entries[key] = results[key] = entry
+            self._dirty = True
+        return results
+
+    def hash_tree(self, extra=()):
+        """
+        Hashes every file under the root, plus the `extra` keys (e.g.
+        archive segments, which the tree walk skips). Returns {key: entry}.
+        Entries for any other key are dropped.
+        """
+        keys = [key for key, _ in iter_files(self.root)] + list(extra)
+        results = self.hash_keys(keys)
+        for key in set(self._entries) - set(keys):
+            del self._entries[key]
+            self._dirty = True
+        return results
@@ -0,0 +1,137 @@
+"""
+Integrity snapshot for `audit/integrity_snapshot.md`.
+
+Per protocols/safeguards.md §3, every `immutable` file and every file with
+a `<!-- PROTECTED -->` block is hashed before and after each WRITE.
+Digests come from the stat-cached HashCache (see hashcache.py), so only
+files that actually changed are re-read, and protected blocks are found
+in the same pass.
+
+Output uses the snapshot's own line format:
+    /cascade/00_BOOTSTRAP.md: "<sha256>"
+
+Usage:
+    python -m contextcascade.integrity [--root cascade]    # print snapshot lines
+    python -m contextcascade.integrity --verify            # compare against the snapshot
+    python -m contextcascade.integrity --archives          # check cold archive segments
+"""
+import argparse
+import lzma
+import pathlib
+import re
+import sys
+import zlib
+
+from contextcascade.archive import COLD_SUFFIX, ColdSegment
+from contextcascade.hashcache import HashCache
+from contextcascade.meta import MetaIndex
+from contextcascade.tree import ARCHIVE_DIR, DEFAULT_ROOT, file_key, key_path
+
+SNAPSHOT_FILE = "audit/integrity_snapshot.md"
+
+SNAPSHOT_LINE_RE = re.compile(r'^\s*(/?[^\s:`]+):\s*"([0-9a-fA-F]{64})"\s*$')
+
+
+def tracked_digests(root=DEFAULT_ROOT, cache=None, index=None):
+    """
+    Returns {key: sha256} for every file the snapshot must cover:
+    `fileType: immutable` files and files containing a protected block.
+    """
+    cache = cache or HashCache(root)
+    index = index or MetaIndex(root)
+    index.refresh()
+    tracked = {}
+    for key, entry in cache.hash_tree().items():
+        meta = index.get(key) or {}
+        if meta.get("fileType") == "immutable" or entry["protected"]:
+            tracked[key] = entry["sha256"]
+    return tracked
+
+
+def format_snapshot(digests):
+    """
+    Renders {key: sha256} as snapshot lines, sorted by path.
+    """
+    return "\n".join(f'/{key}: "{digest}"' for key, digest in sorted(digests.items()))
+
+
+def parse_snapshot(text):
+    """
+    Returns {key: sha256} from snapshot text. The ledger is append-only,
+    so a later line for the same path supersedes earlier ones. Lines
+    inside fenced code blocks (the format examples) are ignored.
+    """
+    digests = {}
+    in_fence = False
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else SNAPSHOT_LINE_RE.match(line)
+        if match:
+            digests[match.group(1).lstrip("/")] = match.group(2).lower()
+    return digests
+
+
+def verify(root=DEFAULT_ROOT, cache=None):
+    """
+    Compares current digests against `audit/integrity_snapshot.md`.
+    Returns a list of (key, expected, actual) mismatches; actual is None
+    for files that no longer exist.
+    """
+    cache = cache or HashCache(root)
+    with open(key_path(root, SNAPSHOT_FILE), encoding="utf-8") as f:
+        expected = parse_snapshot(f.read())
+    current = cache.hash_keys(expected)
+    mismatches = []
+    for key, digest in sorted(expected.items()):
+        actual = current[key]["sha256"] if key in current else None
+        if actual != digest:
+            mismatches.append((key, digest, actual))
+    return mismatches
+
+
+def verify_archives(root=DEFAULT_ROOT):
+    """
+    Checks every cold archive segment against the SHA-256 recorded in its
+    footer, decompressing block by block. Returns the keys that fail.
+    """
+    failed = []
+    for path in sorted((pathlib.Path(root) / ARCHIVE_DIR).rglob(f"*{COLD_SUFFIX}")):
+        try:
+            ok = ColdSegment(path).verify()
+        except (OSError, ValueError, zlib.error, lzma.LZMAError):
+            ok = False
+        if not ok:
+            failed.append(file_key(root, path))
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hash tracked cascade files for the integrity snapshot.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--verify", action="store_true", help="Compare against audit/integrity_snapshot.md.")
+    parser.add_argument("--archives", action="store_true", help="Check compressed archive segments.")
+    args = parser.parse_args(argv)
+
+    if args.archives:
+        failed = verify_archives(args.root)
+        for key in failed:
+            print(f"hashMismatch /{key}: cold segment does not match its recorded digest")
+        return 2 if failed else 0
+
+    cache = HashCache(args.root)
+    try:
+        if args.verify:
+            mismatches = verify(args.root, cache)
+            for key, expected, actual in mismatches:
+                print(f"hashMismatch /{key}: expected {expected}, actual {actual or 'missing'}")
+            return 2 if mismatches else 0
+        print(format_snapshot(tracked_digests(args.root, cache)))
+        return 0
+    finally:
+        cache.save()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Job plan parsing for `job_logs/temp_job.md`.
+
+The active plan is the last fenced ```yaml (or ```json) block in the file
+outside the "## Example" section. Only the YAML subset used by the plan
+format is supported: nested block mappings, block sequences, and scalar
+values (quoted strings, numbers, booleans, null) with `#` comments.
+
+Usage:
+    from contextcascade.jobplan import load_job_plan
+
+    plan = load_job_plan("cascade")
+    plan["jobId"], [t["path"] for t in plan["targets"]]
+"""
+import hashlib
+import json
+import re
+
+from contextcascade.tree import DEFAULT_ROOT, key_path
+
+JOB_PLAN_FILE = "job_logs/temp_job.md"
+
+FENCE_RE = re.compile(r"^```\s*(\w*)\s*$")
+HEADING_RE = re.compile(r"^##\s+(.*?)\s*$")
+HEX64_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+
+# Sections whose code blocks document the format rather than hold a plan.
+EXAMPLE_SECTIONS = ("example",)
+
+
+class JobPlanError(ValueError):
+    """
+    Raised when the job plan is missing, malformed or structurally invalid.
+    """
+
+
+def _strip_comment(line):
+    quote = None
+    for i, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i].rstrip()
+    return line.rstrip()
+
+
+def _scalar(text):
+    text = text.strip()
+    if not text:
+        return None
+    if text[0] == '"':
+        return json.loads(text)
+    if text[0] == "'" and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("null", "~"):
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _split_pair(text, lineno):
+    key, sep, value = text.partition(":")
+    if not sep or not key.strip():
+        raise JobPlanError(f"Expected 'key: value' on line {lineno}")
+    return _scalar(key), value.strip()
+
+
+def parse_yaml(text):
+    """
+    Parses the YAML subset used by job plans. Returns a dict.
+    """
+    lines = []
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = _strip_comment(raw)
+        if line.strip():
+            lines.append((len(line) - len(line.lstrip(" ")), line.strip(), lineno))
+
+    def parse_block(pos, indent):
+        if lines[pos][1].startswith("- "):
+            return parse_sequence(pos, indent)
+        return parse_mapping(pos, indent)
+
+    def parse_mapping(pos, indent, result=None):
+        result = {} if result is None else result
+        while pos < len(lines) and lines[pos][0] == indent and not lines[pos][1].startswith("- "):
+            _, content, lineno = lines[pos]
+            key, value = _split_pair(content, lineno)
+            pos += 1
+            if value:
+                result[key] = _scalar(value)
+            elif pos < len(lines) and lines[pos][0] > indent:
+                result[key], pos = parse_block(pos, lines[pos][0])
+            elif pos < len(lines) and lines[pos][0] == indent and lines[pos][1].startswith("- "):
+                # Sequences may sit at the same indent as their key.
+                result[key], pos = parse_sequence(pos, indent)
+            else:
+                result[key] = None
+        return result, pos
+
+    def parse_sequence(pos, indent):
+        result = []
+        while pos < len(lines) and lines[pos][0] == indent and lines[pos][1].startswith("- "):
+            _, content, lineno = lines[pos]
+            item = content[2:].strip()
+            item_indent = indent + 2
+            pos += 1
+            if ":" in item and not item.startswith(('"', "'")):
+                key, value = _split_pair(item, lineno)
+                mapping = {}
+                if value:
+                    mapping[key] = _scalar(value)
+                elif pos < len(lines) and lines[pos][0] > item_indent:
+                    mapping[key], pos = parse_block(pos, lines[pos][0])
+                else:
+                    mapping[key] = None
+                if pos < len(lines) and lines[pos][0] == item_indent:
+                    mapping, pos = parse_mapping(pos, item_indent, mapping)
+                result.append(mapping)
+            else:
+                result.append(_scalar(item))
+        return result, pos
+
+    if not lines:
+        return {}
+    result, pos = parse_mapping(0, lines[0][0])
+    if pos != len(lines):
+        raise JobPlanError(f"Unexpected indentation on line {lines[pos][2]}")
+    return result
+
+
+def extract_plan_block(text):
+    """
+    Returns (language, body) of the active plan block, or None.
+    """
+    section = ""
+    block = None
+    found = None
+    for line in text.splitlines():
+        if block is not None:
+            if line.strip() == "```":
+                if not section.lower().startswith(EXAMPLE_SECTIONS):
+                    found = (block[0], "\n".join(block[1]))
+                block = None
+            else:
+                block[1].append(line)
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            section = heading.group(1)
+            continue
+        fence = FENCE_RE.match(line.strip())
+        if fence and fence.group(1).lower() in ("yaml", "yml", "json"):
+            block = (fence.group(1).lower(), [])
+    return found
+
+
+def parse_job_plan(text):
+    """
+    Parses and validates a job plan from the text of temp_job.md.
+    Adds a "jobId" (derived from the plan body if not given).
+    """
+    block = extract_plan_block(text)
+    if block is None:
+        raise JobPlanError("No active job plan found in temp_job.md")
+    language, body = block
+    try:
+        plan = json.loads(body) if language == "json" else parse_yaml(body)
+    except json.JSONDecodeError as e:
+        raise JobPlanError(f"Invalid JSON job plan: {e}") from e
+    validate_job_plan(plan)
+    if not plan.get("jobId"):
+        plan["jobId"] = hashlib.sha256(body.encode("utf-8")).hexdigest()[:12]
+    return plan
+
+
+def validate_job_plan(plan):
+    """
+    Checks the structure described in temp_job.md. Raises JobPlanError.
+    """
+    if not isinstance(plan, dict):
+        raise JobPlanError("Job plan must be a mapping")
+    if not isinstance(plan.get("intent"), str) or not plan["intent"].strip():
+        raise JobPlanError("Job plan is missing 'intent'")
+    targets = plan.get("targets")
+    if not isinstance(targets, list) or not targets:
+        raise JobPlanError("Job plan must list at least one target")
+    for i, target in enumerate(targets):
+        if not isinstance(target, dict) or not isinstance(target.get("path"), str):
+            raise JobPlanError(f"Target #{i + 1} must be a mapping with a 'path'")
+        for field in ("expectedHashBefore", "expectedHashAfter"):
+            value = target.get(field)
+            if value is not None and not HEX64_RE.match(str(value)):
+                raise JobPlanError(f"Target {target['path']}: {field} is not a SHA-256 hex digest")
+    if "requiresReview" in plan and not isinstance(plan["requiresReview"], bool):
+        raise JobPlanError("'requiresReview' must be true or false")
+
+
+def plan_digest(plan):
+    """
+    Returns the SHA-256 of a parsed plan in canonical JSON, so the same
+    plan hashes the same whether it came from YAML, JSON or run().
+    """
+    canonical = json.dumps(plan, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_job_plan(root=DEFAULT_ROOT):
+    """
+    Reads and parses the active job plan. Raises JobPlanError if the file
+    is missing or the plan is invalid.
+    """
+    try:
+        with open(key_path(root, JOB_PLAN_FILE), encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError as e:
+        raise JobPlanError("temp_job.md is missing") from e
+    return parse_job_plan(text)
@@ -0,0 +1,242 @@
+"""
+Write-ahead journal for the WRITE phase.
+
+Before a WRITE mutates anything, the pre-image of every target is saved
+under `_journal/<txid>/`, followed by a manifest. The manifest is written
+last and atomically, so its presence means the pre-images are complete.
+Removing the manifest is the commit point. A journal that is still on
+disk at the start of the next loop therefore belongs to an interrupted
+WRITE, and replaying it restores every target to its pre-WRITE state.
+
+Files changed in place (logs appended or swept through rolling.LogIndex)
+are journaled by their tail only: the bytes from a given offset to EOF.
+Replaying truncates the file to that offset and writes the tail back.
+
+Layout:
+    _journal/<txid>/manifest.json     job id, pid, targets -> pre-image files
+    _journal/<txid>/<n>.pre           pre-image bytes (absent for new files)
+    _journal/<txid>/<n>.tail          bytes past the recorded offset
+
+Usage:
+    journal = WriteJournal.begin("cascade", job_id, targets)
+    ...mutate targets...
+    journal.add(more_targets)
+    journal.add_tails({log_key: offset})
+    ...mutate those...
+    journal.commit()           # or journal.rollback()
+
+    recover("cascade")         # at loop start: undo interrupted WRITEs
+"""
+import json
+import os
+import pathlib
+import secrets
+import shutil
+import time
+
+from contextcascade.atomic import AtomicBatch, atomic_write, fsync_dir
+from contextcascade.tree import key_path
+
+JOURNAL_DIR = "_journal"
+MANIFEST = "manifest.json"
+
+# Seconds after which a journal directory without a manifest is discarded.
+ORPHAN_AGE = 60
+
+# Distinguishes this process from an earlier one that had the same pid
+# (common in containers, where the entry point is always pid 1).
+_PROCESS_TOKEN = secrets.token_hex(8)
+
+
+class JournalError(RuntimeError):
+    """
+    Raised when a journal cannot be written or replayed.
+    """
+
+
+def _owner_alive(manifest):
+    """
+    Returns True if the process that wrote `manifest` is still running.
+    """
+    if manifest.get("owner") == _PROCESS_TOKEN:
+        return True
+    pid = manifest.get("pid", -1)
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        # Windows raises a generic OSError for unknown pids.
+        return False
+    return True
+
+
+class WriteJournal:
+    """
+    One WRITE transaction's pre-images.
+    """
+
+    def __init__(self, root, directory, manifest):
+        self.root = root
+        self.directory = pathlib.Path(directory)
+        self.manifest = manifest
+
+    @classmethod
+    def begin(cls, root, job_id, keys):
+        """
+        Creates a journal holding the current content of `keys` (tree
+        keys). `job_id` is recorded for the recovery log. Returns the
+        journal once everything is durable on disk.
+        """
+        base = pathlib.Path(root) / JOURNAL_DIR
+        base.mkdir(parents=True, exist_ok=True)
+        txid = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{secrets.token_hex(4)}"
+        directory = base / txid
+        directory.mkdir()
+        fsync_dir(base)
+        manifest = {
+            "txid": txid,
+            "jobId": job_id,
+            "pid": os.getpid(),
+            "owner": _PROCESS_TOKEN,
+            "started": time.time(),
+            "targets": {},
+        }
+        journal = cls(root, directory, manifest)
+        journal.add(keys)
+        return journal
+
+    def add(self, keys):
+        """
+        Journals pre-images for `keys` not already covered. Must be called
+        before those files are mutated.
+        """
+        targets = self.manifest["targets"]
+        new_keys = [key for key in keys if key not in targets]
+        if not new_keys:
+            return
+        for key in new_keys:
+            path = key_path(self.root, key)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                targets[key] = None
+                continue
+            targets[key] = self._save(f"{len(targets):04d}.pre", data)
+        self._write_manifest()
+
+    def add_tails(self, offsets):
+        """
+        Journals, for each {key: offset}, the bytes of `key` from `offset`
+        to EOF. Must be called before those files are changed in place.
+        Keys already covered by a full pre-image are skipped.
+        """
+        targets = self.manifest["targets"]
+        offsets = {key: offset for key, offset in offsets.items() if key not in targets}
+        if not offsets:
+            return
+        for key, offset in offsets.items():
+            with open(key_path(self.root, key), "rb") as f:
+                f.seek(offset)
+                data = f.read()
+            targets[key] = {"tail": self._save(f"{len(targets):04d}.tail", data), "offset": offset}
+        self._write_manifest()
+
+    def _save(self, name, data):
+        with open(self.directory / name, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return name
+
+    def _write_manifest(self):
+        # The manifest only ever names pre-images that are already durable.
+        atomic_write(self.directory / MANIFEST, json.dumps(self.manifest, indent=1, sort_keys=True))
+
+    def rollback(self):
+        """
+        Restores every journaled target to its pre-image or journaled tail
+        (removing files the WRITE created), then discards the journal.
+        """
+        with AtomicBatch() as batch:
+            for key, name in self.manifest["targets"].items():
+                path = key_path(self.root, key)
+                if name is None:
+                    path.unlink(missing_ok=True)
+                elif isinstance(name, dict):
+                    with open(path, "r+b") as f:
+                        f.truncate(name["offset"])
+                        f.seek(name["offset"])
+                        f.write((self.directory / name["tail"]).read_bytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    batch.stage(path, (self.directory / name).read_bytes())
+        self._discard()
+
+    def commit(self):
+        """
+        Marks the WRITE as complete by discarding the journal.
+        """
+        self._discard()
+
+    def _discard(self):
+        manifest = self.directory / MANIFEST
+        manifest.unlink(missing_ok=True)
+        fsync_dir(self.directory)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def pending(root):
+    """
+    Returns the journals left on disk, oldest first. Directories without a
+    manifest were interrupted before anything was mutated; they are removed
+    once they are old enough not to belong to a WRITE still starting up.
+    """
+    base = pathlib.Path(root) / JOURNAL_DIR
+    if not base.is_dir():
+        return []
+    journals = []
+    for directory in sorted(base.iterdir()):
+        if not directory.is_dir():
+            continue
+        try:
+            with open(directory / MANIFEST, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            if time.time() - directory.stat().st_mtime > ORPHAN_AGE:
+                shutil.rmtree(directory, ignore_errors=True)
+            continue
+        except ValueError as e:
+            raise JournalError(f"Corrupt journal manifest in {directory}: {e}") from e
+        journals.append(WriteJournal(root, directory, manifest))
+    return journals
+
+
+def abandoned(root):
+    """
+    Returns the pending journals whose WRITE process is gone, newest
+    first.
+    """
+    return [journal for journal in reversed(pending(root)) if not _owner_alive(journal.manifest)]
+
+
+def recover(root, journals=None):
+    """
+    Rolls back `journals` (default: every abandoned journal), newest
+    first. Journals owned by a live process are left alone. Returns the
+    recovered journals' manifests.
+    """
+    recovered = []
+    for journal in abandoned(root) if journals is None else journals:
+        if _owner_alive(journal.manifest):
+            continue
+        manifest = dict(journal.manifest)
+        journal.rollback()
+        recovered.append(manifest)
+    return recovered
@@ -0,0 +1,236 @@
+"""
+Compiled lifecycle thresholds from `protocols/file_lifespans.md`.
+
+The thresholds table is parsed once into parallel arrays (counter keys,
+then one threshold column per action) and kept in memory until the
+file's SHA-256 changes; the digest comes from the stat-cached HashCache,
+so an unchanged table costs one stat per loop. Evaluating the table
+against the lifecycle counters is a plain loop per action over the rows
+that set that threshold (the package is stdlib-only, so there is no
+vectorized kernel); with hundreds of domain counters it takes
+microseconds.
+
+Counters are incrementOnly, so a threshold is read as a window: an action
+is due when a counter meets or exceeds the next multiple of its threshold
+since the action was last queued. Queued windows are remembered in
+`_cache/lifespan_marks.json`, written by the loop under the global lock;
+losing that file re-queues each action at most once.
+
+Usage:
+    evaluator = LifespanEvaluator("cascade")
+    actions = evaluator.evaluate(counter_values)
+    evaluator.acknowledge(actions)
+
+    python -m contextcascade.lifespans [--root cascade]
+"""
+import argparse
+import json
+import re
+import sys
+from array import array
+
+from contextcascade.atomic import atomic_write
+from contextcascade.counterstore import CounterStore
+from contextcascade.hashcache import HashCache
+from contextcascade.tree import DEFAULT_ROOT, cache_path, file_key, key_path
+
+LIFESPANS_FILE = "protocols/file_lifespans.md"
+LIFECYCLE_DIR = "lifecycle"
+MARKS_FILE = "lifespan_marks.json"
+
+# Threshold column -> queued action.
+ACTIONS = (
+    ("reread_threshold", "force_reread"),
+    ("prune_threshold", "schedule_prune"),
+    ("merge_threshold", "schedule_merge"),
+)
+
+TABLE_ROW_RE = re.compile(r"^\s*\|(.*)\|\s*$")
+SEPARATOR_RE = re.compile(r"^[\s|:-]+$")
+SCOPE_CELL_RE = re.compile(r"^(?P<scope>[^(`]+?)\s*(?:\(`(?P<file>[^`]+)`\))?$")
+
+
+class LifespanError(ValueError):
+    """
+    Raised when the thresholds table cannot be parsed.
+    """
+
+
+class ThresholdTable:
+    """
+    The compiled thresholds table. `keys[i]` is the counter tree key of
+    `scopes[i]`; `columns[action][i]` its threshold (0 = none), and
+    `rows[action]` the rows with a threshold for that action.
+    """
+
+    def __init__(self, scopes, keys, columns):
+        self.scopes = scopes
+        self.keys = keys
+        self.columns = columns
+        self.rows = {
+            action: array("I", [i for i, threshold in enumerate(column) if threshold])
+            for action, column in columns.items()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def evaluate(self, values, marks=None):
+        """
+        Returns the due actions as dicts (action, scope, counter, count,
+        threshold, window), ordered by action then table row. `values`
+        maps counter keys to counts; `marks` maps "action:key" to the
+        last queued window.
+        """
+        marks = marks or {}
+        counts = [values.get(key, 0) for key in self.keys]
+        actions = []
+        for _, action in ACTIONS:
+            column = self.columns[action]
+            for i in self.rows[action]:
+                window = counts[i] // column[i]
+                if window > marks.get(f"{action}:{self.keys[i]}", 0):
+                    actions.append({
+                        "action": action,
+                        "scope": self.scopes[i],
+                        "counter": self.keys[i],
+                        "count": counts[i],
+                        "threshold": column[i],
+                        "window": window,
+                    })
+        return actions
+
+
+def _cells(line):
+    match = TABLE_ROW_RE.match(line)
+    return [cell.strip() for cell in match.group(1).split("|")] if match else None
+
+
+def _threshold(cell, scope, column):
+    cell = cell.strip("` ")
+    if cell in ("", "-", "—"):
+        return 0
+    if not cell.isdigit():
+        raise LifespanError(f"{scope}: {column} must be a non-negative integer, got {cell!r}")
+    return int(cell)
+
+
+def compile_table(text, root=DEFAULT_ROOT):
+    """
+    Parses the first markdown table of `text` whose header names the
+    threshold columns. Rows name a scope and, in parentheses, its counter
+    file under `lifecycle/` (default: `<scope>.md`).
+    """
+    lines = text.splitlines()
+    for start, line in enumerate(lines):
+        header = _cells(line)
+        if header and all(f"`{column}`" in header or column in header for column, _ in ACTIONS):
+            break
+    else:
+        raise LifespanError(f"No thresholds table in {LIFESPANS_FILE}")
+    header = [cell.strip("`") for cell in header]
+    positions = {column: header.index(column) for column, _ in ACTIONS}
+
+    scopes, keys = [], []
+    columns = {action: array("q") for _, action in ACTIONS}
+    for line in lines[start + 1 :]:
+        cells = _cells(line)
+        if cells is None:
+            break
+        if SEPARATOR_RE.match(line):
+            continue
+        match = SCOPE_CELL_RE.match(cells[0])
+        if not match or len(cells) < len(header):
+            raise LifespanError(f"Malformed thresholds row: {line.strip()}")
+        scope = match.group("scope")
+        counter_file = match.group("file") or f"{scope}.md"
+        scopes.append(scope)
+        keys.append(file_key(root, key_path(root, f"{LIFECYCLE_DIR}/{counter_file}")))
+        for column, action in ACTIONS:
+            columns[action].append(_threshold(cells[positions[column]], scope, column))
+    return ThresholdTable(scopes, keys, columns)
+
+
+class LifespanEvaluator:
+    """
+    Keeps the compiled table of one cascade root and the windows already
+    queued.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, hashes=None):
+        self.root = root
+        self.hashes = hashes or HashCache(root)
+        self.key = file_key(root, key_path(root, LIFESPANS_FILE))
+        self.marks_path = cache_path(root, MARKS_FILE)
+        self.digest = None
+        self._table = None
+        self.marks = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.marks_path, encoding="utf-8") as f:
+                self.marks = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.marks = {}
+
+    @property
+    def table(self):
+        """
+        The compiled table, recompiled only when the file's digest
+        changes.
+        """
+        entry = self.hashes.hash_keys([self.key]).get(self.key)
+        if entry is None:
+            raise LifespanError(f"Missing /{self.key}")
+        if entry["sha256"] != self.digest:
+            with open(key_path(self.root, self.key), encoding="utf-8") as f:
+                self._table = compile_table(f.read(), self.root)
+            self.digest = entry["sha256"]
+        return self._table
+
+    def evaluate(self, values):
+        """
+        Returns the actions due for counter `values` (see
+        ThresholdTable.evaluate()), against the marks on disk. Nothing is
+        recorded until acknowledge().
+        """
+        self.load()
+        return self.table.evaluate(values, self.marks)
+
+    def acknowledge(self, actions):
+        """
+        Records `actions` as queued so they are not returned again until
+        their counter reaches the next window. The caller holds the
+        global lock: the marks file is re-read first and the higher window
+        kept, so concurrent loops do not drop each other's marks.
+        """
+        if not actions:
+            return
+        self.load()
+        for action in actions:
+            mark = f"{action['action']}:{action['counter']}"
+            self.marks[mark] = max(self.marks.get(mark, 0), action["window"])
+        atomic_write(self.marks_path, json.dumps(self.marks, sort_keys=True))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the lifecycle actions currently due.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    evaluator = LifespanEvaluator(args.root)
+    table = evaluator.table
+    with CounterStore(args.root) as store:
+        values = store.preview(table.keys, by=0)
+    actions = evaluator.evaluate(values)
+    evaluator.hashes.save()
+    for action in actions:
+        print(f"{action['action']}: {action['scope']} ({action['count']} >= {action['threshold'] * action['window']})")
+    if not actions:
+        print("No lifecycle actions due.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Lean / Domain / Full load-mode resolver (Documentation §2.5.4).
+
+    lean    core indexes and lifecycle counters: the root-level structural
+            and immutable files, every `subtype: index` file and every
+            `fileType: counter` file
+    domain  every file with the given routeScope (files without one are
+            in the `global` scope)
+    full    every file with a `@meta` block
+
+Sets come from MetaIndex's inverted routeScope / fileType indexes. The
+lean and full sets are built once per index generation, so each query
+after that is a dictionary lookup.
+
+Usage:
+    resolver = LoadModeResolver(index)
+    resolver.resolve("domain", "client")
+
+    python -m contextcascade.loadmode {lean,domain,full} [--scope SCOPE]
+"""
+import argparse
+import sys
+
+from contextcascade.meta import MetaIndex
+from contextcascade.tree import DEFAULT_ROOT
+
+MODES = ("lean", "domain", "full")
+
+# File types of root-level files that belong to the lean set.
+LEAN_ROOT_TYPES = ("structural", "immutable")
+
+
+class LoadModeResolver:
+    """
+    Resolves load modes to frozensets of tree keys.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._generation = None
+        self._sets = {}
+
+    def _rebuild(self):
+        index = self.index
+        lean = set(index.by_field("fileType", "counter"))
+        for file_type in LEAN_ROOT_TYPES:
+            lean.update(key for key in index.by_field("fileType", file_type) if key.count("/") == 1)
+        lean.update(index.query(subtype="index"))
+        full = frozenset().union(*(index.by_scope(scope) for scope in index.scopes()))
+        self._sets = {"lean": frozenset(lean), "full": full}
+        self._generation = index.generation
+
+    def resolve(self, mode, scope=None):
+        """
+        Returns the frozenset of keys to load in `mode`. `scope` is
+        required for the domain mode.
+        """
+        if mode == "domain":
+            if not scope:
+                raise ValueError("The domain load mode needs a routeScope")
+            return self.index.by_scope(scope)
+        if mode not in MODES:
+            raise ValueError(f"Unknown load mode {mode!r} (expected one of {', '.join(MODES)})")
+        if self._generation != self.index.generation:
+            self._rebuild()
+        return self._sets[mode]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the files a load mode resolves to.")
+    parser.add_argument("mode", choices=MODES)
+    parser.add_argument("--scope", help="routeScope for the domain mode.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    index = MetaIndex(args.root)
+    index.refresh()
+    index.save()
+    try:
+        keys = LoadModeResolver(index).resolve(args.mode, args.scope)
+    except ValueError as e:
+        parser.error(str(e))
+    for key in sorted(keys):
+        print(f"/{key}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Budget-constrained load plan optimizer.
+
+Builds `load_plans/auto_plan_<scope>.md` for the next READ phase by
+choosing, under a token budget, the set of files with the most value:
+
+- cost    the file's token count from the token cache (see tokens.py)
+- value   `readPriority` (or a default per fileType), weighted up for
+          files in the requested routeScope, for recently modified files,
+          and for scopes with a queued `force_reread`
+
+Files are selected with a 0/1 knapsack over token costs rounded to at
+most KNAPSACK_BUCKETS buckets. Above KNAPSACK_LIMIT candidates, a greedy
+pass by value per token is used instead. Core files (REQUIRED) are always
+taken first. A rolling buffer that takes more than ROLLING_SHARE of the
+budget, or whose scope has a queued `schedule_merge`, is replaced by its
+`mergeTarget` summary if that is cheaper and holds entries itself. A
+summary whose entries all live in its segmented archive (see archive.py)
+is only a header, so it is never substituted.
+
+Usage:
+    planner = LoadPlanner("cascade")
+    plan = planner.plan("client", budget=20000, actions=actions)
+    planner.write(plan)
+
+    python -m contextcascade.loadplan --scope client --budget 20000 [--dry-run]
+"""
+import argparse
+import math
+import sys
+import time
+
+from contextcascade.atomic import atomic_write
+from contextcascade.counterstore import CounterStore
+from contextcascade.hashcache import HashCache
+from contextcascade.lifespans import LifespanEvaluator
+from contextcascade.meta import MetaIndex
+from contextcascade.rolling import LogIndex
+from contextcascade.tokens import TokenLedger
+from contextcascade.tree import DEFAULT_ROOT, file_key, key_path
+
+PLAN_FILE = "load_plans/auto_plan_{scope}.md"
+DEFAULT_BUDGET = 20000
+
+# Always loaded first, in this order, when they fit.
+REQUIRED = ("00_BOOTSTRAP.md", "index.md", "system_manifest.md", "protocols/loop_protocol.md")
+
+# Never planned: plans themselves and files only tooling reads.
+EXCLUDED_TYPES = frozenset(["evictable"])
+EXCLUDED_PREFIXES = ("load_plans/", "validators/")
+
+PRIORITY_WORDS = {"critical": 4.0, "high": 3.0, "medium": 2.0, "normal": 2.0, "low": 1.0}
+TYPE_PRIORITY = {
+    "immutable": 3.0,
+    "structural": 2.5,
+    "protected": 2.5,
+    "permanent": 2.0,
+    "counter": 1.5,
+    "rolling": 1.5,
+    "append-only": 1.0,
+    "temporary": 0.5,
+}
+
+SCOPE_WEIGHT = 2.0
+REREAD_WEIGHT = 1.5
+FRESH_BONUS = 0.5
+FRESH_HALF_LIFE = 86400.0
+ROLLING_SHARE = 0.25
+
+KNAPSACK_BUCKETS = 1024
+KNAPSACK_LIMIT = 400
+
+PLAN_TEMPLATE = """<!-- @meta {{
+  "fileType": "evictable",
+  "ttlCycles": 2,
+  "routeScope": "{scope}",
+  "purpose": "Optimized load plan for the {scope} routeScope. Generated by contextcascade.loadplan.",
+  "editPolicy": "replaceOnly"
+}} -->
+# Auto-Generated Load Plan ({scope})
+
+Generated {timestamp} for a budget of {budget} tokens ({method}).
+
+---
+## Files to Load:
+
+{files}
+
+---
+## Plan Notes:
+
+- Tokens planned: {used} of {budget}
+{notes}
+"""
+
+
+def priority_of(meta):
+    """
+    Returns the base value of a file: its numeric or named `readPriority`,
+    else the default for its fileType.
+    """
+    priority = meta.get("readPriority")
+    if isinstance(priority, (int, float)) and not isinstance(priority, bool):
+        return float(priority)
+    if isinstance(priority, str):
+        word = priority.strip().lower()
+        if word in PRIORITY_WORDS:
+            return PRIORITY_WORDS[word]
+        try:
+            return float(word)
+        except ValueError:
+            pass
+    return TYPE_PRIORITY.get(meta.get("fileType"), 1.0)
+
+
+def knapsack(items, budget, buckets=KNAPSACK_BUCKETS):
+    """
+    0/1 knapsack over (key, cost, value) items. Costs are rounded up to
+    budget / `buckets` units, so the result never exceeds `budget`.
+    Returns the chosen keys.
+    """
+    unit = max(1, math.ceil(budget / buckets))
+    capacity = budget // unit
+    best = [0.0] * (capacity + 1)
+    taken = []
+    for _, cost, value in items:
+        weight = max(1, math.ceil(cost / unit))
+        if weight > capacity:
+            taken.append(None)
+            continue
+        shifted = [previous + value for previous in best[: capacity + 1 - weight]]
+        flags = bytearray(capacity + 1)
+        for w, candidate in enumerate(shifted, weight):
+            if candidate > best[w]:
+                best[w] = candidate
+                flags[w] = 1
+        taken.append((weight, flags))
+    # Each row's flags were recorded against the table built so far,
+    # so walking the rows backwards recovers the choice.
+    chosen = []
+    w = max(range(capacity + 1), key=best.__getitem__)
+    for (key, _, _), row in zip(reversed(items), reversed(taken)):
+        if row is not None and row[1][w]:
+            chosen.append(key)
+            w -= row[0]
+    return chosen[::-1]
+
+
+def greedy(items, budget):
+    """
+    Takes items by value per token until the budget is spent. Returns the
+    chosen keys.
+    """
+    chosen = []
+    for key, cost, _ in sorted(items, key=lambda item: (-item[2] / max(item[1], 1), item[0])):
+        if cost <= budget:
+            chosen.append(key)
+            budget -= cost
+    return chosen
+
+
+class LoadPlanner:
+    """
+    Plans loads for one cascade root from its metadata index and token
+    cache.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, index=None, ledger=None, logs=None):
+        self.root = root
+        self.index = index or MetaIndex(root)
+        self.ledger = ledger or TokenLedger(root)
+        self.logs = logs or LogIndex(root)
+
+    def key(self, rel):
+        return file_key(self.root, key_path(self.root, rel))
+
+    def candidates(self, scope, actions=()):
+        """
+        Returns ({key: (cost, value)}, rolling, merging) for every
+        plannable file in `scope` or the global scope. `rolling` lists
+        (buffer, scope, mergeTarget) for rolling buffers; `merging` is the
+        set of scopes with a queued schedule_merge.
+        """
+        reread = {action["scope"] for action in actions if action["action"] == "force_reread"}
+        merging = {action["scope"] for action in actions if action["action"] == "schedule_merge"}
+        now = time.time()
+        files = {}
+        rolling = []
+        for key in sorted(self.index.by_scope(scope) | self.index.by_scope("global")):
+            meta = self.index.get(key)
+            rel = key.partition("/")[2]
+            if meta.get("fileType") in EXCLUDED_TYPES or rel.startswith(EXCLUDED_PREFIXES):
+                continue
+            file_scope = meta.get("routeScope", "global")
+            record = self.ledger.files.get(key)
+            if record is None:
+                continue
+            value = priority_of(meta)
+            if file_scope == scope and scope != "global":
+                value *= SCOPE_WEIGHT
+            if file_scope in reread:
+                value *= REREAD_WEIGHT
+            age = max(0.0, now - record["mtime_ns"] / 1e9)
+            value *= 1 + FRESH_BONUS * 0.5 ** (age / FRESH_HALF_LIFE)
+            files[key] = (record["tokens"], value)
+            if meta.get("fileType") == "rolling" and meta.get("mergeTarget"):
+                rolling.append((key, file_scope, self.key(meta["mergeTarget"])))
+        return files, rolling, merging
+
+    def plan(self, scope, budget=DEFAULT_BUDGET, actions=()):
+        """
+        Returns a plan dict: scope, budget, method, files [(key, tokens)],
+        used, substituted {buffer: summary}, dropped [key].
+        """
+        files, rolling, merging = self.candidates(scope, actions)
+        substituted = {}
+        for key, file_scope, target in rolling:
+            cost, value = files[key]
+            target_cost = self.ledger.tokens(target)
+            if target_cost is None or target_cost >= cost or not self.logs.count(target):
+                continue
+            if cost > budget * ROLLING_SHARE or file_scope in merging:
+                del files[key]
+                previous = files.get(target, (target_cost, 0.0))[1]
+                files[target] = (target_cost, max(value, previous))
+                substituted[key] = target
+
+        chosen = []
+        remaining = budget
+        for rel in REQUIRED:
+            key = self.key(rel)
+            if key in files and files[key][0] <= remaining:
+                chosen.append(key)
+                remaining -= files.pop(key)[0]
+
+        items = sorted((key, cost, value) for key, (cost, value) in files.items())
+        if len(items) > KNAPSACK_LIMIT:
+            method = "greedy"
+            picked = greedy(items, remaining)
+        else:
+            method = "knapsack"
+            picked = knapsack(items, remaining)
+        costs = {key: cost for key, cost, _ in items}
+        chosen_files = [(key, self.ledger.tokens(key)) for key in chosen] + [(key, costs[key]) for key in picked]
+        return {
+            "scope": scope,
+            "budget": budget,
+            "method": method,
+            "files": chosen_files,
+            "used": sum(cost for _, cost in chosen_files),
+            "substituted": substituted,
+            "dropped": sorted(set(costs) - set(picked)),
+        }
+
+    def write(self, plan):
+        """
+        Writes `plan` to load_plans/auto_plan_<scope>.md. Returns the key.
+        """
+        key = self.key(PLAN_FILE.format(scope=plan["scope"]))
+        notes = [f"- Substituted `/{target}` for oversized `/{buffer}`" for buffer, target in sorted(plan["substituted"].items())]
+        notes += [f"- Dropped (over budget or low value): `/{dropped}`" for dropped in plan["dropped"]]
+        text = PLAN_TEMPLATE.format(
+            scope=plan["scope"],
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            budget=plan["budget"],
+            method=plan["method"],
+            files="\n".join(f"- `/{key}` ({tokens} tokens)" for key, tokens in plan["files"]) or "*(none)*",
+            used=plan["used"],
+            notes="\n".join(notes),
+        )
+        path = key_path(self.root, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, text)
+        return key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a budget-optimized load plan for a routeScope.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--scope", default="global", help="routeScope to plan for (default: %(default)s).")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Token budget (default: %(default)s).")
+    parser.add_argument("--tokenizer", default="heuristic", help="Token cache tokenizer (default: %(default)s).")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without writing it.")
+    args = parser.parse_args(argv)
+
+    hashes = HashCache(args.root)
+    index = MetaIndex(args.root)
+    index.refresh()
+    ledger = TokenLedger(args.root, args.tokenizer, hashes=hashes)
+    ledger.refresh()
+    evaluator = LifespanEvaluator(args.root, hashes)
+    with CounterStore(args.root) as store:
+        actions = evaluator.evaluate(store.preview(evaluator.table.keys, by=0))
+
+    start = time.perf_counter()
+    planner = LoadPlanner(args.root, index, ledger)
+    plan = planner.plan(args.scope, args.budget, actions)
+    key = None if args.dry_run else planner.write(plan)
+    elapsed = time.perf_counter() - start
+    index.save()
+    ledger.save()
+    planner.logs.save()
+
+    for path, tokens in plan["files"]:
+        print(f"  /{path}: {tokens}")
+    for buffer, target in sorted(plan["substituted"].items()):
+        print(f"  substituted /{target} for /{buffer}")
+    print(
+        f"{len(plan['files'])} files, {plan['used']} of {plan['budget']} tokens ({plan['method']}, "
+        f"{elapsed * 1000:.1f} ms)" + (f" -> /{key}" if key else "")
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
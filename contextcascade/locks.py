@@ -0,0 +1,418 @@
+"""
+Kernel-backed reader/writer locks for the READ and WRITE phases.
+
+Every routeScope has its own lock file, `_run/scope.<scope>.flock`, locked
+with fcntl.flock (msvcrt.locking on Windows, where shared locks degrade to
+exclusive ones). The kernel drops a lock the moment its holder exits, so
+a crashed holder is detected immediately instead of at a later TTL check.
+An exclusive holder stores its record (pid, job id, scope, lease expiry)
+as JSON in the lock file. A live holder whose lease has expired is
+reported as `stale`.
+
+A WRITE holds the locks of the scopes its targets belong to, so jobs on
+disjoint domains run concurrently. Files every job updates (logs,
+counters, checkpoints, the drift flag) belong to the `global` scope. A
+job takes the global lock only for the short section in which it updates
+them, unless one of its own targets is global. Locks are always taken in
+sorted order with `global` last, so two writers cannot deadlock.
+
+`_locks/active_edit.lock` is only a best-effort rendered view of these
+locks. Nothing reads the markdown to take decisions.
+
+Usage:
+    locks = ScopeLocks("cascade")
+    locks.acquire(job_id, ["client"])     # raises LockConflict on timeout
+    locks.acquire(job_id, ["global"])     # critical section for shared files
+    ...
+    locks.release()                       # or release("failed")
+
+    with locks.read(["client"]):          # shared, for consistent reads
+        ...
+
+    python -m contextcascade.locks [--clear] [--render]
+"""
+import argparse
+import contextlib
+import json
+import os
+import pathlib
+import re
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+from contextcascade.atomic import atomic_write
+from contextcascade.tree import DEFAULT_ROOT, RUN_DIR, key_path
+
+GLOBAL_SCOPE = "global"
+VIEW_FILE = "_locks/active_edit.lock"
+
+# Seconds a holder may keep a lock before it is reported as stale.
+DEFAULT_LEASE = 300.0
+
+# Seconds acquire() waits for a busy lock before raising LockConflict.
+DEFAULT_WAIT = 30.0
+
+# Polling interval bounds while waiting for a busy lock.
+_POLL_MIN = 0.0005
+_POLL_MAX = 0.02
+
+LOCK_ROWS_RE = re.compile(r"(?:^\|(?![ \t]*-)(?![ \t]*Timestamp).*\|[ \t]*\r?(?:\n|\Z))+", re.M)
+VIEW_SECTION = "#### Current Lock"
+
+
+class LockConflict(RuntimeError):
+    """
+    Raised when a lock stays held by another holder past the wait time.
+    `holder` is the status dict of that holder.
+    """
+
+    def __init__(self, holder):
+        super().__init__(
+            f"{holder.get('scope', 'edit')} lock held by pid {holder.get('pid')} "
+            f"for job {holder.get('jobId')} ({holder['status']})"
+        )
+        self.holder = holder
+
+
+def scope_lock_name(scope):
+    """
+    Returns the lock file name for routeScope `scope`.
+    """
+    return f"scope.{re.sub(r'[^A-Za-z0-9_.-]', '_', scope)}.flock"
+
+
+def _scope_order(scope):
+    return (scope == GLOBAL_SCOPE, scope)
+
+
+def _try_lock(fd, shared=False):
+    """
+    Takes a non-blocking lock on `fd`. Returns False if it is held.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _wait_lock(fd, shared, wait):
+    """
+    Polls for a lock on `fd` for up to `wait` seconds. Returns False on
+    timeout.
+    """
+    if _try_lock(fd, shared):
+        return True
+    deadline = time.monotonic() + wait
+    delay = _POLL_MIN
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        if _try_lock(fd, shared):
+            return True
+        delay = min(delay * 2, _POLL_MAX)
+    return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def utc_timestamp(seconds=None):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+class LockManager:
+    """
+    One lock file. An instance holds at most one exclusive lock; it is not
+    shared between threads.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, name=scope_lock_name(GLOBAL_SCOPE), lease=DEFAULT_LEASE):
+        self.root = root
+        self.lease = lease
+        self.path = pathlib.Path(root) / RUN_DIR / name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = None
+
+    @property
+    def held(self):
+        return self._fd is not None
+
+    def _open(self):
+        return os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+
+    def _read_record(self, fd):
+        data = os.pread(fd, 4096, 0) if hasattr(os, "pread") else self.path.read_bytes()
+        try:
+            return json.loads(data.decode("utf-8")) if data.strip() else {}
+        except ValueError:
+            return {}
+
+    def _write_record(self, fd, record):
+        data = json.dumps(record, sort_keys=True).encode("utf-8")
+        os.ftruncate(fd, 0)
+        if hasattr(os, "pwrite"):
+            os.pwrite(fd, data, 0)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, data)
+
+    def acquire(self, job_id, scope, holder="loop", lease=None, wait=0):
+        """
+        Takes the lock for `job_id`, waiting up to `wait` seconds. Raises
+        LockConflict if it stays held.
+        """
+        if self._fd is not None:
+            raise RuntimeError("LockManager already holds the lock")
+        fd = self._open()
+        if not _wait_lock(fd, False, wait):
+            record = self._read_record(fd)
+            os.close(fd)
+            raise LockConflict(self._describe(record, held=True))
+        now = time.time()
+        self._write_record(fd, {
+            "state": "in-progress",
+            "pid": os.getpid(),
+            "holder": holder,
+            "jobId": job_id,
+            "scope": scope,
+            "acquired": now,
+            "expires": now + (self.lease if lease is None else lease),
+        })
+        self._fd = fd
+        return self
+
+    def release(self, state="cleared"):
+        """
+        Releases the held lock. Any state other than "cleared" (e.g.
+        "failed") is kept in the record for the view until the next
+        holder takes the lock.
+        """
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            if state == "cleared":
+                self._write_record(fd, {"state": "cleared"})
+            else:
+                record = self._read_record(fd)
+                record["state"] = state
+                self._write_record(fd, record)
+        finally:
+            _unlock(fd)
+            os.close(fd)
+
+    def clear(self):
+        """
+        Resets a `failed` or abandoned record to cleared. Raises
+        LockConflict if the lock is held.
+        """
+        fd = self._open()
+        try:
+            if not _try_lock(fd):
+                raise LockConflict(self._describe(self._read_record(fd), held=True))
+            self._write_record(fd, {"state": "cleared"})
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def status(self):
+        """
+        Returns the lock state as a dict with "status" (cleared,
+        in-progress, reading, stale or failed) plus the holder fields, if
+        any.
+        """
+        if self._fd is not None:
+            return self._describe(self._read_record(self._fd), held=True)
+        fd = self._open()
+        try:
+            if _try_lock(fd):
+                record = self._read_record(fd)
+                _unlock(fd)
+                return self._describe(record, held=False)
+            return self._describe(self._read_record(fd), held=True)
+        finally:
+            os.close(fd)
+
+    def _describe(self, record, held):
+        state = record.get("state", "cleared")
+        if held and state != "in-progress":
+            # Only shared holders, which write no record.
+            return {"status": "reading"}
+        if held:
+            status = "stale" if record.get("expires", float("inf")) < time.time() else "in-progress"
+        elif state == "failed":
+            status = "failed"
+        else:
+            # Not held: any in-progress record belongs to a holder that died.
+            status = "cleared"
+        described = {key: value for key, value in record.items() if key != "state"}
+        described["status"] = status
+        if state == "in-progress" and not held:
+            described["abandoned"] = True
+        return described
+
+
+class ScopeLocks:
+    """
+    The set of scope locks held by one loop.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, lease=DEFAULT_LEASE, wait=DEFAULT_WAIT):
+        self.root = root
+        self.lease = lease
+        self.wait = wait
+        self.held = {}
+
+    def acquire(self, job_id, scopes, holder="loop", wait=None):
+        """
+        Adds exclusive locks on `scopes` to the held set, in lock order.
+        Callers must not add a scope that sorts before one already held
+        (global always sorts last). On LockConflict, the locks taken by
+        this call are released again.
+        """
+        wait = self.wait if wait is None else wait
+        taken = []
+        try:
+            for scope in sorted(set(scopes) - set(self.held), key=_scope_order):
+                lock = LockManager(self.root, scope_lock_name(scope), self.lease)
+                lock.acquire(job_id, scope, holder, wait=wait)
+                self.held[scope] = lock
+                taken.append(scope)
+        except LockConflict:
+            for scope in taken:
+                self.held.pop(scope).release()
+            raise
+
+    def release(self, state="cleared"):
+        """
+        Releases every held lock, global first.
+        """
+        for scope in sorted(self.held, key=_scope_order, reverse=True):
+            self.held.pop(scope).release(state)
+
+    @contextlib.contextmanager
+    def read(self, scopes, wait=None):
+        """
+        Holds shared locks on `scopes` for the enclosed block, so no
+        WRITE on those scopes commits while it reads.
+        """
+        wait = self.wait if wait is None else wait
+        fds = []
+        try:
+            for scope in sorted(set(scopes) - set(self.held), key=_scope_order):
+                lock = LockManager(self.root, scope_lock_name(scope), self.lease)
+                fd = lock._open()
+                if not _wait_lock(fd, True, wait):
+                    record = lock._read_record(fd)
+                    os.close(fd)
+                    raise LockConflict(lock._describe(record, held=True))
+                fds.append(fd)
+            yield
+        finally:
+            for fd in fds:
+                _unlock(fd)
+                os.close(fd)
+
+
+def lock_states(root=DEFAULT_ROOT):
+    """
+    Returns the status dicts of every scope lock, sorted by scope.
+    """
+    states = []
+    directory = pathlib.Path(root) / RUN_DIR
+    for path in sorted(directory.glob("scope.*.flock")):
+        info = LockManager(root, path.name).status()
+        info.setdefault("scope", path.name[len("scope."):-len(".flock")])
+        states.append(info)
+    return states
+
+
+def clear_all(root=DEFAULT_ROOT):
+    """
+    Resets every unheld scope lock to cleared. Raises LockConflict if one
+    is held.
+    """
+    directory = pathlib.Path(root) / RUN_DIR
+    for path in sorted(directory.glob("scope.*.flock")):
+        LockManager(root, path.name).clear()
+
+
+def render_lock_rows(text, rows):
+    """
+    Returns the markdown view with its current-lock rows replaced by
+    `rows`, a list of (timestamp, holder, scope, job id, status). An
+    empty list renders a single cleared row. The rows keep the newline
+    style of the rows they replace.
+    """
+    head, marker, tail = text.partition(VIEW_SECTION)
+    match = LOCK_ROWS_RE.search(tail)
+    if not match:
+        raise ValueError("active_edit.lock has no current-lock row")
+    newline = "\r\n" if "\r\n" in match.group(0) else "\n"
+    rendered = newline.join(
+        "| {:<21} | {:<9} | {:<7} | {:<7} | {:<12} |".format(
+            timestamp or "_none_", holder or "—", scope or "—", job_id or "—", status
+        )
+        for timestamp, holder, scope, job_id, status in rows or [(None, None, None, None, "cleared")]
+    )
+    if match.group(0).endswith("\n"):
+        rendered += newline
+    return head + marker + tail[: match.start()] + rendered + tail[match.end() :]
+
+
+def render_view(root=DEFAULT_ROOT):
+    """
+    Rewrites `_locks/active_edit.lock` with one row per scope lock that
+    is not cleared. Concurrent renders may briefly leave it behind the
+    actual lock state.
+    """
+    rows = [
+        (utc_timestamp(info.get("acquired")), info.get("holder"), info["scope"], info.get("jobId"), info["status"])
+        for info in lock_states(root)
+        if info["status"] not in ("cleared", "reading")
+    ]
+    path = key_path(root, VIEW_FILE)
+    # No newline translation: the view mixes CRLF and LF lines.
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    rendered = render_lock_rows(text, rows)
+    if rendered != text:
+        atomic_write(path, rendered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or reset the scope edit locks.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--clear", action="store_true", help="Reset failed or abandoned locks to cleared.")
+    parser.add_argument("--render", action="store_true", help="Rewrite the markdown view from the lock state.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.clear:
+            clear_all(args.root)
+        if args.clear or args.render:
+            render_view(args.root)
+    except LockConflict as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(json.dumps(lock_states(args.root), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,946 @@
+"""
+Executable READ → ACT → WRITE loop (protocols/loop_protocol.md).
+
+LoopController runs one loop against the cascade:
+
+    READ   journal recovery, drift flag check, metadata refresh,
+           integrity snapshot check, unexpected mutation check,
+           active load plan
+    ACT    parse and validate `job_logs/temp_job.md`, evaluate the
+           file_lifespans.md thresholds
+    WRITE  A. pre-WRITE validation       E. change log sweep
+           B. execute job plan           F. job log append + sweep
+           C. post-WRITE hash check      G. commit logs, release lock
+           D. change summary, counters, checkpoint
+
+The file contents for each plan target are supplied by the caller (the
+agent that produced the plan). Step D2 computes the new lifecycle
+counters and step G commits them to the binary counter store in one
+atomic write (see counterstore.py), then re-renders the markdown
+counter views whose value changed. Log
+appends and buffer sweeps are queued and applied in place in step G
+through the rolling-buffer index (see rolling.py), so capacity checks
+never re-read a buffer. Sweeps into the summary logs land in their
+segmented archives (see archive.py). Step G also indexes the new
+checkpoint (see checkpoints.py), logs a `counterSkip` event if its
+LoopID does not follow the previous one, records the loop's snapshot
+in the object store (see objects.py) for point-in-time restore, and
+re-records the files it wrote in the Merkle record (see merkle.py). READ
+compares the tree with that record; files changed outside a loop are
+logged as one `unexpectedMutation` warning and accepted into the record.
+
+Every file the WRITE touches is covered by a write-ahead journal (see
+journal.py) until step G completes. Any failure replays the journal and
+enters Safe-Hold: the drift flag is raised, the event is appended to the
+meta-audit event log and `audit/meta_audit.md` is re-rendered from it (see
+audit.py), and SafeHoldError is raised. A journal left behind
+by a crashed WRITE is replayed automatically at the start of the next
+loop, which then proceeds normally.
+
+The WRITE phase holds the kernel locks of its targets' routeScopes (see
+locks.py) from step A to step G, so loops on disjoint domains WRITE
+concurrently. The shared logs, counters and checkpoint are updated in
+steps D-G under the `global` scope lock only. `_locks/active_edit.lock` is
+re-rendered from the locks as a view.
+
+Every phase and sub-step is timed; see LoopController.timings and
+timing_report().
+
+Usage:
+    from contextcascade.loop import LoopController
+
+    with LoopController("cascade") as controller:
+        result = controller.run({"cascade/domains/client/index.md": new_text})
+        print(controller.timing_report())
+"""
+import argparse
+import contextlib
+import glob
+import os
+import pathlib
+import posixpath
+import re
+import sys
+import time
+
+from contextcascade import buffers, merkle
+from contextcascade.archive import Archive, is_archived
+from contextcascade.audit import AuditLog, make_event
+from contextcascade.checkpoints import CheckpointIndex, describe_gap
+from contextcascade.atomic import AtomicBatch
+from contextcascade.counterstore import CounterStore, render_views
+from contextcascade.gates import GateError, WriteGates
+from contextcascade.hashcache import HashCache, hash_file
+from contextcascade.integrity import verify
+from contextcascade.jobplan import JOB_PLAN_FILE, JobPlanError, load_job_plan, plan_digest, validate_job_plan
+from contextcascade.journal import WriteJournal, abandoned, pending, recover
+from contextcascade.lifespans import LifespanError, LifespanEvaluator
+from contextcascade.locks import GLOBAL_SCOPE, VIEW_FILE, LockConflict, ScopeLocks, render_view
+from contextcascade.meta import MetaIndex
+from contextcascade.objects import ObjectStore
+from contextcascade.rolling import LogIndex
+from contextcascade.spans import SpanIndex
+from contextcascade.tree import DEFAULT_ROOT, file_key, key_path
+
+CHANGE_LOG = "change_log/recent.md"
+JOB_LOG = "job_logs/recent.md"
+CHECKPOINT_LOG = "checkpoints/loop_checkpoint.md"
+META_AUDIT = "audit/meta_audit.md"
+DRIFT_FLAG = "lifecycle/drift_flag.md"
+GLOBAL_COUNTER = "lifecycle/counter.md"
+LOAD_PLAN_GLOB = "load_plans/*.md"
+
+DRIFT_MARKER = "**Detected Drift (if any):**"
+NOMINAL_DRIFT = "No drift detected. System nominal."
+
+LOAD_PLAN_ITEM_RE = re.compile(r"^\s*[-*]\s+`(/?[^`]+)`", re.M)
+
+ROUTE_DOMAIN_RE = re.compile(r"^[^/]+/domains/([^/]+)/")
+
+
+class SafeHoldError(RuntimeError):
+    """
+    Raised when the loop aborts into Safe-Hold. `step` names the phase or
+    WRITE sub-step, `event` the meta_audit event type (None if nothing new
+    was logged, e.g. a drift flag that was already raised).
+    """
+
+    def __init__(self, step, event, reason, severity="CRITICAL"):
+        super().__init__(f"Safe-Hold at {step}: {reason}")
+        self.step = step
+        self.event = event
+        self.reason = reason
+        self.severity = severity
+
+
+def utc_timestamp():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def drift_detected(text):
+    """
+    Returns the drift summary recorded in drift_flag.md, or None when the
+    flag reads nominal.
+    """
+    _, marker, summary = text.partition(DRIFT_MARKER)
+    summary = summary.strip()
+    if not marker or not summary or summary.startswith(NOMINAL_DRIFT):
+        return None
+    return summary
+
+
+class LoopController:
+    """
+    Runs READ → ACT → WRITE loops against a cascade root.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, holder="loop"):
+        self.root = root
+        self.holder = holder
+        self.hashes = HashCache(root)
+        self.index = MetaIndex(root)
+        self.locks = ScopeLocks(root)
+        self.logs = LogIndex(root)
+        self.counters = CounterStore(root)
+        self.lifespans = LifespanEvaluator(root, self.hashes)
+        self.gates = WriteGates(root, self.hashes)
+        self.spans = SpanIndex(root)
+        self.audit = AuditLog(root)
+        self.checkpoints = CheckpointIndex(root)
+        self.objects = ObjectStore(root)
+        self.actions = []
+        self.archives = {}
+        self.timings = []
+        self._pending = {}
+        self._log_ops = []
+        self._counter_values = None
+        self._depth = 0
+        self.journal = None
+
+    def close(self):
+        """
+        Unmaps the counter store. The controller cannot run loops after
+        this.
+        """
+        self.counters.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # -------------------- Helpers ----------------------
+
+    def key(self, rel, step="WRITE.A"):
+        """
+        Returns the tree key for a cascade-relative path. `.` and `..`
+        segments are resolved first, so every gate, index and
+        immutability lookup sees the file actually written. A path that
+        resolves outside the cascade root raises SafeHoldError at `step`.
+        """
+        root = pathlib.Path(self.root)
+        # Normalized with the root prefix in place, so `..` cannot step
+        # out of the root and back into a look-alike path inside it.
+        path = rel.replace("\\", "/").lstrip("/")
+        if path.partition("/")[0] != root.name:
+            path = f"{root.name}/{path}"
+        path = root.parent / posixpath.normpath(path)
+        try:
+            path.resolve().relative_to(root.resolve())
+        except ValueError:
+            raise SafeHoldError(step, "gateViolation", f"{rel} resolves outside the cascade root") from None
+        return file_key(self.root, path)
+
+    @contextlib.contextmanager
+    def timed(self, label):
+        """
+        Records the wall-clock time of the enclosed block under `label`.
+        Nested blocks are recorded with increasing depth.
+        """
+        record = [label, self._depth, None]
+        self.timings.append(record)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[2] = time.perf_counter() - start
+            self._depth -= 1
+
+    def timing_report(self):
+        """
+        Returns the last loop's timings as an indented text table.
+        """
+        lines = []
+        for label, depth, seconds in self.timings:
+            if seconds is not None:
+                lines.append(f"{'  ' * depth}{label:<{28 - 2 * depth}} {seconds * 1000:10.3f} ms")
+        return "\n".join(lines)
+
+    def read_text(self, key):
+        """
+        Returns the content of `key`, including edits staged this loop.
+        """
+        if key in self._pending:
+            return self._pending[key]
+        with open(key_path(self.root, key), encoding="utf-8") as f:
+            return f.read()
+
+    def stage(self, key, text):
+        """
+        Stages new content for `key`; it is committed in step G.
+        """
+        self._pending[key] = text
+
+    def append_log(self, key, entry):
+        """
+        Queues an entry to append to log `key` in step G.
+        """
+        self._log_ops.append(("append", key, entry))
+
+    def archive_for(self, key):
+        """
+        Returns the Archive holding the entries of `key`, or None if `key`
+        is not an archived log.
+        """
+        if not is_archived(self.root, key):
+            return None
+        if key not in self.archives:
+            self.archives[key] = Archive(self.root, key)
+        return self.archives[key]
+
+    def pending_entries(self, key):
+        """
+        Returns the number of entries `key` will hold after step G.
+        """
+        count = self.logs.count(key)
+        for op, op_key, arg in self._log_ops:
+            if op == "append" and op_key == key:
+                count += 1
+            elif op == "sweep" and op_key == key:
+                count = 0
+            elif op == "sweep" and arg == key:
+                count += self.pending_entries(op_key)
+        return count
+
+    def current_loop_id(self):
+        """
+        Returns the Loop ID of the loop in progress (the global counter
+        after this loop's increment), or None if it cannot be read.
+        """
+        key = self.key(GLOBAL_COUNTER)
+        try:
+            return self.counters.preview([key])[key]
+        except (OSError, ValueError):
+            return None
+
+    def scope_of(self, key):
+        """
+        Returns the routeScope governing `key`.
+        """
+        meta = self.index.get(key) or {}
+        if meta.get("routeScope"):
+            return meta["routeScope"]
+        match = ROUTE_DOMAIN_RE.match(key)
+        return match.group(1) if match else "global"
+
+    # -------------------- Loop -------------------------
+
+    def run(self, edits, review_approved=False, plan=None):
+        """
+        Runs one full loop. `edits` maps plan target paths to their new
+        content. `plan` is a job plan dict to use instead of
+        `job_logs/temp_job.md`, e.g. for agents running concurrently.
+        Returns a result dict; raises SafeHoldError on abort.
+        """
+        self.timings = []
+        self._pending = {}
+        self._log_ops = []
+        try:
+            edits = {self.key(path): content for path, content in edits.items()}
+            with self.timed("loop"):
+                with self.timed("READ"):
+                    loaded = self.read_phase()
+                with self.timed("ACT"):
+                    plan = self.act_phase(plan)
+                with self.timed("WRITE"):
+                    result = self.write_phase(plan, edits, review_approved)
+            result["loaded"] = sorted(loaded)
+            result["timings"] = [(label, seconds) for label, _, seconds in self.timings]
+            return result
+        except SafeHoldError as e:
+            if e.event is not None:
+                self.enter_safe_hold(e)
+            raise
+        finally:
+            self.index.save()
+            self.hashes.save()
+            self.logs.save()
+            self.spans.save()
+            self.audit.save()
+
+    def read_phase(self):
+        with self.timed("recover"):
+            self.recover_interrupted()
+
+        with self.timed("entry"):
+            drift = drift_detected(self.read_text(self.key(DRIFT_FLAG)))
+            if drift:
+                raise SafeHoldError("READ", None, f"drift flag raised: {drift}")
+
+        with self.timed("meta"):
+            self.index.refresh()
+
+        with self.timed("integrity"):
+            self.check_integrity("READ")
+
+        with self.timed("mutations"):
+            self.check_mutations()
+
+        with self.timed("load"):
+            return self.load_active_plan()
+
+    def act_phase(self, plan=None):
+        with self.timed("plan"):
+            try:
+                if plan is None:
+                    plan = load_job_plan(self.root)
+                else:
+                    validate_job_plan(plan)
+                    if not plan.get("jobId"):
+                        raise JobPlanError("A job plan passed to run() needs a 'jobId'")
+            except JobPlanError as e:
+                raise SafeHoldError("ACT", "jobPlanInvalid", str(e)) from e
+        with self.timed("thresholds"):
+            self.actions = self.evaluate_lifespans()
+        return plan
+
+    def evaluate_lifespans(self):
+        """
+        Returns the lifecycle actions (force_reread, schedule_prune,
+        schedule_merge) due for the current counters. They are recorded as
+        queued once the WRITE succeeds.
+        """
+        try:
+            table = self.lifespans.table
+        except LifespanError as e:
+            raise SafeHoldError("ACT", "lifespanInvalid", str(e)) from e
+        return self.lifespans.evaluate(self.counters.preview(table.keys, by=0))
+
+    def write_phase(self, plan, edits, review_approved):
+        job_id = str(plan["jobId"])
+        targets = {self.key(target["path"]): target for target in plan["targets"]}
+        scopes = sorted({self.scope_of(key) for key in targets})
+        self.journal = None
+
+        with self.timed("lock"):
+            try:
+                self.locks.acquire(job_id, scopes, self.holder)
+            except LockConflict as e:
+                raise SafeHoldError("WRITE", "lockConflict", str(e)) from e
+            render_view(self.root)
+        try:
+            with self.timed("recover"):
+                self.recover_interrupted(job_id)
+            with self.timed("A pre-validate"):
+                self.pre_write(plan, targets, edits, review_approved)
+            with self.timed("B execute"):
+                self.journal = WriteJournal.begin(self.root, job_id, sorted(edits))
+                self.execute(edits)
+            with self.timed("C post-validate"):
+                hashes_after = self.post_write(targets, edits)
+            with self.timed("D0 global lock"):
+                self.locks.acquire(job_id, [GLOBAL_SCOPE], self.holder)
+                # A crashed WRITE on another scope may have left log tails
+                # or a counter commit behind; undo it before appending.
+                self.recover_interrupted(job_id)
+            with self.timed("D1 change summary"):
+                self.log_change(plan, hashes_after)
+            with self.timed("D2 counters"):
+                counter_values = self.increment_counters(scopes)
+            with self.timed("D3 checkpoint"):
+                loop_id = counter_values.get(self.key(GLOBAL_COUNTER), max(counter_values.values(), default=0))
+                self.append_checkpoint(loop_id, job_id, hashes_after, counter_values, plan_digest(plan))
+            with self.timed("E change sweep"):
+                change_swept = self.sweep_buffer(self.key(CHANGE_LOG))
+            with self.timed("F job log"):
+                self.log_job(plan, hashes_after)
+                job_swept = self.sweep_buffer(self.key(JOB_LOG))
+            with self.timed("G commit"):
+                self.check_log_spans()
+                self.journal.add(
+                    sorted(self._pending) + sorted(self._counter_values) + [self.key(merkle.RECORD_FILE)]
+                )
+                self.journal.add_tails(self.log_undo_offsets())
+                committed = self.flush()
+                audited = self.log_gaps(self.checkpoints.refresh())
+                self.counters.commit(self._counter_values, tag=self.journal.manifest["txid"])
+                self._counter_values = None
+                rendered = render_views(self.root, self.counters)
+                changed = sorted(set(edits) | set(committed) | set(audited) | set(rendered))
+                # HEAD and the LoopID's ref are journaled so a rollback
+                # does not leave them pointing at the undone snapshot.
+                self.journal.add(self.objects.ref_keys(loop_id))
+                self.objects.snapshot(self.hashes, loop_id, changed=changed)
+                self.record_tree(changed)
+                self.journal.commit()
+                self.journal = None
+        except SafeHoldError:
+            self.abort_write()
+            raise
+        except LockConflict as e:
+            self.abort_write()
+            raise SafeHoldError("WRITE", "lockConflict", str(e)) from e
+        except Exception as e:
+            self.abort_write()
+            raise SafeHoldError("WRITE", "writeFailure", f"{type(e).__name__}: {e}") from e
+
+        try:
+            self.lifespans.acknowledge(self.actions)
+        finally:
+            self.locks.release()
+        render_view(self.root)
+        return {
+            "jobId": job_id,
+            "loopId": loop_id,
+            "actions": self.actions,
+            "written": sorted(edits),
+            "committed": committed,
+            "rendered": rendered,
+            "swept": {"change_log": change_swept, "job_log": job_swept},
+        }
+
+    # -------------------- READ steps -------------------
+
+    def check_integrity(self, step):
+        mismatches = verify(self.root, self.hashes)
+        if mismatches:
+            details = "; ".join(
+                f"/{key}: expected {expected[:12]}…, actual {(actual or 'missing')[:12]}"
+                for key, expected, actual in mismatches
+            )
+            raise SafeHoldError(step, "hashMismatch", f"integrity snapshot mismatch: {details}")
+
+    def check_mutations(self):
+        """
+        Compares the tree with the Merkle record that step G keeps
+        current. Files changed since then are logged as one
+        `unexpectedMutation` warning and accepted into the record, so each
+        change is reported once. The rendered lock view, the drift flag
+        and the targets of WRITEs still journaled are exempt. Returns the
+        reported keys.
+        """
+        recorded = merkle.load_recorded(self.root)
+        if recorded is None:
+            return []
+        exempt = {self.key(VIEW_FILE), self.key(DRIFT_FLAG)}
+        if not set(merkle.changes_since(recorded, self.root, self.hashes)) - exempt:
+            return []
+        # Re-check under the global lock: no WRITE is in steps D-G, and a
+        # WRITE in steps B-C journals its targets before changing them.
+        try:
+            self.locks.acquire("READ", [GLOBAL_SCOPE], self.holder)
+        except LockConflict as e:
+            raise SafeHoldError("READ", "lockConflict", str(e)) from e
+        try:
+            recorded = merkle.load_recorded(self.root)
+            changed = set(merkle.changes_since(recorded, self.root, self.hashes))
+            for journal in pending(self.root):
+                exempt.update(journal.manifest["targets"])
+            changed = sorted(changed - exempt)
+            if changed:
+                self.audit.append([
+                    make_event(
+                        "unexpectedMutation",
+                        "WARNING",
+                        f"{len(changed)} file(s) changed outside a job plan: "
+                        + ", ".join(f"`/{key}`" for key in changed),
+                        "Loop controller (READ)",
+                        action=f"Changes accepted into `/{self.key(merkle.RECORD_FILE)}`; review them.",
+                        loop=self.current_loop_id(),
+                        ts=utc_timestamp(),
+                    )
+                ])
+                self.audit.render_view()
+                self.record_tree(changed + [self.key(META_AUDIT)])
+        finally:
+            self.locks.release()
+        return changed
+
+    def load_active_plan(self):
+        """
+        Reads the files listed in the most recently written load plan.
+        Returns {key: text}; listed files that do not exist are skipped.
+        """
+        plans = glob.glob(str(key_path(self.root, LOAD_PLAN_GLOB)))
+        if not plans:
+            return {}
+        with open(max(plans, key=os.path.getmtime), encoding="utf-8") as f:
+            listed = LOAD_PLAN_ITEM_RE.findall(f.read().partition("## Files to Load")[2])
+        keys = [self.key(path, "READ") for path in listed]
+        loaded = {}
+        try:
+            with self.locks.read({self.scope_of(key) for key in keys}):
+                for key in keys:
+                    try:
+                        loaded[key] = self.read_text(key)
+                    except FileNotFoundError:
+                        continue
+        except LockConflict as e:
+            raise SafeHoldError("READ", "lockConflict", str(e)) from e
+        return loaded
+
+    # -------------------- WRITE steps ------------------
+
+    def check_gate(self, key, edit_policy):
+        """
+        Returns a reason string if `key` may not be written with
+        `edit_policy` under security/write_gates.md, else None.
+        """
+        decision = self.gates.check(key, edit_policy)
+        return None if decision["allowed"] else decision["reason"]
+
+    def pre_write(self, plan, targets, edits, review_approved):
+        """
+        Step A: integrity re-check and job plan validation.
+        """
+        self.check_integrity("WRITE.A")
+
+        if plan.get("requiresReview") and not review_approved:
+            raise SafeHoldError("WRITE.A", "securityReviewTriggered", "job plan requires review", "WARNING")
+
+        unplanned = sorted(set(edits) - set(targets))
+        if unplanned:
+            raise SafeHoldError("WRITE.A", "unexpectedMutation", f"edits outside job plan targets: {', '.join(unplanned)}")
+
+        try:
+            self.gates.refresh()
+        except GateError as e:
+            raise SafeHoldError("WRITE.A", "gateViolation", f"write gates unreadable: {e}") from e
+        for key in edits:
+            target = targets[key]
+            meta = self.index.get(key) or {}
+            if meta.get("fileType") == "immutable" or meta.get("editPolicy") == "readonly":
+                raise SafeHoldError("WRITE.A", "immutableWriteAttempt", f"/{key} is immutable")
+            reason = self.check_gate(key, target.get("editPolicy") or meta.get("editPolicy"))
+            if reason:
+                raise SafeHoldError("WRITE.A", "gateViolation", f"/{key}: {reason}")
+            # Protected spans change only through a reviewed job plan.
+            reason = self.spans.check_edit(key, edits[key].encode("utf-8"))
+            if reason and not (plan.get("requiresReview") and review_approved):
+                raise SafeHoldError("WRITE.A", "protectedOverlap", f"/{key}: {reason}")
+            expected = target.get("expectedHashBefore")
+            if expected:
+                path = key_path(self.root, key)
+                actual = hash_file(path)[0] if path.exists() else None
+                if actual != expected.lower():
+                    raise SafeHoldError("WRITE.A", "hashMismatch", f"/{key} does not match expectedHashBefore")
+
+    def execute(self, edits):
+        """
+        Step B: writes all target edits in one atomic batch and indexes
+        their protected spans. The targets must already be journaled.
+        """
+        with AtomicBatch() as batch:
+            for key, content in edits.items():
+                path = key_path(self.root, key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                batch.stage(path, content)
+        for key, content in edits.items():
+            self.spans.record(key, content.encode("utf-8"))
+
+    def abort_write(self):
+        """
+        Discards staged updates, replays the journal (and this WRITE's
+        counter commit, if made) and marks the lock failed.
+        """
+        self._pending = {}
+        self._log_ops = []
+        self._counter_values = None
+        if self.journal is not None:
+            self.counters.revert(self.journal.manifest["txid"])
+            self.journal.rollback()
+            self.journal = None
+        self.locks.release("failed")
+        render_view(self.root)
+
+    def recover_interrupted(self, job_id="recovery"):
+        """
+        Replays journals left by crashed WRITEs and logs the recovery.
+        Returns the recovered job ids.
+
+        Replaying needs the locks of every scope the journal covers plus
+        the global lock; they are taken without waiting. At READ nothing
+        is held yet, and a busy scope is left to the loop that holds it.
+        In WRITE, journals over the scopes already held must be replayed
+        before this loop may write; if that is impossible the loop halts.
+        """
+        stale = abandoned(self.root)
+        held = set(self.locks.held)
+        journal_scopes = {
+            journal.manifest["txid"]: {self.scope_of(key) for key in journal.manifest["targets"]} for journal in stale
+        }
+        if held:
+            stale = [journal for journal in stale if journal_scopes[journal.manifest["txid"]] & held]
+        if not stale:
+            return []
+        needed = {GLOBAL_SCOPE}.union(*(journal_scopes[journal.manifest["txid"]] for journal in stale))
+        try:
+            self.locks.acquire(job_id, needed, self.holder, wait=0)
+        except LockConflict as e:
+            if held:
+                raise SafeHoldError("WRITE", "lockConflict", f"cannot replay interrupted WRITE: {e}") from e
+            return []
+        try:
+            recovered = recover(self.root, stale)
+            for manifest in recovered:
+                self.counters.revert(manifest["txid"])
+            if recovered:
+                self.log_recovery(recovered)
+        finally:
+            if not held:
+                self.locks.release()
+        render_view(self.root)
+        return [manifest["jobId"] for manifest in recovered]
+
+    def log_recovery(self, recovered):
+        """
+        Logs a `recovery-complete` event per replayed journal and
+        re-renders meta_audit.md. The caller holds the global lock.
+        """
+        timestamp = utc_timestamp()
+        loop_id = self.current_loop_id()
+        self.audit.append([
+            make_event(
+                "recovery-complete",
+                "INFO",
+                f"Interrupted WRITE for job `{manifest['jobId']}` rolled back from journal "
+                f"`{manifest['txid']}` ({len(manifest['targets'])} file(s) restored).",
+                "Loop controller (recover)",
+                action="Pre-images restored; edit lock released by the kernel.",
+                loop=loop_id,
+                ts=timestamp,
+            )
+            for manifest in recovered
+        ])
+        self.audit.render_view()
+        merkle.update_record(self.root, [self.key(META_AUDIT)], self.hashes)
+
+    def post_write(self, targets, edits):
+        """
+        Step C: re-hashes written targets and checks expectedHashAfter.
+        Returns {key: sha256}.
+        """
+        hashes_after = {key: hash_file(key_path(self.root, key))[0] for key in edits}
+        for key, digest in hashes_after.items():
+            expected = targets[key].get("expectedHashAfter")
+            if expected and expected.lower() != digest:
+                raise SafeHoldError("WRITE.C", "postHashMismatch", f"/{key} does not match expectedHashAfter")
+        return hashes_after
+
+    def log_change(self, plan, hashes_after):
+        """
+        Step D1: appends the change summary to change_log/recent.md.
+        """
+        files = ", ".join(f"`/{key}`" for key in sorted(hashes_after)) or "_none_"
+        entry = buffers.format_entry([
+            ("ChangeID", plan["jobId"]),
+            ("Timestamp", utc_timestamp()),
+            ("Description", plan["intent"]),
+            ("FilesAffected", files),
+        ])
+        self.append_log(self.key(CHANGE_LOG), entry)
+
+    def increment_counters(self, scopes):
+        """
+        Step D2: increments every global counter, plus the counters of
+        the touched routeScopes. The full counter set is committed in step
+        G. Returns {counter key: new value}.
+        """
+        counter_keys = self.index.query(fileType="counter")
+        keys = [
+            key
+            for key in counter_keys
+            if ((self.index.get(key) or {}).get("routeScope") or "global") in ("global", *scopes)
+        ]
+        # Seed every counter so the thresholds check reads the store only.
+        self._counter_values = self.counters.preview(counter_keys, by=0)
+        for key in keys:
+            self._counter_values[key] += 1
+        return {key: self._counter_values[key] for key in keys}
+
+    def append_checkpoint(self, loop_id, job_id, hashes_after, counter_values, plan_hash):
+        """
+        Step D3: appends a checkpoint entry to checkpoints/loop_checkpoint.md.
+        """
+        written = "".join(f'\n    - path: `/{key}`\n      hashAfter: "{digest}"' for key, digest in sorted(hashes_after.items()))
+        counted = "".join(
+            f"\n    - {key_path(self.root, key).stem}: {value}" for key, value in sorted(counter_values.items())
+        )
+        entry = buffers.format_entry([
+            ("LoopID", loop_id),
+            ("Timestamp", utc_timestamp()),
+            ("JobPlanReference", f"`/{self.key(JOB_PLAN_FILE)}` (jobId `{job_id}`, sha256 `{plan_hash}`)"),
+            ("FilesWritten", written or "_none_"),
+            ("CountersIncremented", counted or "_none_"),
+            ("Outcome", "`success`"),
+            ("PostHashCheck", "`confirmed`"),
+        ])
+        self.append_log(self.key(CHECKPOINT_LOG), entry)
+
+    def log_job(self, plan, hashes_after):
+        """
+        Step F1-F2: appends the job summary to job_logs/recent.md.
+        """
+        files = ", ".join(f"`/{key}`" for key in sorted(hashes_after)) or "_none_"
+        entry = buffers.format_entry([
+            ("JobID", plan["jobId"]),
+            ("Intent", plan["intent"]),
+            ("Outcomes", files),
+            ("Status", "success"),
+            ("Timestamp", utc_timestamp()),
+        ])
+        self.append_log(self.key(JOB_LOG), entry)
+
+    def sweep_buffer(self, key):
+        """
+        Steps E / F3-F4: queues the sweep of a full rolling buffer to its
+        mergeTarget. Returns the number of entries swept.
+        """
+        meta = self.index.get(key) or {}
+        max_entries = meta.get("maxEntries")
+        merge_target = meta.get("mergeTarget")
+        if not max_entries or not merge_target:
+            return 0
+        count = self.pending_entries(key)
+        if count < max_entries:
+            return 0
+        self._log_ops.append(("sweep", key, self.key(merge_target, "WRITE.E")))
+        return count
+
+    def check_log_spans(self):
+        """
+        Step G: checks the queued in-place log edits against protected
+        spans, as byte-range edits. An append replaces the bytes past its
+        undo offset (the empty-log placeholder) and inserts the entry at
+        EOF; a sweep removes the swept entries and inserts them at the end
+        of its target.
+        """
+        swept = {key for op, key, _ in self._log_ops if op == "sweep"}
+        edits = []
+        for op, key, arg in self._log_ops:
+            start = self.logs.undo_offset(key, sweeping=key in swept)
+            end = self.logs.record(key)["size"]
+            if op == "append":
+                edits.append((key, start, end, arg if isinstance(arg, bytes) else arg.encode("utf-8")))
+            else:
+                edits.append((key, start, end, b""))
+                if self.archive_for(arg) is None:
+                    size = self.logs.record(arg)["size"]
+                    edits.append((arg, size, size, b""))
+        for key, start, end, data in edits:
+            reason = self.spans.check_range(key, start, end, data)
+            if reason:
+                raise SafeHoldError("WRITE.G", "protectedOverlap", f"/{key}: {reason}")
+
+    def log_undo_offsets(self):
+        """
+        Returns {log key: offset} such that journaling each log's bytes
+        past the offset covers every queued append and sweep.
+        """
+        swept = {key for op, key, _ in self._log_ops if op == "sweep"}
+        keys = {key for _, key, _ in self._log_ops}
+        offsets = {}
+        for op, _, target in self._log_ops:
+            if op != "sweep":
+                continue
+            archive = self.archive_for(target)
+            if archive is None:
+                keys.add(target)
+            else:
+                offsets.update(archive.prepare())
+        offsets.update({key: self.logs.undo_offset(key, sweeping=key in swept) for key in sorted(keys)})
+        return offsets
+
+    def flush(self):
+        """
+        Step G: commits all staged file updates in one atomic batch,
+        then applies the queued log appends and sweeps in place. Returns
+        the committed keys.
+        """
+        committed = sorted(self._pending)
+        with AtomicBatch() as batch:
+            for key in committed:
+                batch.stage(key_path(self.root, key), self._pending[key])
+        self._pending = {}
+        for op, key, arg in self._log_ops:
+            archive = self.archive_for(arg) if op == "sweep" else None
+            if op == "append":
+                self.logs.append(key, [arg])
+            elif archive is not None:
+                self.logs.drain(key, archive.append)
+            else:
+                self.logs.sweep(key, arg)
+        logged = {key for _, key, _ in self._log_ops}
+        logged |= {arg for op, _, arg in self._log_ops if op == "sweep" and self.archive_for(arg) is None}
+        self._log_ops = []
+        return sorted(set(committed) | logged)
+
+    def record_tree(self, keys):
+        """
+        Re-records `keys` in the Merkle record, or records the whole tree
+        if there is no record yet. The caller holds the global lock.
+        """
+        if merkle.update_record(self.root, keys, self.hashes) is None:
+            merkle.record(self.root, self.hashes)
+
+    def log_gaps(self, gaps):
+        """
+        Step G: logs a `counterSkip` event for each new checkpoint whose
+        LoopID does not follow the previous one. The caller holds the
+        global lock and the WRITE journal; the sidecar's tail and the view
+        are journaled first, so a rollback takes the events back out.
+        Returns the keys written.
+        """
+        skipped = [gap for gap in gaps if {"loopSkip", "loopRepeat"} & set(gap["gaps"])]
+        if not skipped:
+            return []
+        sidecar = file_key(self.root, self.audit.path)
+        if self.audit.path.exists():
+            self.journal.add_tails({sidecar: self.audit.path.stat().st_size})
+        else:
+            self.journal.add([sidecar])
+        self.journal.add([self.key(META_AUDIT)])
+        timestamp = utc_timestamp()
+        self.audit.append([
+            make_event(
+                "counterSkip",
+                "WARNING",
+                describe_gap(gap),
+                "Loop controller (G commit)",
+                action="Checkpoint recorded; review the missing cycles.",
+                loop=gap["loop"],
+                ts=timestamp,
+            )
+            for gap in skipped
+        ])
+        self.audit.render_view()
+        return [self.key(META_AUDIT)]
+
+    # -------------------- Safe-Hold --------------------
+
+    def enter_safe_hold(self, error):
+        """
+        Raises the drift flag and logs the event to the meta-audit log.
+        """
+        timestamp = utc_timestamp()
+        event = make_event(
+            error.event,
+            error.severity,
+            error.reason,
+            f"Loop controller ({error.step})",
+            action="Loop aborted; Safe-Hold entered. `/lifecycle/drift_flag.md` raised.",
+            loop=self.current_loop_id(),
+            ts=timestamp,
+        )
+        audit_key = self.key(META_AUDIT)
+        flag_key = self.key(DRIFT_FLAG)
+        try:
+            self.locks.acquire(error.step, [GLOBAL_SCOPE], self.holder)
+        except LockConflict:
+            # Still record the event; a concurrent writer only appends to
+            # these files during recovery.
+            pass
+        try:
+            flag_text = self.read_text(flag_key)
+            head, marker, _ = flag_text.partition(DRIFT_MARKER)
+            if marker:
+                flag_text = f"{head}{marker}\n\n- {timestamp} `{error.event}` at {error.step}: {error.reason}\n"
+            self.audit.append([event])
+            with AtomicBatch() as batch:
+                batch.stage(key_path(self.root, audit_key), self.audit.view())
+                batch.stage(key_path(self.root, flag_key), flag_text)
+            merkle.update_record(self.root, [audit_key, flag_key], self.hashes)
+        finally:
+            self.locks.release()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one READ → ACT → WRITE loop.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument(
+        "--edit",
+        action="append",
+        default=[],
+        metavar="TARGET=SOURCE",
+        help="New content for a job plan target, read from SOURCE. Repeatable.",
+    )
+    parser.add_argument("--approve-review", action="store_true", help="Allow plans with requiresReview: true.")
+    args = parser.parse_args(argv)
+
+    edits = {}
+    for spec in args.edit:
+        target, sep, source = spec.partition("=")
+        if not sep:
+            parser.error(f"--edit expects TARGET=SOURCE, got {spec!r}")
+        with open(source, encoding="utf-8") as f:
+            edits[target] = f.read()
+
+    with LoopController(args.root) as controller:
+        try:
+            result = controller.run(edits, review_approved=args.approve_review)
+        except SafeHoldError as e:
+            print(e, file=sys.stderr)
+            print(controller.timing_report(), file=sys.stderr)
+            return 3
+    print(f"Loop {result['loopId']} complete (job {result['jobId']}); wrote {len(result['written'])} target(s).")
+    for action in result["actions"]:
+        print(f"Queued {action['action']} for {action['scope']} (counter {action['count']}).")
+    print(controller.timing_report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
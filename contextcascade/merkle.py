@@ -0,0 +1,270 @@
+"""
+Merkle tree over the cascade for cheap drift detection.
+
+Each directory's digest is the SHA-256 of its sorted children
+("<kind> <name> <digest>" lines, like a git tree), so the root digest
+covers every file in the cascade. The recorded tree lives next to the
+integrity snapshot in `audit/integrity_merkle.json`.
+
+Detecting an `unexpectedMutation` is then a root comparison. When the
+roots differ, diff() descends only into subtrees whose digests differ,
+localizing the change in one step per directory level. File digests come
+from the stat-cached HashCache, so building the current tree only
+re-hashes files that changed.
+
+The loop keeps the record current: step G re-records the files it wrote
+with update(), which rehashes only the directories above them, and READ
+reports anything else that changed since (see loop.py) by building the
+current tree and comparing roots. Building it costs one stat() per file
+(only files whose stat signature changed are re-read); when the roots
+differ, diff() localizes the changed files.
+
+Usage:
+    python -m contextcascade.merkle --record     # record the current tree
+    python -m contextcascade.merkle              # list paths changed since the record
+"""
+import argparse
+import hashlib
+import json
+import posixpath
+import sys
+import time
+
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import HashCache
+from contextcascade.tree import DEFAULT_ROOT, INTERNAL_DIRS, file_key, key_path
+
+RECORD_FILE = "audit/integrity_merkle.json"
+
+FILE = "blob"
+DIR = "tree"
+EMPTY_DIGEST = hashlib.sha256(b"").hexdigest()
+
+
+class MerkleTree:
+    """
+    Directory-level Merkle tree built from {key: sha256} file digests.
+    """
+
+    def __init__(self, files=()):
+        self.files = {}
+        self.nodes = {}
+        self.children = {}
+        self.top = ""
+        self.root = EMPTY_DIGEST
+        self.update(dict(files))
+
+    def update(self, changes):
+        """
+        Applies {key: sha256, or None for a removed file}. Only the
+        directories along the changed paths are rehashed. Returns self.
+        """
+        dirty = set()
+        for key, digest in changes.items():
+            if self.files.get(key) == digest:
+                continue
+            parent, name = posixpath.split(key)
+            if digest is None:
+                del self.files[key]
+                del self.children[parent][name]
+            else:
+                self.files[key] = digest
+                self.children.setdefault(parent, {})[name] = (FILE, digest)
+            dirty.add(parent)
+            while parent:
+                grandparent, name = posixpath.split(parent)
+                if not grandparent:
+                    break
+                self.children.setdefault(grandparent, {}).setdefault(name, (DIR, None))
+                dirty.add(grandparent)
+                parent = grandparent
+        if not dirty:
+            return self
+
+        # Deepest directories first, so every child digest is known
+        # before its parent is hashed. Emptied directories are dropped.
+        for directory in sorted(dirty, key=lambda d: d.count("/"), reverse=True):
+            entries = self.children.get(directory)
+            parent, name = posixpath.split(directory)
+            if not entries:
+                self.children.pop(directory, None)
+                self.nodes.pop(directory, None)
+                self.children.get(parent, {}).pop(name, None)
+                continue
+            for child, (kind, _) in entries.items():
+                if kind == DIR:
+                    entries[child] = (DIR, self.nodes[posixpath.join(directory, child)])
+            body = "".join(f"{kind} {child} {digest}\n" for child, (kind, digest) in sorted(entries.items()))
+            self.nodes[directory] = hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+        tops = [d for d in self.children if "/" not in d]
+        self.top = tops[0] if len(tops) == 1 else ""
+        self.root = self.nodes.get(self.top, EMPTY_DIGEST)
+        return self
+
+    def to_dict(self):
+        return {"root": self.root, "nodes": self.nodes, "files": self.files}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a tree from to_dict() output without rehashing it.
+        """
+        tree = cls()
+        tree.files = dict(data["files"])
+        tree.nodes = dict(data["nodes"])
+        for key, digest in tree.files.items():
+            parent, name = posixpath.split(key)
+            tree.children.setdefault(parent, {})[name] = (FILE, digest)
+        for directory, digest in tree.nodes.items():
+            parent, name = posixpath.split(directory)
+            if parent:
+                tree.children.setdefault(parent, {})[name] = (DIR, digest)
+        tops = [d for d in tree.children if "/" not in d]
+        tree.top = tops[0] if len(tops) == 1 else ""
+        tree.root = data["root"]
+        return tree
+
+    def diff(self, other):
+        """
+        Returns the sorted file keys that were added, removed or modified
+        between this tree and `other`, visiting only differing subtrees.
+        """
+        if self.root == other.root:
+            return []
+        changed = []
+        pending = [self.top or other.top]
+        while pending:
+            directory = pending.pop()
+            mine = self.children.get(directory, {})
+            theirs = other.children.get(directory, {})
+            for name in mine.keys() | theirs.keys():
+                a = mine.get(name)
+                b = theirs.get(name)
+                if a == b:
+                    continue
+                path = posixpath.join(directory, name)
+                kinds = {entry[0] for entry in (a, b) if entry}
+                if DIR in kinds:
+                    pending.append(path)
+                if FILE in kinds:
+                    changed.append(path)
+        return sorted(changed)
+
+
+def _record_key(root):
+    return file_key(root, key_path(root, RECORD_FILE))
+
+
+def current_tree(root=DEFAULT_ROOT, cache=None):
+    """
+    Builds the Merkle tree for the cascade as it is on disk now. The
+    recorded tree file itself is left out so recording does not change
+    the root.
+    """
+    cache = cache or HashCache(root)
+    entries = cache.hash_tree()
+    record_key = _record_key(root)
+    return MerkleTree({key: entry["sha256"] for key, entry in entries.items() if key != record_key})
+
+
+def load_recorded(root=DEFAULT_ROOT):
+    """
+    Returns the recorded MerkleTree, or None if none has been recorded.
+    """
+    try:
+        with open(key_path(root, RECORD_FILE), encoding="utf-8") as f:
+            return MerkleTree.from_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+
+
+def save(root, tree):
+    """
+    Writes `tree` as the recorded tree.
+    """
+    data = tree.to_dict()
+    data["recordedAt"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    atomic_write(key_path(root, RECORD_FILE), json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+
+def record(root=DEFAULT_ROOT, cache=None):
+    """
+    Records the current tree as the new baseline and returns it.
+    """
+    tree = current_tree(root, cache)
+    save(root, tree)
+    return tree
+
+
+def changes_since(recorded, root=DEFAULT_ROOT, cache=None):
+    """
+    Returns {key: sha256, or None if removed} for files whose digest
+    differs from `recorded`. The current tree costs one stat() per file
+    (only files whose stat signature changed are re-read); then the roots
+    are compared, and only when they differ does diff() descend into the
+    differing subtrees.
+    """
+    current = current_tree(root, cache)
+    if current.root == recorded.root:
+        return {}
+    return {key: current.files.get(key) for key in recorded.diff(current)}
+
+
+def update_record(root=DEFAULT_ROOT, keys=(), cache=None):
+    """
+    Re-records the current digests of `keys` (e.g. the files a loop just
+    wrote), rehashing only the directories above them. Returns the
+    recorded tree, or None when no tree has been recorded yet.
+    """
+    recorded = load_recorded(root)
+    if recorded is None:
+        return None
+    cache = cache or HashCache(root)
+    record_key = _record_key(root)
+    keys = [key for key in keys if key != record_key and key.split("/", 2)[1] not in INTERNAL_DIRS]
+    current = cache.hash_keys(keys)
+    root_before = recorded.root
+    recorded.update({key: current[key]["sha256"] if key in current else None for key in keys})
+    if recorded.root != root_before:
+        save(root, recorded)
+    return recorded
+
+
+def unexpected_mutations(root=DEFAULT_ROOT, expected=(), cache=None):
+    """
+    Returns keys that changed since the recorded tree and are not listed
+    in `expected` (e.g. the job plan targets). Returns None when no tree
+    has been recorded yet.
+    """
+    recorded = load_recorded(root)
+    if recorded is None:
+        return None
+    expected = {key.lstrip("/") for key in expected}
+    return sorted(key for key in changes_since(recorded, root, cache) if key not in expected)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or check the cascade Merkle root.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--record", action="store_true", help=f"Record the current tree in {RECORD_FILE}.")
+    args = parser.parse_args(argv)
+
+    cache = HashCache(args.root)
+    try:
+        if args.record:
+            print(f"root {record(args.root, cache).root}")
+            return 0
+        changed = unexpected_mutations(args.root, cache=cache)
+        if changed is None:
+            print("No recorded tree; run with --record first.")
+            return 1
+        for key in changed:
+            print(f"unexpectedMutation /{key}")
+        return 2 if changed else 0
+    finally:
+        cache.save()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Header-only `@meta` parsing and a persistent metadata index.
+
+read_meta() reads a file only up to the closing `-->` of its leading
+`<!-- @meta {...} -->` block, so metadata lookups never pull in file
+bodies. MetaIndex keeps the parsed fields for every file under the
+cascade root in `_cache/meta_index.json`, with each file's stat and the
+SHA-256 of its header bytes. A refresh re-reads a header only when the
+file's stat changed, and re-parses it only when the header digest did, so
+a log that grew is read up to its `-->` and no further. Like HashCache, a
+stat is trusted only once its mtime is RACY_WINDOW_NS older than the
+refresh that recorded it, which catches a write landing in the same
+timestamp tick. Inverted indexes by routeScope and fileType are built on
+load and updated per changed file, so scope and type lookups never walk
+the whole index.
+
+Usage:
+    from contextcascade.meta import MetaIndex
+
+    index = MetaIndex("cascade")
+    index.refresh()
+    index.save()
+    index.get("cascade/change_log/recent.md")["maxEntries"]
+    index.query(routeScope="client")
+    index.by_scope("client")
+"""
+import hashlib
+import json
+import re
+import sys
+import time
+
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import RACY_WINDOW_NS
+from contextcascade.tree import DEFAULT_ROOT, cache_path, iter_files, key_path
+
+# Same rule as extractMeta() in validators/metadata_validator.ts: the
+# block must open the file, so reading the header is enough.
+META_RE = re.compile(r"\A\s*<!--\s*@meta\s*({.*?})\s*-->", re.S)
+
+# Fields kept in the index. Load planning, pruning and gate checks only
+# need these; anything else is read from the file itself.
+INDEX_FIELDS = (
+    "fileType",
+    "subtype",
+    "editPolicy",
+    "routeScope",
+    "ttlCycles",
+    "maxEntries",
+    "mergeTarget",
+    "readPriority",
+)
+
+# Fields with an inverted index (see MetaIndex.by_field()). Files without
+# a routeScope are indexed under the global scope, as the loop treats them.
+INVERTED_FIELDS = {"routeScope": "global", "fileType": None}
+
+INDEX_FILE = "meta_index.json"
+INDEX_VERSION = 3
+
+_CHUNK = 4096
+
+
+class MetaError(ValueError):
+    """
+    Raised when a `@meta` block is present but is not valid JSON.
+    """
+
+
+def parse_meta(text):
+    """
+    Parses the leading `@meta` block of `text`. Returns the meta dict, or
+    None when the text does not start with one.
+    """
+    match = META_RE.match(text)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError as e:
+        raise MetaError(f"Invalid JSON in @meta block: {e}") from e
+
+
+def read_header(path):
+    """
+    Returns the file prefix up to and including the first `-->`, or the
+    first non-blank chunk if the file does not open with a comment.
+    """
+    return _header_bytes(path).decode("utf-8", errors="replace")
+
+
+def _header_bytes(path):
+    with open(path, "rb") as f:
+        buf = f.read(_CHUNK)
+        while buf and not buf.strip():
+            more = f.read(_CHUNK)
+            if not more:
+                break
+            buf += more
+        if not buf.lstrip().startswith(b"<!--"):
+            return buf
+
+        end = buf.find(b"-->")
+        while end < 0:
+            more = f.read(_CHUNK)
+            if not more:
+                break
+            # Re-scan the seam in case "-->" straddles two chunks.
+            start = max(len(buf) - 2, 0)
+            buf += more
+            end = buf.find(b"-->", start)
+        if end >= 0:
+            buf = buf[: end + 3]
+    return buf
+
+
+def read_meta(path):
+    """
+    Reads and parses the `@meta` block of `path` without reading the body.
+    Returns None when the file has no leading `@meta` block.
+    """
+    return parse_meta(read_header(path))
+
+
+def project(meta):
+    """
+    Returns the subset of `meta` stored in the index.
+    """
+    return {field: meta[field] for field in INDEX_FIELDS if field in meta}
+
+
+class MetaIndex:
+    """
+    Persistent path -> meta index for a cascade tree.
+
+    Each entry records the file's stat and header digest alongside the
+    indexed fields (or the parse error), so refresh() only re-reads
+    headers of files that changed since the last run. `generation`
+    increases with every change, for callers that cache derived file sets.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.path = cache_path(root, INDEX_FILE)
+        self._entries = {}
+        self._inverted = {field: {} for field in INVERTED_FIELDS}
+        self.generation = 0
+        self.load()
+
+    def load(self):
+        """
+        Loads the persisted index, discarding it if it is unreadable or
+        from another index version.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        if data.get("version") == INDEX_VERSION:
+            self._entries = data.get("entries", {})
+        else:
+            self._entries = {}
+        self._inverted = {field: {} for field in INVERTED_FIELDS}
+        groups = {field: {} for field in INVERTED_FIELDS}
+        for key, entry in self._entries.items():
+            for field, value in self._inverted_values(entry["meta"]):
+                groups[field].setdefault(value, []).append(key)
+        for field, values in groups.items():
+            self._inverted[field] = {value: frozenset(keys) for value, keys in values.items()}
+        self.generation += 1
+
+    @staticmethod
+    def _inverted_values(meta):
+        if meta is None:
+            return []
+        pairs = [(field, meta.get(field, default)) for field, default in INVERTED_FIELDS.items()]
+        return [(field, value) for field, value in pairs if isinstance(value, (str, int, float, type(None)))]
+
+    def _relink(self, key, old_meta, new_meta):
+        """
+        Moves `key` between the inverted index sets for a meta change.
+        """
+        old = dict(self._inverted_values(old_meta))
+        new = dict(self._inverted_values(new_meta))
+        for field, groups in self._inverted.items():
+            if field in old and old.get(field) == new.get(field):
+                continue
+            if field in old:
+                remaining = groups[old[field]] - {key}
+                if remaining:
+                    groups[old[field]] = remaining
+                else:
+                    del groups[old[field]]
+            if field in new:
+                groups[new[field]] = groups.get(new[field], frozenset()) | {key}
+        self.generation += 1
+
+    def save(self):
+        """
+        Persists the index atomically.
+        """
+        data = {"version": INDEX_VERSION, "entries": self._entries}
+        atomic_write(self.path, json.dumps(data, indent=1, sort_keys=True))
+
+    def refresh(self):
+        """
+        Brings the index in line with the tree. Returns the number of files
+        whose headers were (re-)parsed.
+        """
+        # Taken before any stat: a write after this is newer than the
+        # records made here, and the racy check catches it.
+        indexed_ns = time.time_ns()
+        seen = set()
+        reread = 0
+        for key, dir_entry in iter_files(self.root):
+            seen.add(key)
+            st = dir_entry.stat()
+            cached = self._entries.get(key)
+            if (
+                cached
+                and cached["size"] == st.st_size
+                and cached["mtime_ns"] == st.st_mtime_ns
+                and cached["ino"] == st.st_ino
+                and cached["mtime_ns"] + RACY_WINDOW_NS < cached["indexed_ns"]
+            ):
+                continue
+            header = _header_bytes(dir_entry.path)
+            digest = hashlib.sha256(header).hexdigest()
+            stat = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino, "indexed_ns": indexed_ns}
+            if cached and cached["header"] == digest:
+                cached.update(stat)
+                continue
+            record = dict(stat, header=digest, meta=None)
+            try:
+                meta = parse_meta(header.decode("utf-8", errors="replace"))
+                if meta is not None:
+                    record["meta"] = project(meta)
+            except MetaError as e:
+                record["error"] = str(e)
+            self._relink(key, cached["meta"] if cached else None, record["meta"])
+            self._entries[key] = record
+            reread += 1
+
+        for key in set(self._entries) - seen:
+            self._relink(key, self._entries.pop(key)["meta"], None)
+        return reread
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns the indexed meta fields for `key`, or None if the file has
+        no (valid) `@meta` block or is not indexed.
+        """
+        entry = self._entries.get(key)
+        return entry["meta"] if entry else None
+
+    def error(self, key):
+        """
+        Returns the parse error recorded for `key`, if any.
+        """
+        entry = self._entries.get(key)
+        return entry.get("error") if entry else None
+
+    def items(self):
+        """
+        Yields (key, meta) for every indexed file, including files without
+        metadata (meta is None).
+        """
+        for key in sorted(self._entries):
+            yield key, self._entries[key]["meta"]
+
+    def by_field(self, field, value):
+        """
+        Returns the frozenset of keys whose `field` (an INVERTED_FIELDS
+        field) equals `value`, without scanning the index.
+        """
+        return self._inverted[field].get(value, frozenset())
+
+    def by_scope(self, scope):
+        return self.by_field("routeScope", scope)
+
+    def scopes(self):
+        """
+        Returns the routeScopes present in the index.
+        """
+        return sorted(self._inverted["routeScope"])
+
+    def query(self, **criteria):
+        """
+        Returns the keys of all files whose meta matches every
+        field=value pair in `criteria`, e.g. query(fileType="rolling").
+        Criteria on inverted fields narrow the scan to the matching set.
+        A missing field matches its INVERTED_FIELDS default, so files
+        without a routeScope match routeScope="global".
+        """
+        keys = None
+        for field in INVERTED_FIELDS:
+            if field in criteria:
+                matched = self._inverted[field].get(criteria[field], frozenset())
+                keys = matched if keys is None else keys & matched
+        if keys is None:
+            candidates = self.items()
+        else:
+            candidates = ((key, self._entries[key]["meta"]) for key in sorted(keys))
+        return [
+            key
+            for key, meta in candidates
+            if meta is not None
+            and all(meta.get(field, INVERTED_FIELDS.get(field)) == value for field, value in criteria.items())
+        ]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    root = argv[0] if argv else DEFAULT_ROOT
+    index = MetaIndex(root)
+    reread = index.refresh()
+    index.save()
+    print(f"Indexed {len(index)} files under {root} ({reread} headers read) -> {index.path}")
+
+
+if __name__ == "__main__":
+    main()
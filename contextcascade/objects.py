@@ -0,0 +1,531 @@
+"""
+Content-addressed object store for snapshots and point-in-time restore.
+
+Every blob is stored once under `_objects/`, keyed by the SHA-256 of its
+content, i.e. the digest that HashCache and integrity_snapshot.md already
+record:
+
+    _objects/ab/cdef…            raw content (read-only)
+    _objects/ab/cdef….z          zlib-compressed content
+    _objects/checkpoints/<LoopID>  root tree of that loop's snapshot
+    _objects/HEAD                root tree of the latest snapshot
+
+A tree is a blob too: one JSON object per directory mapping each name to
+["blob", digest] or ["tree", digest], with paths relative to the cascade
+root. Unchanged directories hash to the same tree, so a snapshot only adds
+the blobs and directory trees that changed since the last one.
+
+Step G of the loop snapshots the files it wrote on top of HEAD and records
+the result under the loop's LoopID. snapshot() without `changed` walks the
+whole tree through the hash cache, picking up files changed outside the
+loop. Restoring a checkpoint rewrites only the files whose digest differs.
+Copies go through atomic_write. Into another directory, raw objects can be
+hardlinked instead. Into the live root they are always copied, since the
+loop appends to logs in place.
+
+`_archive/` is skipped by the tree walk, so snapshots add the segment and
+index files of the summary archives explicitly, and a live restore rewinds
+them together with the logs.
+
+restore_snapshot() is recovery.md Phase C: every file that no longer
+matches integrity_snapshot.md is restored from its recorded digest. It and
+a live --restore run under the global scope lock.
+
+Usage:
+    store = ObjectStore("cascade")
+    store.snapshot(HashCache("cascade"), loop_id=157)
+    store.restore_tree(157)                       # the live tree as of LoopID 157
+    store.restore_tree(157, dest="/tmp/at_157", link=True)
+    restore_snapshot("cascade", store)
+
+    python -m contextcascade.objects [--snapshot [--loop ID] | --restore REF [--dest DIR] [--link] [--prune]
+        | --repair | --verify] [--compress]
+"""
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import zlib
+
+from contextcascade.archive import archive_dirs, archive_files
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import HashCache, hash_file
+from contextcascade.integrity import SNAPSHOT_FILE, parse_snapshot, verify
+from contextcascade.locks import GLOBAL_SCOPE, LockConflict, ScopeLocks
+from contextcascade.tree import DEFAULT_ROOT, OBJECTS_DIR, file_key, key_path
+
+COMPRESSED_SUFFIX = ".z"
+CHECKPOINTS_DIR = "checkpoints"
+HEAD_FILE = "HEAD"
+READ_ONLY = 0o444
+
+
+class ObjectError(ValueError):
+    """
+    Raised for missing or corrupt objects and unknown checkpoints.
+    """
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ObjectStore:
+    """
+    The object store of one cascade root. With `compress`, new blobs are
+    stored zlib-compressed when that makes them smaller.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, compress=False):
+        self.root = root
+        self.directory = pathlib.Path(root) / OBJECTS_DIR
+        self.compress = compress
+
+    # -------------------- Blobs ------------------------
+
+    def _path(self, digest):
+        return self.directory / digest[:2] / digest[2:]
+
+    def find(self, digest):
+        """
+        Returns the path of object `digest` (raw or compressed), or None.
+        """
+        path = self._path(digest)
+        if path.exists():
+            return path
+        path = path.with_name(path.name + COMPRESSED_SUFFIX)
+        return path if path.exists() else None
+
+    def has(self, digest):
+        return self.find(digest) is not None
+
+    def put(self, data):
+        """
+        Stores `data` (bytes) unless an object with its digest exists.
+        Returns the digest.
+        """
+        digest = _digest(data)
+        if self.has(digest):
+            return digest
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                path, data = path.with_name(path.name + COMPRESSED_SUFFIX), packed
+        atomic_write(path, data)
+        os.chmod(path, READ_ONLY)
+        return digest
+
+    def put_file(self, path, digest=None):
+        """
+        Stores the content of `path`. If its `digest` is known and already
+        stored, the file is not read. Returns the digest.
+        """
+        if digest and self.has(digest):
+            return digest
+        with open(path, "rb") as f:
+            return self.put(f.read())
+
+    def get(self, digest):
+        """
+        Returns the content of object `digest`, checked against the digest.
+        """
+        path = self.find(digest)
+        if path is None:
+            raise ObjectError(f"Object {digest} is not in {self.directory}")
+        data = path.read_bytes()
+        if path.suffix == COMPRESSED_SUFFIX:
+            data = zlib.decompress(data)
+        if _digest(data) != digest:
+            raise ObjectError(f"Object {digest} is corrupt")
+        return data
+
+    def iter_digests(self):
+        """
+        Yields the digest of every stored object.
+        """
+        if not self.directory.is_dir():
+            return
+        for fan in sorted(self.directory.iterdir()):
+            if len(fan.name) != 2 or not fan.is_dir():
+                continue
+            for path in sorted(fan.iterdir()):
+                name = path.name[: -len(COMPRESSED_SUFFIX)] if path.name.endswith(COMPRESSED_SUFFIX) else path.name
+                if len(name) == 62 and not name.startswith("."):
+                    yield fan.name + name
+
+    def verify(self):
+        """
+        Returns the digests of objects whose content does not match.
+        """
+        bad = []
+        for digest in self.iter_digests():
+            try:
+                self.get(digest)
+            except (ObjectError, zlib.error):
+                bad.append(digest)
+        return bad
+
+    # -------------------- Trees ------------------------
+
+    def put_tree(self, entries):
+        """
+        Stores one directory tree, {name: [kind, digest]}. Returns its
+        digest.
+        """
+        return self.put(json.dumps(entries, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+    def read_tree(self, digest):
+        return json.loads(self.get(digest))
+
+    def write_tree(self, files):
+        """
+        Stores {relative path: blob digest} as directory trees. Returns the
+        root tree digest.
+        """
+        return self.update_tree(None, files)
+
+    def update_tree(self, base, changes):
+        """
+        Returns the root tree digest of tree `base` (None for an empty tree)
+        with {relative path: blob digest, or None to delete} applied. Only
+        the directories along changed paths are read and rewritten.
+        """
+        grouped = {}
+        for path, digest in changes.items():
+            head, _, rest = path.partition("/")
+            grouped.setdefault(head, {})[rest] = digest
+        entries = self.read_tree(base) if base else {}
+        for name, sub in grouped.items():
+            if "" in sub:
+                if sub[""] is None:
+                    entries.pop(name, None)
+                else:
+                    entries[name] = ["blob", sub[""]]
+                continue
+            child = entries.get(name)
+            tree = self.update_tree(child[1] if child and child[0] == "tree" else None, sub)
+            if tree is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = ["tree", tree]
+        return self.put_tree(entries) if entries else None
+
+    def flatten(self, digest, prefix=""):
+        """
+        Returns {relative path: blob digest} for root tree `digest`.
+        """
+        files = {}
+        for name, (kind, child) in self.read_tree(digest).items():
+            if kind == "tree":
+                files.update(self.flatten(child, f"{prefix}{name}/"))
+            else:
+                files[prefix + name] = child
+        return files
+
+    # -------------------- Snapshots --------------------
+
+    def _ref_path(self, loop_id):
+        return self.directory / CHECKPOINTS_DIR / str(loop_id)
+
+    def head(self):
+        """
+        Returns the root tree digest of the latest snapshot, or None.
+        """
+        try:
+            return (self.directory / HEAD_FILE).read_text(encoding="ascii").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def checkpoints(self):
+        """
+        Returns the LoopIDs that have a snapshot, in order.
+        """
+        directory = self.directory / CHECKPOINTS_DIR
+        if not directory.is_dir():
+            return []
+        return sorted(int(path.name) for path in directory.iterdir() if path.name.isdigit())
+
+    def resolve(self, ref):
+        """
+        Returns the root tree digest for `ref`: a LoopID, "HEAD" or a tree
+        digest.
+        """
+        ref = str(ref)
+        if ref == HEAD_FILE:
+            digest = self.head()
+        elif ref.isdigit():
+            try:
+                digest = self._ref_path(ref).read_text(encoding="ascii").strip()
+            except FileNotFoundError:
+                digest = None
+        else:
+            digest = ref.lower() if self.has(ref.lower()) else None
+        if not digest:
+            raise ObjectError(f"No snapshot for {ref!r}")
+        return digest
+
+    def _rel(self, key):
+        return key.partition("/")[2]
+
+    def ref_keys(self, loop_id=None):
+        """
+        Returns the tree keys of the refs snapshot(loop_id) rewrites: HEAD
+        and the LoopID's checkpoint. Journal these before a snapshot
+        inside a WRITE. Objects need no journaling: they are
+        content-addressed, so a rolled-back snapshot only leaves
+        unreferenced objects behind.
+        """
+        paths = [self.directory / HEAD_FILE]
+        if loop_id is not None:
+            paths.append(self._ref_path(loop_id))
+        return [file_key(self.root, path) for path in paths]
+
+    def _subtree(self, tree, rel):
+        for name in rel.split("/"):
+            entry = self.read_tree(tree).get(name)
+            if not entry or entry[0] != "tree":
+                return None
+            tree = entry[1]
+        return tree
+
+    def archived(self, tree):
+        """
+        Returns {relative path: blob digest} of the summary archive files
+        (see archive.archive_dirs) in root tree `tree`.
+        """
+        files = {}
+        for rel in archive_dirs(self.root):
+            digest = self._subtree(tree, rel)
+            if digest:
+                files.update(self.flatten(digest, f"{rel}/"))
+        return files
+
+    def snapshot(self, hashes, loop_id=None, changed=None):
+        """
+        Stores the current tree and makes it HEAD (and the snapshot of
+        `loop_id`). With `changed` (tree keys), only those files are
+        re-stored on top of HEAD; otherwise every file is. The summary
+        archives are always re-listed, so segments that were compressed
+        or appended to are picked up either way. Returns the root tree
+        digest.
+        """
+        base = self.head()
+        archived = [file_key(self.root, path) for path in archive_files(self.root)]
+        if changed is None or base is None:
+            entries = hashes.hash_tree(archived)
+            files = {
+                self._rel(key): self.put_file(key_path(self.root, key), entry["sha256"])
+                for key, entry in entries.items()
+            }
+            tree = self.write_tree(files)
+        else:
+            keys = set(changed).union(archived)
+            entries = hashes.hash_keys(keys)
+            changes = {
+                self._rel(key): self.put_file(key_path(self.root, key), entries[key]["sha256"]) if key in entries else None
+                for key in keys
+            }
+            for rel in self.archived(base):
+                changes.setdefault(rel, None)
+            tree = self.update_tree(base, changes)
+        tree = tree or self.put_tree({})
+        if loop_id is not None:
+            path = self._ref_path(loop_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, tree + "\n")
+        atomic_write(self.directory / HEAD_FILE, tree + "\n")
+        return tree
+
+    def restore_file(self, path, digest, link=False):
+        """
+        Writes object `digest` to `path`, hardlinking a raw object if
+        `link` (falling back to a copy across devices).
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        source = self.find(digest)
+        if link and source is not None and source.suffix != COMPRESSED_SUFFIX:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                os.link(source, tmp)
+                os.replace(tmp, path)
+                return
+            except OSError:
+                tmp.unlink(missing_ok=True)
+        atomic_write(path, self.get(digest))
+
+    def restore_tree(self, ref, hashes=None, dest=None, link=False, prune=False):
+        """
+        Makes the files under `dest` (default: the cascade root) match
+        snapshot `ref`. Only files whose digest differs are written; with
+        `prune`, files absent from the snapshot are deleted. Hardlinks are
+        used only outside the live root. Returns {"restored", "removed",
+        "extra"} lists of relative paths.
+
+        In the live root, the summary archives are rewound with the tree:
+        segments and index lines newer than the snapshot are removed even
+        without `prune`, so the archive matches the restored logs. The
+        audit sidecar is not: it records the restore itself.
+
+        Only tree files are restored. The counter store in `_state/` keeps
+        its latest values, so counters carry on from there, and the next
+        loop re-renders the counter views over the restored ones. The
+        checkpoint index in `_cache/` is not rewound either: after
+        restoring the live checkpoint log, delete
+        `_cache/checkpoint_index.bin` so the next refresh rebuilds it.
+        """
+        target = self.flatten(self.resolve(ref))
+        live = dest is None or pathlib.Path(dest).resolve() == pathlib.Path(self.root).resolve()
+        dest = pathlib.Path(self.root if dest is None else dest)
+        if live:
+            hashes = hashes or HashCache(self.root)
+            archived = [file_key(self.root, path) for path in archive_files(self.root)]
+            current = {self._rel(key): entry["sha256"] for key, entry in hashes.hash_tree(archived).items()}
+        else:
+            current = {}
+            if dest.is_dir():
+                for path in dest.rglob("*"):
+                    if path.is_file():
+                        current[path.relative_to(dest).as_posix()] = hash_file(path)[0]
+        restored = []
+        for rel, digest in sorted(target.items()):
+            if current.get(rel) != digest:
+                self.restore_file(dest / rel, digest, link=link and not live)
+                restored.append(rel)
+        rewound = tuple(f"{rel}/" for rel in archive_dirs(self.root)) if live else ()
+        removed = []
+        extra = []
+        for rel in sorted(set(current) - set(target)):
+            if prune or rel.startswith(rewound):
+                (dest / rel).unlink()
+                removed.append(rel)
+            else:
+                extra.append(rel)
+        return {"restored": restored, "removed": removed, "extra": extra}
+
+
+def restore_snapshot(root=DEFAULT_ROOT, store=None, hashes=None, locks=None):
+    """
+    recovery.md Phase C: restores every file that does not match
+    integrity_snapshot.md from the object with its recorded digest.
+    Runs under the global lock, taken through `locks` (a ScopeLocks that
+    may already hold it) or a ScopeLocks of its own that is released
+    again. Raises LockConflict if another holder keeps it. Returns
+    (restored keys, [(key, digest)] with no stored object).
+    """
+    store = store or ObjectStore(root)
+    hashes = hashes or HashCache(root)
+    owned = locks is None
+    locks = locks or ScopeLocks(root)
+    locks.acquire("REPAIR", [GLOBAL_SCOPE], "objects")
+    try:
+        restored = []
+        missing = []
+        for key, expected, _ in verify(root, hashes):
+            if store.has(expected):
+                store.restore_file(key_path(root, key), expected)
+                restored.append(key)
+            else:
+                missing.append((key, expected))
+        return restored, missing
+    finally:
+        if owned:
+            locks.release()
+
+
+def preserve_snapshot(root=DEFAULT_ROOT, store=None, hashes=None):
+    """
+    Stores a blob for every integrity_snapshot.md entry the current file
+    still matches. Returns the keys whose recorded content is not stored
+    and no longer on disk.
+    """
+    store = store or ObjectStore(root)
+    hashes = hashes or HashCache(root)
+    with open(key_path(root, SNAPSHOT_FILE), encoding="utf-8") as f:
+        expected = parse_snapshot(f.read())
+    current = hashes.hash_keys(expected)
+    lost = []
+    for key, digest in sorted(expected.items()):
+        if key in current and current[key]["sha256"] == digest:
+            store.put_file(key_path(root, key), digest)
+        elif not store.has(digest):
+            lost.append(key)
+    return lost
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot and restore the cascade through the object store.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--snapshot", action="store_true", help="Store the whole tree and make it HEAD.")
+    group.add_argument("--restore", metavar="REF", help="Restore a snapshot: a LoopID, HEAD or a tree digest.")
+    group.add_argument("--repair", action="store_true", help="Restore files that do not match the integrity snapshot.")
+    group.add_argument("--verify", action="store_true", help="Check every object against its digest.")
+    parser.add_argument("--loop", type=int, help="With --snapshot: record it as this LoopID's checkpoint.")
+    parser.add_argument("--dest", help="With --restore: restore into this directory instead of the root.")
+    parser.add_argument("--link", action="store_true", help="With --restore --dest: hardlink raw objects.")
+    parser.add_argument("--prune", action="store_true", help="With --restore: delete files not in the snapshot.")
+    parser.add_argument("--compress", action="store_true", help="Store new objects zlib-compressed.")
+    args = parser.parse_args(argv)
+
+    store = ObjectStore(args.root, compress=args.compress)
+    hashes = HashCache(args.root)
+    try:
+        if args.snapshot:
+            tree = store.snapshot(hashes, args.loop)
+            lost = preserve_snapshot(args.root, store, hashes)
+            print(f"Snapshot {tree}" + (f" (LoopID {args.loop})" if args.loop is not None else ""))
+            for key in lost:
+                print(f"/{key}: integrity snapshot content is not stored and no longer on disk")
+            return 0
+        if args.restore:
+            locks = ScopeLocks(args.root)
+            try:
+                if args.dest is None:
+                    locks.acquire("RESTORE", [GLOBAL_SCOPE], "objects")
+                result = store.restore_tree(args.restore, hashes, args.dest, args.link, args.prune)
+            except (ObjectError, LockConflict) as e:
+                print(e, file=sys.stderr)
+                return 2
+            finally:
+                locks.release()
+            for rel in result["restored"]:
+                print(f"restored {rel}")
+            for rel in result["removed"]:
+                print(f"removed  {rel}")
+            for rel in result["extra"]:
+                print(f"extra    {rel} (not in the snapshot; --prune deletes)")
+            return 0
+        if args.repair:
+            try:
+                restored, missing = restore_snapshot(args.root, store, hashes)
+            except LockConflict as e:
+                print(e, file=sys.stderr)
+                return 2
+            for key in restored:
+                print(f"restored /{key}")
+            for key, digest in missing:
+                print(f"hashMismatch /{key}: no stored object for {digest}")
+            return 2 if missing else 0
+        if args.verify:
+            bad = store.verify()
+            for digest in bad:
+                print(f"hashMismatch object {digest}")
+            return 2 if bad else 0
+        loops = store.checkpoints()
+        count = sum(1 for _ in store.iter_digests())
+        print(
+            f"{count} objects; HEAD {store.head() or '-'}; "
+            f"{len(loops)} checkpoint snapshot(s)" + (f", LoopIDs {loops[0]}-{loops[-1]}" if loops else "")
+        )
+        return 0
+    finally:
+        hashes.save()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
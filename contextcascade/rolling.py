@@ -0,0 +1,264 @@
+"""
+Sidecar index for rolling buffers and append-only logs.
+
+Capacity checks on `change_log/recent.md` and `job_logs/recent.md` used to
+re-read and parse the whole buffer after every append. LogIndex keeps, per
+log file, the entry count, the byte offset of every entry and the span of
+the empty-log placeholder in `_cache/log_index.json`. A record is trusted
+while the file's size and mtime match, and only once that mtime was
+RACY_WINDOW_NS older than the record: a same-size edit in the same
+timestamp tick would otherwise go unnoticed. Anything else (e.g. a hand
+edit) triggers one rescan.
+
+With the index, an append writes the new entries at the end of the file
+in place. A sweep copies the byte range from the first entry to EOF into
+the merge target with one write, then truncates the buffer back to its
+header. Neither operation reads the rest of the file.
+
+Offsets are kept for files with up to OFFSET_LIMIT entries (the rolling
+buffers). Longer logs, such as summary.md and the checkpoint log, keep
+only their count and first offset.
+
+In-place writes are not atomic. Callers journal the bytes past
+undo_offset() first (see WriteJournal.add_tails).
+
+Usage:
+    logs = LogIndex("cascade")
+    logs.count("cascade/change_log/recent.md")
+    logs.append("cascade/change_log/recent.md", [entry])
+    logs.sweep("cascade/change_log/recent.md", "cascade/change_log/summary.md")
+    logs.save()
+"""
+import json
+import os
+import re
+import time
+
+from contextcascade.atomic import atomic_write
+from contextcascade.buffers import ENTRY_START_RE, FENCE_PREFIX, HEADING_RE, PLACEHOLDER_RE
+from contextcascade.hashcache import RACY_WINDOW_NS
+from contextcascade.tree import DEFAULT_ROOT, cache_path, key_path
+
+INDEX_FILE = "log_index.json"
+INDEX_VERSION = 2
+
+OFFSET_LIMIT = 256
+
+_ENTRY_START = re.compile(ENTRY_START_RE.pattern.encode("ascii"))
+_HEADING = re.compile(HEADING_RE.pattern.encode("ascii"), re.M)
+_PLACEHOLDER = re.compile(PLACEHOLDER_RE.pattern.encode("ascii"), re.M)
+_FENCE = FENCE_PREFIX.encode("ascii")
+
+
+def scan(data):
+    """
+    Parses log bytes. Returns (offsets, placeholder), where offsets are the
+    byte offsets of entries after the last heading and placeholder is the
+    [start, end) span of the last empty-log placeholder line, or None.
+    """
+    offsets = []
+    placeholder = None
+    in_fence = False
+    pos = 0
+    for line in data.splitlines(keepends=True):
+        if line.startswith(_FENCE):
+            in_fence = not in_fence
+        elif in_fence:
+            pass
+        elif _HEADING.match(line):
+            offsets = []
+            placeholder = None
+        elif _ENTRY_START.match(line):
+            offsets.append(pos)
+        elif _PLACEHOLDER.match(line):
+            placeholder = [pos, pos + len(line)]
+        pos += len(line)
+    return offsets, placeholder
+
+
+def _pread(fd, size, offset):
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _pwrite(fd, data, offset):
+    if hasattr(os, "pwrite"):
+        return os.pwrite(fd, data, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, data)
+
+
+def _record(st, offsets, placeholder, indexed_ns):
+    record = {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "indexed_ns": indexed_ns,
+        "count": len(offsets),
+        "first": offsets[0] if offsets else None,
+        "placeholder": placeholder,
+    }
+    if len(offsets) <= OFFSET_LIMIT:
+        record["offsets"] = offsets
+    return record
+
+
+class LogIndex:
+    """
+    Entry counts and offsets of log files, keyed by tree key.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.path = cache_path(root, INDEX_FILE)
+        self.records = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.records = data.get("files", {})
+
+    def save(self):
+        if self.dirty:
+            atomic_write(self.path, json.dumps({"version": INDEX_VERSION, "files": self.records}, sort_keys=True))
+            self.dirty = False
+
+    def record(self, key):
+        """
+        Returns the up-to-date record for `key`, rescanning the file if it
+        changed since it was indexed.
+        """
+        path = key_path(self.root, key)
+        indexed_ns = time.time_ns()
+        st = os.stat(path)
+        record = self.records.get(key)
+        if (
+            record
+            and record["size"] == st.st_size
+            and record["mtime_ns"] == st.st_mtime_ns
+            and record["mtime_ns"] + RACY_WINDOW_NS < record["indexed_ns"]
+        ):
+            return record
+        with open(path, "rb") as f:
+            data = f.read()
+        record = self.records[key] = _record(st, *scan(data), indexed_ns)
+        self.dirty = True
+        return record
+
+    def count(self, key):
+        return self.record(key)["count"]
+
+    def offsets(self, key):
+        """
+        Returns the entry byte offsets of `key`, or None for logs longer
+        than OFFSET_LIMIT entries.
+        """
+        return self.record(key).get("offsets")
+
+    def undo_offset(self, key, sweeping=False):
+        """
+        Returns the offset past which append() (and, with `sweeping`,
+        sweep()) may change `key`. Journaling the bytes from there to EOF
+        is enough to undo them.
+        """
+        record = self.record(key)
+        points = [record["size"]]
+        if record["placeholder"] and not record["count"]:
+            points.append(record["placeholder"][0])
+        if sweeping and record["first"] is not None:
+            points.append(record["first"])
+        return min(points)
+
+    def append(self, key, entries):
+        """
+        Appends entries (str or bytes) to `key` in place, dropping the
+        empty-log placeholder on the first append. Returns the new count.
+        """
+        blob = b"".join(
+            entry if isinstance(entry, bytes) else entry.encode("utf-8") for entry in entries if entry
+        )
+        if not blob:
+            return self.count(key)
+        record = self.record(key)
+        path = key_path(self.root, key)
+        fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            pos = record["size"]
+            prefix = b""
+            drop_placeholder = bool(record["placeholder"]) and not record["count"]
+            if drop_placeholder:
+                start = record["placeholder"][0]
+                prefix = _PLACEHOLDER.sub(b"", _pread(fd, pos - start, start))
+                pos = start
+            elif pos and _pread(fd, 1, pos - 1) != b"\n":
+                prefix = b"\n"
+            if prefix and not prefix.endswith(b"\n"):
+                prefix += b"\n"
+            if not blob.endswith(b"\n"):
+                blob += b"\n"
+            base = pos + len(prefix)
+            os.ftruncate(fd, pos)
+            _pwrite(fd, prefix + blob, pos)
+            os.fsync(fd)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+
+        added, _ = scan(blob)
+        if _HEADING.search(blob):
+            # A heading resets what counts as an entry; rescan next time.
+            self.records.pop(key, None)
+        else:
+            offsets = record.get("offsets")
+            offsets = None if offsets is None else offsets + [base + offset for offset in added]
+            count = record["count"] + len(added)
+            self.records[key] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "indexed_ns": time.time_ns(),
+                "count": count,
+                "first": record["first"] if record["first"] is not None else (base + added[0] if added else None),
+                "placeholder": None if drop_placeholder else record["placeholder"],
+            }
+            if offsets is not None and count <= OFFSET_LIMIT:
+                self.records[key]["offsets"] = offsets
+        self.dirty = True
+        return self.count(key)
+
+    def sweep(self, key, target_key):
+        """
+        Moves every entry of `key` to the end of `target_key` with one
+        contiguous copy, then truncates `key` back to its header. Returns
+        the number of entries moved.
+        """
+        return self.drain(key, lambda moved: self.append(target_key, [moved]))
+
+    def drain(self, key, sink):
+        """
+        Passes the bytes of every entry of `key` to `sink` in one call,
+        then truncates `key` back to its header. The truncation happens
+        only after `sink` returns. Returns the number of entries moved.
+        """
+        record = self.record(key)
+        if not record["count"]:
+            return 0
+        path = key_path(self.root, key)
+        fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            first = record["first"]
+            sink(_pread(fd, record["size"] - first, first))
+            os.ftruncate(fd, first)
+            os.fsync(fd)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        self.records[key] = _record(st, [], None, time.time_ns())
+        self.dirty = True
+        return record["count"]
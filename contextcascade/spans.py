@@ -0,0 +1,202 @@
+"""
+Protected-span index (protocols/safeguards.md §2 and §4).
+
+SpanIndex records, per file, the byte range and SHA-256 of every
+`<!-- PROTECTED -->` … `<!-- END PROTECTED -->` span in
+`_cache/protected_spans.json`. Records are trusted while the file's size
+and mtime match, with the same racy-mtime guard as HashCache, and the
+loop refreshes them from the written bytes after each WRITE, so the old
+file is never re-read to check an edit.
+
+Two checks use the index:
+
+- check_range(key, start, end, data): for edits described as a byte
+  range, e.g. the loop's in-place log appends and sweeps. overlaps() is
+  an interval query (bisect over the sorted spans), and only the inserted
+  bytes are searched for a new marker. Nothing is hashed.
+- check_edit(key, new_data): for whole-file replacements. Only the
+  protected spans of the new content are located (a marker search) and
+  hashed; the verdict is `protectedOverlap` unless they match the indexed
+  spans one for one. Text outside the spans may change freely.
+
+The opening marker is PROTECTED_MARKER from hashcache.py, so a span
+starts wherever the integrity pass sees a protected block: at the start
+of a line, whatever follows on it. An unterminated span runs to the end
+of the file.
+
+Usage:
+    spans = SpanIndex("cascade")
+    spans.check_edit("cascade/protocols/loop_protocol.md", new_bytes)
+    spans.record("cascade/protocols/loop_protocol.md", new_bytes)
+    spans.save()
+
+    python -m contextcascade.spans [--root cascade] [PATH ...]
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import PROTECTED_MARKER, RACY_WINDOW_NS
+from contextcascade.tree import DEFAULT_ROOT, cache_path, file_key, iter_files, key_path
+
+INDEX_FILE = "protected_spans.json"
+INDEX_VERSION = 2
+
+OPEN_RE = re.compile(rb"^" + re.escape(PROTECTED_MARKER.lstrip(b"\n")), re.M)
+CLOSE_RE = re.compile(rb"^<!-- END PROTECTED -->[ \t]*(?:\r?\n|\Z)", re.M)
+
+
+def find_spans(data):
+    """
+    Returns [start, end, sha256] for each protected span of `data`
+    (bytes). A span runs from its opening marker to the end of its
+    closing marker line.
+    """
+    spans = []
+    pos = 0
+    while True:
+        opening = OPEN_RE.search(data, pos)
+        if opening is None:
+            return spans
+        closing = CLOSE_RE.search(data, opening.end())
+        end = closing.end() if closing else len(data)
+        spans.append([opening.start(), end, hashlib.sha256(data[opening.start() : end]).hexdigest()])
+        pos = end
+
+
+class SpanIndex:
+    """
+    Protected spans of the files of one cascade root, keyed by tree key.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.path = cache_path(root, INDEX_FILE)
+        self.records = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.records = data.get("files", {})
+
+    def save(self):
+        if self.dirty:
+            atomic_write(self.path, json.dumps({"version": INDEX_VERSION, "files": self.records}, sort_keys=True))
+            self.dirty = False
+
+    def spans(self, key):
+        """
+        Returns the [start, end, sha256] spans of `key` (empty for a
+        missing file), rescanning only if the file changed since it was
+        indexed.
+        """
+        try:
+            st = os.stat(key_path(self.root, key))
+        except FileNotFoundError:
+            return []
+        record = self.records.get(key)
+        if (
+            record
+            and record["size"] == st.st_size
+            and record["mtime_ns"] == st.st_mtime_ns
+            and record["mtime_ns"] + RACY_WINDOW_NS < record["indexed_ns"]
+        ):
+            return record["spans"]
+        with open(key_path(self.root, key), "rb") as f:
+            return self.record(key, f.read())
+
+    def record(self, key, data):
+        """
+        Indexes `data` as the current content of `key` (call right after
+        writing it). Returns its spans.
+        """
+        st = os.stat(key_path(self.root, key))
+        spans = find_spans(data)
+        self.records[key] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "indexed_ns": time.time_ns(),
+            "spans": spans,
+        }
+        self.dirty = True
+        return spans
+
+    def overlaps(self, key, start, end):
+        """
+        Returns the first span of `key` that intersects the byte range
+        [start, end) (an insertion when start == end), or None.
+        """
+        spans = self.spans(key)
+        i = bisect.bisect_right([span[0] for span in spans], start) - 1
+        limit = max(start, end)
+        for span in spans[max(i, 0) :]:
+            if span[0] >= limit:
+                break
+            if (span[0] < end and start < span[1]) if end > start else span[0] < start < span[1]:
+                return span
+        return None
+
+    def check_range(self, key, start, end, data=b""):
+        """
+        Returns None if replacing bytes [start, end) of `key` with `data`
+        leaves every protected span intact, else a reason string.
+        """
+        span = self.overlaps(key, start, end)
+        if span is not None:
+            return f"edit at bytes {start}-{end} overlaps protected span at bytes {span[0]}-{span[1]}"
+        # Counted as starting a line, so a marker at the very start of
+        # `data` is caught whatever precedes it.
+        opening = OPEN_RE.search(b"\n" + data)
+        if opening is not None:
+            return f"new protected span at byte {start + opening.start() - 1}"
+        return None
+
+    def check_edit(self, key, new_data):
+        """
+        Returns None if replacing `key` with `new_data` leaves every
+        protected span intact, else a reason string.
+        """
+        old = self.spans(key)
+        new = find_spans(new_data)
+        for i, span in enumerate(old):
+            if i >= len(new):
+                return f"protected span at bytes {span[0]}-{span[1]} removed"
+            if new[i][2] != span[2]:
+                return f"protected span at bytes {span[0]}-{span[1]} modified"
+        if len(new) > len(old):
+            return f"new protected span at bytes {new[len(old)][0]}-{new[len(old)][1]}"
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the protected spans of cascade files.")
+    parser.add_argument("paths", nargs="*", help="Files to list (default: every file with a protected span).")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    index = SpanIndex(args.root)
+    if args.paths:
+        keys = [file_key(args.root, key_path(args.root, path)) for path in args.paths]
+    else:
+        keys = [key for key, _ in iter_files(args.root)]
+    for key in keys:
+        for start, end, digest in index.spans(key):
+            print(f"/{key}: {start}-{end} {digest}")
+    index.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
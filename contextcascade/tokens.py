@@ -0,0 +1,408 @@
+"""
+Token estimates for the cascade and `audit/token_summary.md`.
+
+TokenLedger counts the tokens of every file in the tree with a pluggable
+tokenizer and keeps the counts in `_cache/token_cache.json`, keyed by the
+file's content SHA-256. Digests come from the stat-cached HashCache (see
+integrity.py), so a file is re-read only when its stat signature changes,
+and re-tokenized only when its digest changes; identical content
+elsewhere in the tree is counted once. Per-domain rollups are kept in the
+same cache and adjusted by the delta of each changed file, so a warm
+refresh of a large tree costs one stat per file.
+
+The segments of the archived summary logs (see archive.py) are counted
+too, under their own keys in the `/<root>/_archive/` rollup. Cold
+segments are read through ColdSegment and keyed by the digest recorded
+in their footer, so an unchanged cold segment is never decompressed.
+
+Tokenizers:
+    heuristic       word/punctuation estimate, ~4 characters per token
+                    (default, no data files)
+    bpe:PATH        byte-pair encoding over an offline vocabulary in the
+                    tiktoken rank format (`<base64 token> <rank>` per line)
+
+Usage:
+    ledger = TokenLedger("cascade")
+    ledger.refresh()
+    ledger.update_summary()                 # rewrites "Current Token Summary"
+
+    python -m contextcascade.tokens [--tokenizer bpe:cl100k_base.tiktoken] [--write]
+                                    [--actual KEY=TOKENS ...] [--top N] [--jobs N]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from contextcascade.archive import ARCHIVED_LOGS, COLD_SUFFIX, Archive, ColdSegment
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import HashCache
+from contextcascade.tree import DEFAULT_ROOT, cache_path, file_key, key_path
+
+SUMMARY_FILE = "audit/token_summary.md"
+CACHE_FILE = "token_cache.json"
+CACHE_VERSION = 2
+
+DEFAULT_TOKENIZER = "heuristic"
+DEFAULT_TOP = 25
+
+# Below this many files to tokenize, a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 64
+
+SECTION_RE = re.compile(r"(^## Current Token Summary:?[ \t]*\n)(.*?)(?=^---[ \t]*\n## |\Z)", re.M | re.S)
+DOMAIN_RE = re.compile(r"^domains/[^/]+/")
+
+
+# -------------------- Tokenizers -----------------
+
+class HeuristicTokenizer:
+    """
+    Estimates tokens as one per punctuation mark plus one per four
+    characters of each word (rounded up).
+    """
+
+    name = "heuristic-v1"
+
+    WORD_RE = re.compile(r"\w+")
+    PUNCT_RE = re.compile(r"[^\w\s]")
+
+    def count(self, text):
+        return sum((len(word) + 3) // 4 for word in self.WORD_RE.findall(text)) + len(self.PUNCT_RE.findall(text))
+
+
+class BPETokenizer:
+    """
+    Byte-pair encoding with merge ranks loaded from a tiktoken-format
+    vocabulary file. Text is split with an approximation of the cl100k
+    pre-tokenizer, then each piece's bytes are merged lowest rank first.
+    """
+
+    PIECE_RE = re.compile(
+        r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+",
+        re.I,
+    )
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        self.ranks = {}
+        for line in data.splitlines():
+            if line.strip():
+                token, rank = line.split()
+                self.ranks[base64.b64decode(token)] = int(rank)
+        self.name = f"bpe-{hashlib.sha256(data).hexdigest()[:16]}"
+        self._pieces = {}
+
+    def _merge(self, piece):
+        parts = [piece[i : i + 1] for i in range(len(piece))]
+        ranks = self.ranks
+        while len(parts) > 1:
+            best = None
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best is None or rank < best[0]):
+                    best = (rank, i)
+            if best is None:
+                break
+            i = best[1]
+            parts[i : i + 2] = [parts[i] + parts[i + 1]]
+        return len(parts)
+
+    def count(self, text):
+        total = 0
+        cache = self._pieces
+        for piece in self.PIECE_RE.findall(text):
+            n = cache.get(piece)
+            if n is None:
+                data = piece.encode("utf-8")
+                n = cache[piece] = 1 if data in self.ranks else self._merge(data)
+            total += n
+        return total
+
+
+def get_tokenizer(spec=DEFAULT_TOKENIZER):
+    """
+    Returns the tokenizer for `spec`: "heuristic" or "bpe:PATH".
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "heuristic":
+        return HeuristicTokenizer()
+    if kind == "bpe" and arg:
+        return BPETokenizer(arg)
+    raise ValueError(f"Unknown tokenizer {spec!r} (expected 'heuristic' or 'bpe:PATH')")
+
+
+_WORKER_TOKENIZERS = {}
+
+
+def _tokenize(job):
+    """
+    Worker: tokenizes one file, decompressing cold archive segments.
+    Returns (key, tokens).
+    """
+    key, path, spec = job
+    tokenizer = _WORKER_TOKENIZERS.get(spec)
+    if tokenizer is None:
+        tokenizer = _WORKER_TOKENIZERS[spec] = get_tokenizer(spec)
+    if path.endswith(COLD_SUFFIX):
+        data = b"".join(ColdSegment(path).chunks())
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+    return key, tokenizer.count(data.decode("utf-8", errors="replace"))
+
+
+def domain_of(key):
+    """
+    Returns the rollup directory of a tree key: `/<root>/domains/<name>/`
+    for domain files, else the top-level directory (or the root itself).
+    """
+    root, _, rel = key.partition("/")
+    match = DOMAIN_RE.match(rel)
+    if match:
+        return f"/{root}/{match.group(0)}"
+    top, sep, _ = rel.partition("/")
+    return f"/{root}/{top}/" if sep else f"/{root}/"
+
+
+# -------------------- Ledger ---------------------
+
+class TokenLedger:
+    """
+    Per-file token counts and per-domain rollups for one cascade root.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, tokenizer=DEFAULT_TOKENIZER, jobs=None, hashes=None):
+        self.root = root
+        self.hashes = hashes or HashCache(root)
+        self.spec = tokenizer
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.path = cache_path(root, CACHE_FILE)
+        self.summary_key = file_key(root, key_path(root, SUMMARY_FILE))
+        self.files = {}
+        self.domains = {}
+        self.actuals = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        self.actuals = data.get("actuals", {})
+        if data.get("tokenizer") == self.tokenizer.name:
+            self.files = data.get("files", {})
+            self.domains = data.get("domains", {})
+
+    def save(self):
+        self.hashes.save()
+        if self.dirty:
+            data = {
+                "version": CACHE_VERSION,
+                "tokenizer": self.tokenizer.name,
+                "files": self.files,
+                "domains": self.domains,
+                "actuals": self.actuals,
+            }
+            atomic_write(self.path, json.dumps(data, sort_keys=True))
+            self.dirty = False
+
+    def _account(self, key, tokens, files):
+        rollup = self.domains.setdefault(domain_of(key), {"tokens": 0, "files": 0})
+        rollup["tokens"] += tokens
+        rollup["files"] += files
+        if not rollup["files"]:
+            del self.domains[domain_of(key)]
+
+    def _segments(self):
+        """
+        Returns ({key: path} of hot segments, {key: path} of cold
+        segments) for every archived summary log.
+        """
+        hot, cold = {}, {}
+        for log in ARCHIVED_LOGS:
+            archive = Archive(self.root, file_key(self.root, key_path(self.root, log)))
+            for path in archive.segment_files():
+                tier = cold if path.suffix == COLD_SUFFIX else hot
+                tier[file_key(self.root, path)] = path
+        return hot, cold
+
+    def refresh(self):
+        """
+        Brings every file's count and the rollups up to date. Returns
+        {"tokenized", "reused", "cached", "removed"} counts, where
+        "reused" files changed to content whose count was already known.
+        """
+        stats = {"tokenized": 0, "reused": 0, "cached": 0, "removed": 0}
+        hot, cold = self._segments()
+        current = {
+            key: (entry["sha256"], entry["mtime_ns"])
+            for key, entry in self.hashes.hash_tree(hot).items()
+            if key != self.summary_key
+        }
+        for key, path in cold.items():
+            current[key] = (ColdSegment(path).sha256, path.stat().st_mtime_ns)
+        digests = {key: digest for key, (digest, _) in current.items()}
+
+        for key in set(self.files) - set(digests):
+            self._account(key, -self.files.pop(key)["tokens"], -1)
+            stats["removed"] += 1
+            self.dirty = True
+
+        changed = [key for key, digest in digests.items() if self.files.get(key, {}).get("sha256") != digest]
+        stats["cached"] = len(digests) - len(changed)
+        if changed:
+            by_digest = {record["sha256"]: record["tokens"] for record in self.files.values()}
+            counted = self._count([key for key in changed if digests[key] not in by_digest])
+            for key in changed:
+                digest = digests[key]
+                tokenized = key in counted
+                tokens = counted[key] if tokenized else by_digest[digest]
+                old = self.files.get(key)
+                if old:
+                    self._account(key, tokens - old["tokens"], 0)
+                else:
+                    self._account(key, tokens, 1)
+                self.files[key] = {"sha256": digest, "mtime_ns": current[key][1], "tokens": tokens}
+                by_digest[digest] = tokens
+                stats["tokenized" if tokenized else "reused"] += 1
+            self.dirty = True
+        return stats
+
+    def _count(self, keys):
+        """
+        Tokenizes `keys`, in a process pool when there are enough of them.
+        Returns {key: tokens}.
+        """
+        jobs = [(key, str(key_path(self.root, key)), self.spec) for key in keys]
+        if len(jobs) >= PARALLEL_THRESHOLD and self.jobs > 1:
+            chunksize = max(1, len(jobs) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                return dict(pool.map(_tokenize, jobs, chunksize=chunksize))
+        _WORKER_TOKENIZERS[self.spec] = self.tokenizer
+        return dict(map(_tokenize, jobs))
+
+    def record_actuals(self, counts, timestamp=None):
+        """
+        Records actual token counts observed when files were loaded,
+        {key: tokens}.
+        """
+        timestamp = timestamp or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        for key, tokens in counts.items():
+            self.actuals[key] = {"tokens": int(tokens), "timestamp": timestamp}
+        self.dirty = True
+
+    def tokens(self, key):
+        record = self.files.get(key)
+        return record["tokens"] if record else None
+
+    # -------------------- Rendering ----------------
+
+    def render(self, top=DEFAULT_TOP, timestamp=None):
+        """
+        Returns the body of the "Current Token Summary" section.
+        """
+        timestamp = timestamp or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        actual_by_domain = {}
+        for key, actual in self.actuals.items():
+            if key in self.files:
+                actual_by_domain[domain_of(key)] = actual_by_domain.get(domain_of(key), 0) + actual["tokens"]
+        total = sum(rollup["tokens"] for rollup in self.domains.values())
+        lines = [
+            "",
+            f"**Last Updated:** {timestamp}",
+            "",
+            "### Global Summary",
+            f"- Total Estimated Tokens: {total}",
+            f"- Total Actual Tokens (last load): {sum(actual_by_domain.values()) if actual_by_domain else '—'}",
+            f"- Files Tracked: {len(self.files)}",
+            f"- Tokenizer: `{self.tokenizer.name}`",
+            "",
+            "### Per-Domain Summaries",
+            "",
+            "| Domain | Estimated Tokens | Actual Tokens | Files Tracked |",
+            "|--------|------------------|---------------|---------------|",
+        ]
+        for domain, rollup in sorted(self.domains.items()):
+            lines.append(f"| `{domain}` | {rollup['tokens']} | {actual_by_domain.get(domain, '—')} | {rollup['files']} |")
+        largest = sorted(self.files.items(), key=lambda item: (-item[1]["tokens"], item[0]))[:top]
+        lines += [
+            "",
+            f"### Largest Files (top {len(largest)})",
+            "",
+            "| File Path | Estimated Tokens | Actual Tokens (Last Load) | Last Actual Timestamp |",
+            "|-----------|------------------|---------------------------|-----------------------|",
+        ]
+        for key, record in largest:
+            actual = self.actuals.get(key, {})
+            lines.append(
+                f"| `/{key}` | {record['tokens']} | {actual.get('tokens', '—')} | {actual.get('timestamp', '—')} |"
+            )
+        return "\n".join(lines) + "\n\n"
+
+    def update_summary(self, top=DEFAULT_TOP):
+        """
+        Regenerates the "Current Token Summary" section of
+        audit/token_summary.md. Returns True if the file changed.
+        """
+        path = key_path(self.root, self.summary_key)
+        text = path.read_text(encoding="utf-8")
+        match = SECTION_RE.search(text)
+        if not match:
+            raise ValueError(f"No 'Current Token Summary' section in /{self.summary_key}")
+        body = self.render(top)
+        old_body = re.sub(r"\*\*Last Updated:\*\* .*", "", match.group(2))
+        if old_body == re.sub(r"\*\*Last Updated:\*\* .*", "", body):
+            return False
+        atomic_write(path, text[: match.start(2)] + body + text[match.end(2) :])
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate token footprints and update audit/token_summary.md.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--tokenizer", default=DEFAULT_TOKENIZER, help="'heuristic' or 'bpe:PATH' (default: %(default)s).")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--actual", action="append", default=[], metavar="KEY=TOKENS",
+                        help="Record an actual token count observed at load time.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Files listed in the summary (default: %(default)s).")
+    parser.add_argument("--write", action="store_true", help="Regenerate the Current Token Summary section.")
+    args = parser.parse_args(argv)
+
+    ledger = TokenLedger(args.root, args.tokenizer, args.jobs)
+    start = time.perf_counter()
+    stats = ledger.refresh()
+    if args.actual:
+        counts = {}
+        for item in args.actual:
+            key, _, tokens = item.partition("=")
+            counts[file_key(args.root, key_path(args.root, key))] = int(tokens)
+        ledger.record_actuals(counts)
+    if args.write:
+        ledger.update_summary(args.top)
+    ledger.save()
+    elapsed = time.perf_counter() - start
+
+    total = sum(rollup["tokens"] for rollup in ledger.domains.values())
+    print(f"{total} estimated tokens in {len(ledger.files)} files ({ledger.tokenizer.name})")
+    for domain, rollup in sorted(ledger.domains.items()):
+        print(f"  {domain}: {rollup['tokens']} tokens, {rollup['files']} files")
+    print(
+        f"{stats['tokenized']} tokenized, {stats['reused']} reused by digest, {stats['cached']} cached, "
+        f"{stats['removed']} removed in {elapsed * 1000:.0f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
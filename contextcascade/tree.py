@@ -0,0 +1,88 @@
+"""
+Helpers for walking a cascade tree and locating derived data.
+
+Paths handed to callers are keyed the way job plans and snapshots refer to
+them: POSIX-style and relative to the cascade root's parent, e.g.
+"cascade/domains/client/index.md".
+"""
+import os
+import pathlib
+
+# Default location of the cascade root, relative to the repository root.
+DEFAULT_ROOT = "cascade"
+
+# Directory (under the cascade root) holding rebuildable indexes and caches.
+CACHE_DIR = "_cache"
+
+# Directory (under the cascade root) holding kernel lock files.
+RUN_DIR = "_run"
+
+# Directory (under the cascade root) holding segmented log archives and
+# the meta-audit event log.
+ARCHIVE_DIR = "_archive"
+
+# Directory (under the cascade root) holding binary state that markdown
+# files render, e.g. the lifecycle counter store.
+STATE_DIR = "_state"
+
+# Directory (under the cascade root) holding the content-addressed object
+# store: file snapshots for restore.
+OBJECTS_DIR = "_objects"
+
+# Top-level directories under the cascade root that hold tooling state or
+# non-markdown storage rather than memory files. They are never indexed, hashed or validated.
+INTERNAL_DIRS = {CACHE_DIR, "_journal", RUN_DIR, ARCHIVE_DIR, STATE_DIR, OBJECTS_DIR}
+
+
+def cache_path(root, name):
+    """
+    Returns the path of cache file `name`, creating the cache directory.
+    """
+    directory = pathlib.Path(root) / CACHE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / name
+
+
+def file_key(root, path):
+    """
+    Returns the index key for `path`, e.g. "cascade/index.md".
+    """
+    root = pathlib.Path(root)
+    rel = pathlib.Path(path).relative_to(root).as_posix()
+    return f"{root.name}/{rel}"
+
+
+def key_path(root, key):
+    """
+    Inverse of file_key(): returns the filesystem path for an index key.
+    Leading slashes (as used in the markdown docs) are accepted.
+    """
+    root = pathlib.Path(root)
+    parts = pathlib.PurePosixPath(key.lstrip("/")).parts
+    if parts and parts[0] == root.name:
+        parts = parts[1:]
+    return root.joinpath(*parts)
+
+
+def iter_files(root):
+    """
+    Yields (key, os.DirEntry) for every regular file under the cascade
+    root, in sorted order. Internal tooling directories and in-flight
+    atomic-write temp files are skipped.
+    """
+    root = pathlib.Path(root)
+
+    def walk(directory, top_level):
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if top_level and entry.name in INTERNAL_DIRS:
+                    continue
+                yield from walk(entry.path, False)
+            elif entry.is_file(follow_symlinks=False):
+                if entry.name.startswith(".") and entry.name.endswith(".tmp"):
+                    continue
+                yield file_key(root, entry.path), entry
+
+    yield from walk(root, True)
@@ -0,0 +1,272 @@
+"""
+Batch `@meta` validator for a whole cascade tree.
+
+Applies the same rules as validateMeta() in
+validators/metadata_validator.ts (REQUIRED_FIELDS, ALLOWED_FILE_TYPES,
+ALLOWED_EDIT_POLICIES, routeScope warning) to every file in one process,
+fanning out across cores for large trees. Results are cached in
+`_cache/validation_cache.json` keyed by content SHA-256, so unchanged
+files are not re-validated. Entries for files that no longer exist are
+dropped, and an explicit path that cannot be read is reported as a failure.
+
+Usage:
+    python -m contextcascade.validate [--root cascade] [--jobs N] [--output report.json] [path ...]
+
+Exits with status 2 if any file fails validation, matching the TS CLI.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from contextcascade.atomic import atomic_write
+from contextcascade.hashcache import RACY_WINDOW_NS
+from contextcascade.meta import MetaError, parse_meta
+from contextcascade.tree import DEFAULT_ROOT, cache_path, file_key, iter_files
+
+# -------------------- Constants ------------------
+# Keep in sync with validators/metadata_validator.ts.
+
+REQUIRED_FIELDS = ("fileType", "editPolicy")
+ALLOWED_FILE_TYPES = frozenset([
+    "permanent",
+    "immutable",
+    "rolling",
+    "append-only",
+    "temporary",
+    "counter",
+    "evictable",
+    "protected",
+    "structural",
+])
+ALLOWED_EDIT_POLICIES = frozenset([
+    "appendOnly",
+    "appendOrReplace",
+    "incrementOnly",
+    "readonly",
+    "replaceOnly",
+])
+
+# Only files that are expected to carry a `@meta` block are validated when
+# walking the tree (skips .gitkeep, validator sources, ...).
+VALIDATED_SUFFIXES = frozenset([".md", ".lock"])
+
+# Bump whenever the rules above change so cached verdicts are discarded.
+RULES_VERSION = 1
+
+CACHE_FILE = "validation_cache.json"
+
+# Below this many files to check, a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 64
+
+
+def validate_meta(meta, file_path):
+    """
+    Mirrors validateMeta(): returns a report dict with "valid", "message"
+    and "warnings".
+    """
+    warnings = []
+
+    for key in REQUIRED_FIELDS:
+        if key not in meta:
+            return {
+                "valid": False,
+                "message": f'Missing required field "{key}" in @meta for {file_path}',
+                "warnings": warnings,
+            }
+
+    if meta["fileType"] not in ALLOWED_FILE_TYPES:
+        return {"valid": False, "message": f'Invalid fileType "{meta["fileType"]}" in {file_path}', "warnings": warnings}
+
+    if meta["editPolicy"] not in ALLOWED_EDIT_POLICIES:
+        return {"valid": False, "message": f'Invalid editPolicy "{meta["editPolicy"]}" in {file_path}', "warnings": warnings}
+
+    if not meta.get("routeScope"):
+        warnings.append("routeScope missing — recommend specifying domain or global.")
+
+    return {"valid": True, "message": "OK", "warnings": warnings}
+
+
+def validate_content(raw, file_path):
+    """
+    Mirrors validateFile() for already-loaded content.
+    """
+    try:
+        meta = parse_meta(raw)
+    except MetaError as e:
+        return {"valid": False, "message": str(e), "warnings": []}
+    if meta is None:
+        return {"valid": False, "message": f"No @meta block found in {file_path}", "warnings": []}
+    if not isinstance(meta, dict):
+        return {"valid": False, "message": f"@meta block is not a JSON object in {file_path}", "warnings": []}
+    return validate_meta(meta, file_path)
+
+
+def _check(job):
+    """
+    Worker: hashes and validates one file. Returns (key, sha256, report).
+    """
+    key, path = job
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    return key, digest, validate_content(data.decode("utf-8", errors="replace"), key)
+
+
+def _digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BatchValidator:
+    """
+    Validates many files against the `@meta` rules with a hash-keyed
+    result cache.
+
+    A cached verdict is reused without reading the file when its size and
+    mtime are unchanged and the mtime was already RACY_WINDOW_NS old when
+    it was checked; otherwise it is reused only after a re-hash matches.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, jobs=None, use_cache=True):
+        self.root = root
+        self.jobs = jobs or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_file = cache_path(root, CACHE_FILE)
+        self._cache = self._load_cache() if use_cache else {}
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get("rules") != RULES_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_cache(self):
+        data = {"rules": RULES_VERSION, "files": self._cache}
+        atomic_write(self.cache_file, json.dumps(data, sort_keys=True))
+
+    def targets(self, paths=None):
+        """
+        Returns (key, path) pairs to validate: the given paths, or every
+        file under the root with a VALIDATED_SUFFIXES suffix.
+        """
+        if paths:
+            root = pathlib.Path(self.root).resolve()
+            jobs = []
+            for path in paths:
+                resolved = pathlib.Path(path).resolve()
+                try:
+                    key = file_key(root, resolved)
+                except ValueError:
+                    key = pathlib.Path(path).as_posix()
+                jobs.append((key, str(path)))
+            return jobs
+        return [
+            (key, entry.path)
+            for key, entry in iter_files(self.root)
+            if pathlib.PurePath(entry.name).suffix in VALIDATED_SUFFIXES
+        ]
+
+    def run(self, paths=None):
+        """
+        Validates the target files and returns a machine-readable report:
+        {"valid", "checked", "cached", "failed", "files": {key: report}}.
+        """
+        files = {}
+        pending = []
+        cached = 0
+        # Taken before any file is read: a write after this is newer than
+        # the verdict, and the racy check below catches it.
+        checked_ns = time.time_ns()
+        targets = self.targets(paths)
+        pruned = set(self._cache) - {key for key, _ in targets} if not paths else set()
+
+        for key, path in targets:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                files[key] = {"valid": False, "message": f"Cannot read {key}: {e.strerror}", "warnings": []}
+                pruned.add(key)
+                continue
+            entry = self._cache.get(key)
+            if entry and entry["size"] == st.st_size:
+                trusted = (
+                    entry["mtime_ns"] == st.st_mtime_ns
+                    and entry["mtime_ns"] + RACY_WINDOW_NS < entry.get("checked_ns", 0)
+                )
+                if not trusted and _digest(path) == entry["sha256"]:
+                    entry["mtime_ns"] = st.st_mtime_ns
+                    entry["checked_ns"] = checked_ns
+                    trusted = True
+                if trusted:
+                    files[key] = entry["report"]
+                    cached += 1
+                    continue
+            pending.append((key, path, st))
+        pruned &= set(self._cache)
+        for key in pruned:
+            del self._cache[key]
+
+        jobs = [(key, path) for key, path, _ in pending]
+        if len(jobs) >= PARALLEL_THRESHOLD and self.jobs > 1:
+            chunksize = max(1, len(jobs) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(_check, jobs, chunksize=chunksize))
+        else:
+            results = [_check(job) for job in jobs]
+
+        for (key, _, st), (_, digest, report) in zip(pending, results):
+            files[key] = report
+            self._cache[key] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "checked_ns": checked_ns,
+                "sha256": digest,
+                "report": report,
+            }
+
+        if self.use_cache and (pending or cached or pruned):
+            self._save_cache()
+
+        failed = sum(1 for report in files.values() if not report["valid"])
+        return {
+            "valid": failed == 0,
+            "checked": len(results),
+            "cached": cached,
+            "failed": failed,
+            "files": dict(sorted(files.items())),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate @meta blocks across a cascade tree.")
+    parser.add_argument("paths", nargs="*", help="Files to validate (default: the whole cascade).")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Cascade root (default: %(default)s).")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the result cache.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    report = BatchValidator(args.root, jobs=args.jobs, use_cache=not args.no_cache).run(args.paths)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        atomic_write(args.output, text + "\n")
+        print(f"{report['failed']} of {len(report['files'])} files failed validation -> {args.output}")
+    else:
+        print(text)
+    return 0 if report["valid"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
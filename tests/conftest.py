@@ -0,0 +1,61 @@
+"""
+Shared fixtures: every test runs against a private copy of the
+repository's `cascade/` tree, without its rebuildable state.
+"""
+import pathlib
+import shutil
+
+import pytest
+
+from contextcascade.loop import LoopController
+from contextcascade.tree import INTERNAL_DIRS, key_path
+
+REPO_CASCADE = pathlib.Path(__file__).resolve().parent.parent / "cascade"
+
+CLIENT_INDEX = "cascade/domains/client/index.md"
+SERVER_INDEX = "cascade/domains/server/index.md"
+
+
+@pytest.fixture
+def root(tmp_path):
+    """
+    Path of a fresh copy of the cascade.
+    """
+    dest = tmp_path / "cascade"
+    shutil.copytree(REPO_CASCADE, dest, ignore=shutil.ignore_patterns(*INTERNAL_DIRS))
+    return str(dest)
+
+
+@pytest.fixture
+def read(root):
+    """
+    Returns the text of a cascade path in the copy.
+    """
+
+    def read(path):
+        return key_path(root, path).read_text(encoding="utf-8")
+
+    return read
+
+
+@pytest.fixture
+def run_loop(root, read):
+    """
+    Runs one loop writing `edits` ({path: text}; default: a line appended
+    to the client index) under a generated job plan.
+    """
+
+    def run_loop(edits=None, job_id="test-job", controller=None, policy="appendOrReplace", intent=None, **kwargs):
+        if edits is None:
+            edits = {CLIENT_INDEX: read(CLIENT_INDEX) + f"\n- {job_id}\n"}
+        plan = {
+            "jobId": job_id,
+            "intent": intent or f"Test loop {job_id}",
+            "targets": [{"path": path, "editPolicy": policy} for path in edits],
+        }
+        if controller is not None:
+            return controller.run(edits, plan=plan, **kwargs)
+        with LoopController(root) as controller:
+            return controller.run(edits, plan=plan, **kwargs)
+
+    return run_loop
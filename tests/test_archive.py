@@ -0,0 +1,105 @@
+import pytest
+
+from contextcascade import archive
+from contextcascade.archive import Archive, ColdSegment
+from contextcascade.integrity import verify_archives
+
+SUMMARY = "cascade/change_log/summary.md"
+
+
+def _entry(n, day, path="domains/client/index.md"):
+    return (
+        f"- **ChangeID:** change-{n}\n"
+        f"  **Timestamp:** 2025-01-{day:02d}T00:00:00Z\n"
+        f"  **FilesWritten:** `/cascade/{path}`\n"
+        f"  **Summary:** {'words ' * 8}\n"
+    )
+
+
+def _names(log):
+    return [path.name for path in log.segment_files()]
+
+
+def test_segments_roll_over(root, monkeypatch):
+    monkeypatch.setattr(archive, "SEGMENT_SIZE", 300)
+    log = Archive(root, SUMMARY, codec=None)
+    entries = [_entry(n, n) for n in range(1, 7)]
+    for entry in entries:
+        log.append(entry.encode("utf-8"))
+    assert _names(log) == ["000001.seg", "000002.seg", "000003.seg"]
+    assert b"".join(log.iter_chunks()).decode("utf-8") == "".join(entries)
+    assert [Archive(root, SUMMARY).by_id(f"change-{n}") for n in range(1, 7)] == [[entry] for entry in entries]
+
+
+def test_segments_roll_over_and_close_cold(root, monkeypatch):
+    monkeypatch.setattr(archive, "SEGMENT_SIZE", 300)
+    log = Archive(root, SUMMARY)
+    entries = [_entry(n, n) for n in range(1, 7)]
+    for entry in entries:
+        log.append(entry.encode("utf-8"))
+    assert _names(log) == ["000001.segz", "000002.segz", "000003.seg"]
+    assert b"".join(log.iter_chunks()).decode("utf-8") == "".join(entries)
+    assert all(ColdSegment(path).verify() for path in log.segment_files()[:-1])
+    # Every entry reads back from whichever tier holds it.
+    assert [log.by_id(f"change-{n}") for n in range(1, 7)] == [[entry] for entry in entries]
+    stats = log.stats()
+    assert stats["segments"] == 3 and stats["cold"] == 2
+    assert stats["size"] == len("".join(entries))
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_cold_reads_span_blocks(root, monkeypatch, codec):
+    monkeypatch.setattr(archive, "COLD_BLOCK", 64)
+    log = Archive(root, SUMMARY, codec=codec)
+    entries = [_entry(n, n) for n in range(1, 5)]
+    log.append("".join(entries).encode("utf-8"))
+    log.compress(1)
+    assert _names(log) == ["000001.segz"]
+    cold = ColdSegment(log.segment_files()[0])
+    assert cold.codec == codec and len(cold.blocks) > 4
+    assert cold.read(100, 150) == "".join(entries).encode("utf-8")[100:250]
+    reopened = Archive(root, SUMMARY)
+    assert [reopened.by_id(f"change-{n}")[0] for n in range(1, 5)] == entries
+
+    # Later appends go to a new hot segment.
+    log.append(_entry(5, 5).encode("utf-8"))
+    assert _names(log) == ["000001.segz", "000002.seg"]
+
+
+def test_corrupt_cold_segment_fails_verification(root):
+    log = Archive(root, SUMMARY)
+    log.append(_entry(1, 1).encode("utf-8"))
+    log.compress(1)
+    assert verify_archives(root) == []
+    path = log.segment_files()[0]
+    data = bytearray(path.read_bytes())
+    data[len(data) // 4] ^= 0xFF
+    path.chmod(0o644)
+    path.write_bytes(bytes(data))
+    assert verify_archives(root) == ["cascade/_archive/change_log/summary/segments/000001.segz"]
+
+
+def test_lookups_by_id_path_and_time(root):
+    log = Archive(root, SUMMARY)
+    first = _entry(1, 3)
+    second = _entry(2, 1, path="domains/server/index.md")
+    third = _entry(3, 2)
+    log.append((first + second).encode("utf-8"))
+    log.compress(1)
+    log.append(third.encode("utf-8"))
+
+    log = Archive(root, SUMMARY)
+    assert len(log) == 3
+    assert log.by_id("change-2") == [second]
+    assert log.by_id("missing") == []
+    assert log.by_path("cascade/domains/client/index.md") == [first, third]
+    assert log.by_path("/cascade/domains/server/index.md") == [second]
+    assert log.between() == [second, third, first]
+    assert log.between(since="2025-01-02T00:00:00Z") == [third, first]
+    assert log.between("2025-01-01T00:00:00Z", "2025-01-03T00:00:00Z") == [second, third]
+
+    # Appends after loading keep the indexes current.
+    fourth = _entry(4, 2, path="domains/server/index.md")
+    log.append(fourth.encode("utf-8"))
+    assert log.by_path("cascade/domains/server/index.md") == [second, fourth]
+    assert log.between("2025-01-02T00:00:00Z", "2025-01-03T00:00:00Z") == [third, fourth]
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from contextcascade.atomic import AtomicBatch, atomic_write
+
+
+def _leftovers(directory):
+    return sorted(path.name for path in directory.iterdir() if path.name.endswith(".tmp"))
+
+
+def test_atomic_write_replaces_and_keeps_mode(tmp_path):
+    path = tmp_path / "note.md"
+    atomic_write(path, "first ✓")
+    assert path.read_text(encoding="utf-8") == "first ✓"
+    path.chmod(0o640)
+    atomic_write(path, b"second")
+    assert path.read_bytes() == b"second"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert _leftovers(tmp_path) == []
+
+
+def test_batch_publishes_only_on_commit(tmp_path):
+    (tmp_path / "sub").mkdir()
+    old = tmp_path / "old.md"
+    old.write_text("old", encoding="utf-8")
+    batch = AtomicBatch()
+    batch.stage(old, "new")
+    batch.stage(tmp_path / "sub" / "fresh.md", b"fresh")
+    assert len(batch) == 2
+    assert old.read_text(encoding="utf-8") == "old"
+    assert not (tmp_path / "sub" / "fresh.md").exists()
+
+    batch.commit()
+    assert len(batch) == 0
+    assert old.read_text(encoding="utf-8") == "new"
+    assert (tmp_path / "sub" / "fresh.md").read_bytes() == b"fresh"
+    assert _leftovers(tmp_path) == _leftovers(tmp_path / "sub") == []
+
+
+def test_abort_and_failed_block_leave_targets_untouched(tmp_path):
+    old = tmp_path / "old.md"
+    old.write_text("old", encoding="utf-8")
+    batch = AtomicBatch()
+    batch.stage(old, "new")
+    batch.abort()
+    assert old.read_text(encoding="utf-8") == "old"
+    assert _leftovers(tmp_path) == []
+
+    with pytest.raises(RuntimeError):
+        with AtomicBatch() as batch:
+            batch.stage(old, "new")
+            raise RuntimeError
+    assert old.read_text(encoding="utf-8") == "old"
+    assert _leftovers(tmp_path) == []
+
+    with AtomicBatch() as batch:
+        batch.stage(old, "new")
+    assert old.read_text(encoding="utf-8") == "new"
+
+
+def test_failed_rename_removes_remaining_temp_files(tmp_path):
+    first, blocked, last = tmp_path / "a.md", tmp_path / "b.md", tmp_path / "c.md"
+    batch = AtomicBatch()
+    batch.stage(first, "a")
+    batch.stage(blocked, "b")
+    batch.stage(last, "c")
+    # A directory in the way makes the second rename fail.
+    blocked.mkdir()
+    with pytest.raises(OSError):
+        batch.commit()
+    assert first.read_text(encoding="utf-8") == "a"
+    assert blocked.is_dir() and not last.exists()
+    assert _leftovers(tmp_path) == []
+    assert len(batch) == 0
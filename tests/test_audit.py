@@ -0,0 +1,75 @@
+import pytest
+
+from contextcascade import audit
+from contextcascade.audit import AuditLog, format_event, make_event
+from contextcascade.tree import key_path
+
+EVENTS = [
+    make_event("hashMismatch", "CRITICAL", "a", "Pre-WRITE", loop=10, ts="2025-01-01T00:00:00Z"),
+    make_event("counterSkip", "WARNING", "b", "Loop", loop=11, ts="2025-01-02T00:00:00Z"),
+    make_event("hashMismatch", "WARNING", "c", "Loop", loop=12, ts="2025-01-03T00:00:00Z"),
+    make_event("driftDetected", "CRITICAL", "d", "READ", ts="2025-01-04T00:00:00Z"),
+    make_event("hashMismatch", "CRITICAL", "e", "Post-WRITE", loop=14, ts="2025-01-05T12:00:00Z"),
+]
+
+
+def _details(events):
+    return "".join(event["details"] for event in events)
+
+
+@pytest.fixture
+def log(root):
+    log = AuditLog(root)
+    log.append(EVENTS)
+    log.save()
+    return AuditLog(root)
+
+
+def test_query_by_type_and_severity(log):
+    assert _details(log.query(type="hashMismatch")) == "ace"
+    assert _details(log.query(severity="CRITICAL")) == "ade"
+    assert _details(log.query(type="hashMismatch", severity="WARNING")) == "c"
+    assert log.query(type="unknownType") == []
+    assert _details(log.query(type="hashMismatch", limit=2)) == "ce"
+
+
+def test_query_by_loop_and_time(log):
+    assert _details(log.query(loops=(11, 12))) == "bc"
+    assert _details(log.query(loops=(12, None))) == "ce"
+    assert _details(log.query(loops=(None, 10))) == "a"
+    assert _details(log.query(since="2025-01-02T00:00:00Z", until="2025-01-05")) == "bcd"
+    assert _details(log.query(since="2025-01-05")) == "e"
+    assert _details(log.query(type="hashMismatch", loops=(11, None), since="2025-01-04")) == "e"
+
+
+def test_unparsable_bound_raises(log):
+    with pytest.raises(ValueError):
+        log.query(since="yesterday")
+    with pytest.raises(ValueError):
+        log.query(until="2025-13")
+    with pytest.raises(SystemExit):
+        audit.main(["--root", log.root, "--since", "yesterday"])
+
+
+def test_render_view_absorbs_entries_in_the_section(root):
+    view = key_path(root, "cascade/" + audit.AUDIT_FILE)
+    legacy = make_event("hashMismatch", "CRITICAL", "legacy", "Pre-WRITE", loop=3, ts="2024-12-01T00:00:00Z")
+    text = view.read_text(encoding="utf-8")
+    view.write_text(text.replace(audit.SECTION_HEADING + "\n", audit.SECTION_HEADING + "\n" + format_event(legacy)), encoding="utf-8")
+
+    log = AuditLog(root)
+    log.append([EVENTS[0]])
+    assert "legacy" in log.view()
+    assert log.render_view()
+    assert _details(log.query()) == "alegacy"
+    assert _details(log.query(loops=(3, 3))) == "legacy"
+
+    # A hand-written entry after the rendered events is absorbed too, once.
+    text = view.read_text(encoding="utf-8")
+    hand = make_event("manualNote", "INFO", "hand", "Operator", ts="2025-02-01T00:00:00Z")
+    view.write_text(text.replace("\n---\n## Maintenance", format_event(hand) + "\n---\n## Maintenance"), encoding="utf-8")
+    assert log.render_view()
+    assert not log.render_view()
+    assert _details(log.query()) == "alegacyhand"
+    text = view.read_text(encoding="utf-8")
+    assert text.count("hand") == 1 and text.count("legacy") == 1
@@ -0,0 +1,105 @@
+from contextcascade.checkpoints import CHECKPOINT_LOG, CheckpointIndex
+from contextcascade.tree import key_path
+
+
+def _entry(loop, day, outcome="success", check="confirmed"):
+    return (
+        f"\n---\n- **LoopID:** {loop}\n"
+        f"  **Timestamp:** 2025-01-{day:02d}T12:00:00Z\n"
+        f"  **JobPlanReference:** `/cascade/job_logs/temp_job.md` (jobId `job-{loop}`)\n"
+        f"  **Outcome:** `{outcome}`\n"
+        f"  **PostHashCheck:** `{check}`\n"
+    )
+
+
+def _append(root, *entries):
+    with open(key_path(root, "cascade/" + CHECKPOINT_LOG), "a", encoding="utf-8") as f:
+        f.write("".join(entries))
+
+
+def _loops(records):
+    return [record["loop"] for record in records]
+
+
+def test_lookups(root):
+    _append(
+        root,
+        _entry(1, 1),
+        _entry(2, 2),
+        _entry(3, 3),
+        _entry(4, 4, outcome="failure"),
+        _entry(5, 5, check="warning"),
+    )
+    index = CheckpointIndex(root)
+    assert index.refresh() == []
+    assert len(index) == 5
+
+    assert index.by_loop(3)["timestamp"] == index.at("2025-01-03T12:00:00Z")["timestamp"]
+    assert not index.by_loop(4)["good"]
+    assert index.by_loop(9) is None
+    assert "**LoopID:** 3\n" in index.entry(index.by_loop(3))
+
+    assert index.at("2025-01-02T18:00:00Z")["loop"] == 2
+    assert index.at("2025-01-01T00:00:00Z") is None
+    assert index.at("2030-01-01T00:00:00Z")["loop"] == 5
+
+    assert index.last_good()["loop"] == 3
+    assert index.last_good(before="2025-01-02T18:00:00Z")["loop"] == 2
+    assert index.last_good(before="2025-01-01T00:00:00Z") is None
+
+    # A fresh instance reads the same answers from the saved index.
+    assert CheckpointIndex(root).last_good()["loop"] == 3
+
+
+def test_gap_flags(root):
+    _append(root, _entry(1, 1), _entry(2, 2))
+    index = CheckpointIndex(root)
+    index.refresh()
+    _append(root, _entry(4, 3), _entry(4, 6), _entry(5, 5))
+    gaps = index.refresh()
+    assert [(gap["loop"], gap["gaps"]) for gap in gaps] == [
+        (4, ["loopSkip"]),
+        (4, ["loopRepeat", "timeGap"]),
+        (5, ["timeBack"]),
+    ]
+    assert gaps[0]["previousLoop"] == 2
+    assert index.refresh() == []
+    assert index.gaps() == gaps
+    assert index.gaps(start=3) == gaps[1:]
+
+
+def test_out_of_order_log_falls_back_to_scans(root):
+    _append(root, _entry(5, 1), _entry(3, 2), _entry(4, 3, outcome="failure"))
+    index = CheckpointIndex(root)
+    index.refresh()
+    assert index.by_loop(3)["position"] == 1
+    assert index.by_loop(5)["position"] == 0
+    assert index.last_good()["loop"] == 3
+
+
+def test_rebuild_returns_only_unseen_gaps(root):
+    path = key_path(root, "cascade/" + CHECKPOINT_LOG)
+    _append(root, _entry(1, 1), _entry(3, 2))
+    index = CheckpointIndex(root)
+    assert _loops(index.refresh()) == []
+    _append(root, _entry(5, 3))
+    assert _loops(index.refresh()) == [5]
+
+    # Rewritten head: the index is rebuilt, old gaps are not returned again.
+    path.write_text(path.read_text(encoding="utf-8").replace("# Loop Checkpoint Log", "# Loop checkpoint log"), encoding="utf-8")
+    _append(root, _entry(6, 4))
+    assert index.refresh() == []
+    _append(root, _entry(8, 5))
+    assert _loops(index.refresh()) == [8]
+    assert _loops(index.gaps()) == [3, 5, 8]
+
+    # A shrunk log (e.g. a restore) is rebuilt without returning anything.
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text[: text.index(_entry(6, 4))], encoding="utf-8")
+    assert index.refresh() == []
+    assert len(index) == 3
+
+    # A missing index is rebuilt silently too.
+    index.path.unlink()
+    assert CheckpointIndex(root).refresh() == []
+    assert _loops(CheckpointIndex(root).gaps()) == [3, 5]
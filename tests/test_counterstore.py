@@ -0,0 +1,39 @@
+from contextcascade.counterstore import SLOT_SIZE, CounterStore, _slot_offset
+
+COUNTER = "cascade/lifecycle/counter.md"
+CLIENT = "cascade/lifecycle/client.md"
+
+
+def test_commit_and_revert(root):
+    with CounterStore(root) as store:
+        first = store.preview([COUNTER, CLIENT])
+        store.commit(first, tag="tx1")
+        second = store.preview([COUNTER])
+        store.commit(second, tag="tx2")
+        assert store.values() == second
+        assert not store.revert("tx1")
+        assert store.revert("tx2")
+        assert store.values() == first
+
+
+def test_torn_slot_falls_back_to_previous(root):
+    with CounterStore(root) as store:
+        first = store.commit(store.preview([COUNTER]), tag="tx1")
+        second = store.commit(store.preview([COUNTER]), tag="tx2")
+        assert second[COUNTER] == first[COUNTER] + 1
+        index = store._active()[0]
+
+    # Flip one byte in the body of the newest slot, as a torn write would.
+    with open(f"{root}/_state/counters.bin", "r+b") as f:
+        offset = _slot_offset(index) + SLOT_SIZE // 2
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    with CounterStore(root) as store:
+        assert store.values() == first
+        # The next commit goes to the torn slot and becomes current.
+        third = store.commit(store.preview([COUNTER]), tag="tx3")
+        assert third[COUNTER] == first[COUNTER] + 1
+        assert store.values() == third
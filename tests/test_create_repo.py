@@ -0,0 +1,111 @@
+import zlib
+
+import pytest
+
+import create_repo
+from create_repo import REPO_FILES, create_repo_structure
+
+FILES = {"a.md": "alpha\n", "docs/b.md": "bravo\n", "docs/deep/c.md": "charlie\n"}
+
+
+def _counts(summary):
+    return summary["created"], summary["updated"], summary["unchanged"], summary["errors"]
+
+
+def test_incremental_skips_identical_files(tmp_path, monkeypatch):
+    assert _counts(create_repo_structure(tmp_path, files=FILES)) == (3, 0, 0, 0)
+    (tmp_path / "docs/b.md").write_text("BRAVO\n", encoding="utf-8")
+    (tmp_path / "docs/deep/c.md").write_text("charlie, longer\n", encoding="utf-8")
+
+    # A size mismatch is decided from stat() alone; only b.md is hashed.
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path.name)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(create_repo, "open", tracking_open, raising=False)
+    assert _counts(create_repo_structure(tmp_path, incremental=True, files=FILES)) == (0, 2, 1, 0)
+    assert sorted(opened) == ["a.md", "b.md"]
+    for path, content in FILES.items():
+        assert (tmp_path / path).read_text(encoding="utf-8") == content
+
+    (tmp_path / "a.md").unlink()
+    assert _counts(create_repo_structure(tmp_path, incremental=True, files=FILES)) == (1, 0, 2, 0)
+
+
+
+def _tree(base):
+    return {
+        path.relative_to(base).as_posix(): path.read_bytes() if path.is_file() else None
+        for path in base.rglob("*")
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 4, 0])
+def test_parallel_matches_serial(tmp_path, workers):
+    serial = create_repo_structure(tmp_path / "serial")
+    parallel = create_repo_structure(tmp_path / "parallel", workers=workers)
+    assert parallel == serial == {"created": len(REPO_FILES), "updated": 0, "unchanged": 0, "errors": 0}
+    assert _tree(tmp_path / "parallel") == _tree(tmp_path / "serial")
+
+    again = create_repo_structure(tmp_path / "parallel", incremental=True, workers=workers)
+    assert _counts(again) == (0, 0, len(REPO_FILES), 0)
+
+
+def test_parallel_reports_files_only_in_the_summary(tmp_path, capsys):
+    create_repo_structure(tmp_path, files=FILES, workers=2)
+    out = capsys.readouterr().out
+    assert "Creating file" not in out
+    assert "Summary: 3 created, 0 updated, 0 unchanged, 0 errors." in out
+
+
+def test_registry_decodes_entries_on_lookup():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "\nloaded\n"
+
+    registry = create_repo.TemplateRegistry()
+    registry.register("plain.md", "  plain\n")
+    registry.register("blob.md", zlib.compress("\ncompressed ✓\n".encode("utf-8")))
+    registry.register("lazy.md", loader)
+    assert calls == []
+    assert len(registry) == 3 and "lazy.md" in registry and "other.md" not in registry
+    assert list(registry) == ["plain.md", "blob.md", "lazy.md"]
+    assert dict(registry) == {"plain.md": "plain", "blob.md": "compressed ✓", "lazy.md": "loaded"}
+    # Nothing is cached: every lookup calls the loader again.
+    assert registry["lazy.md"] == "loaded"
+    assert len(calls) == 2
+    with pytest.raises(KeyError):
+        registry["other.md"]
+
+    registry.register("plain.md", "replaced")
+    assert registry["plain.md"] == "replaced" and len(registry) == 3
+
+
+def test_loader_and_blob_helpers_feed_the_scaffold(tmp_path, monkeypatch):
+    registry = create_repo.TemplateRegistry()
+    monkeypatch.setattr(create_repo, "REPO_FILES", registry)
+    create_repo.add_file_content("a.md", "alpha\n")
+    create_repo.add_file_loader("docs/b.md", lambda: "bravo\n")
+    create_repo.add_file_blob("docs/c.md", zlib.compress(b"charlie\n"))
+    assert _counts(create_repo_structure(tmp_path, workers=2)) == (3, 0, 0, 0)
+    assert (tmp_path / "docs/b.md").read_text(encoding="utf-8") == "bravo"
+    assert (tmp_path / "docs/c.md").read_text(encoding="utf-8") == "charlie"
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_files_are_reported_only_after_the_commit(tmp_path, capsys, workers):
+    create_repo_structure(tmp_path, files=FILES)
+    capsys.readouterr()
+    # A directory in place of a.md makes the batch commit fail.
+    (tmp_path / "a.md").unlink()
+    (tmp_path / "a.md").mkdir()
+    summary = create_repo_structure(tmp_path, files=FILES, workers=workers)
+    out = capsys.readouterr().out
+    assert "Error committing staged files" in out
+    assert "Creating file" not in out
+    assert _counts(summary) == (0, 0, 0, 3)
@@ -0,0 +1,38 @@
+import pytest
+
+from contextcascade.gates import GateTrie, WriteGates
+
+RULES = [
+    {"action": "allow", "pattern": "/cascade/domains/**", "editPolicy": "appendOrReplace", "line": 1},
+    {"action": "deny", "pattern": "/cascade/00_BOOTSTRAP.md", "editPolicy": None, "line": 2},
+]
+
+
+@pytest.fixture
+def trie():
+    return GateTrie(RULES, "cascade")
+
+
+def test_dot_segments_are_resolved(trie):
+    decision = trie.decide("/cascade/domains/../00_BOOTSTRAP.md", "appendOrReplace")
+    assert not decision["allowed"]
+    assert decision["rule"]["pattern"] == "/cascade/00_BOOTSTRAP.md"
+    assert trie.decide("/cascade/./domains/client/./index.md", "appendOrReplace")["allowed"]
+
+
+@pytest.mark.parametrize("path", ["/other/index.md", "/cascade/../outside.md", "/cascade/domains/../../../x.md", "/"])
+def test_paths_outside_root_are_denied(trie, path):
+    decision = trie.decide(path)
+    assert not decision["allowed"]
+    assert decision["reason"] == "outside the cascade root"
+
+
+def test_unmatched_path_inside_root_is_allowed(trie):
+    assert trie.decide("/cascade/temp_notes/scratch.md")["allowed"]
+
+
+def test_repo_gates(root):
+    gates = WriteGates(root)
+    assert gates.check("cascade/domains/client/index.md", "appendOrReplace")["allowed"]
+    assert not gates.check("cascade/domains/../00_BOOTSTRAP.md", "appendOrReplace")["allowed"]
+    assert not gates.check("cascade/protocols/../../outside.md")["allowed"]
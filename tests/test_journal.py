@@ -0,0 +1,227 @@
+import json
+import os
+
+import pytest
+
+from conftest import CLIENT_INDEX, SERVER_INDEX
+from contextcascade import journal
+from contextcascade.audit import AuditLog
+from contextcascade.counterstore import CounterStore
+from contextcascade.locks import ScopeLocks, lock_states
+from contextcascade.loop import LoopController, SafeHoldError
+from contextcascade.objects import ObjectStore
+from contextcascade.tree import key_path
+
+COUNTER = "cascade/lifecycle/counter.md"
+LOGS = [
+    "cascade/change_log/recent.md",
+    "cascade/job_logs/recent.md",
+    "cascade/checkpoints/loop_checkpoint.md",
+    "cascade/lifecycle/counter.md",
+]
+
+
+class Crash(BaseException):
+    """
+    Stands in for the process dying: nothing in the loop handles it.
+    """
+
+
+def crash(controller):
+    """
+    Leaves the state a killed process would: the kernel drops its locks
+    and its journal's owner is gone.
+    """
+    for lock in controller.locks.held.values():
+        os.close(lock._fd)
+        lock._fd = None
+    controller.locks.held = {}
+    controller.journal.manifest["owner"] = "crashed"
+    controller.journal._write_manifest()
+
+
+def crash_in_g(monkeypatch, controller):
+    def record_tree(keys):
+        raise Crash()
+
+    # After the flush and the counter commit, before the journal commit.
+    monkeypatch.setattr(controller, "record_tree", record_tree)
+
+
+def snapshot_files(root, paths):
+    return {path: key_path(root, path).read_bytes() for path in paths}
+
+
+def counter_values(root):
+    with CounterStore(root) as store:
+        return store.values()
+
+
+def test_rollback_restores_files_and_tails(root):
+    key_path(root, "cascade/temp_notes/new.md").unlink(missing_ok=True)
+    index = key_path(root, CLIENT_INDEX)
+    log = key_path(root, "cascade/change_log/recent.md")
+    before = index.read_bytes(), log.read_bytes()
+
+    pending = journal.WriteJournal.begin(root, "job", [CLIENT_INDEX, "cascade/temp_notes/new.md"])
+    pending.add_tails({"cascade/change_log/recent.md": len(before[1])})
+    index.write_bytes(b"rewritten")
+    key_path(root, "cascade/temp_notes/new.md").write_bytes(b"created")
+    with open(log, "ab") as f:
+        f.write(b"\n- appended\n")
+    pending.rollback()
+
+    assert (index.read_bytes(), log.read_bytes()) == before
+    assert not key_path(root, "cascade/temp_notes/new.md").exists()
+    assert journal.pending(root) == []
+
+
+def test_failure_in_g_rolls_back(root, run_loop, monkeypatch, read):
+    run_loop(job_id="first")
+    files = snapshot_files(root, [CLIENT_INDEX] + LOGS)
+    counters = counter_values(root)
+
+    controller = LoopController(root)
+
+    def snapshot(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(controller.objects, "snapshot", snapshot)
+    with pytest.raises(SafeHoldError) as info:
+        run_loop(job_id="second", controller=controller)
+
+    assert info.value.step == "WRITE" and info.value.event == "writeFailure"
+    assert snapshot_files(root, [CLIENT_INDEX] + LOGS) == files
+    assert counter_values(root) == counters
+    assert journal.pending(root) == []
+    assert "writeFailure" in read("cascade/lifecycle/drift_flag.md")
+    assert {info["scope"]: info["status"] for info in lock_states(root)}["global"] == "cleared"
+    assert "failed" in {info["status"] for info in lock_states(root)}
+
+
+def test_counter_skip_audit_is_rolled_back(root, run_loop, monkeypatch, read):
+    run_loop(job_id="first")
+    # Move the global counter on out of band, so the next checkpoint
+    # skips LoopIDs and step G logs a counterSkip.
+    with CounterStore(root) as store:
+        values = store.values()
+        values[COUNTER] += 3
+        store.commit(values, tag="out-of-band")
+    audit_view = read("cascade/audit/meta_audit.md")
+
+    controller = LoopController(root)
+
+    def record_tree(keys):
+        assert AuditLog(root).query(type="counterSkip")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(controller, "record_tree", record_tree)
+    with pytest.raises(SafeHoldError):
+        run_loop(job_id="second", controller=controller)
+
+    assert AuditLog(root).query(type="counterSkip") == []
+    assert [event["type"] for event in AuditLog(root).tail(1)] == ["writeFailure"]
+    assert read("cascade/audit/meta_audit.md").count("counterSkip") == audit_view.count("counterSkip")
+
+
+def test_snapshot_refs_are_rolled_back(root, run_loop, monkeypatch):
+    run_loop(job_id="first")
+    store = ObjectStore(root)
+    head, refs = store.head(), store.checkpoints()
+
+    controller = LoopController(root)
+
+    def record_tree(keys):
+        assert store.head() != head
+        raise OSError("disk full")
+
+    monkeypatch.setattr(controller, "record_tree", record_tree)
+    with pytest.raises(SafeHoldError):
+        run_loop(job_id="second", controller=controller)
+
+    assert store.head() == head
+    assert store.checkpoints() == refs
+    assert store.flatten(store.resolve("HEAD")) == store.flatten(store.resolve(refs[-1]))
+
+
+def test_crash_in_g_is_recovered_at_next_read(root, run_loop, monkeypatch):
+    run_loop(job_id="first")
+    files = snapshot_files(root, [CLIENT_INDEX] + LOGS)
+    counters = counter_values(root)
+
+    crashed = LoopController(root)
+    crash_in_g(monkeypatch, crashed)
+    with pytest.raises(Crash):
+        run_loop(job_id="crashed", controller=crashed)
+    crash(crashed)
+    assert counter_values(root)[COUNTER] == counters[COUNTER] + 1
+
+    controller = LoopController(root)
+    assert controller.recover_interrupted() == ["crashed"]
+    assert snapshot_files(root, [CLIENT_INDEX] + LOGS) == files
+    assert counter_values(root) == counters
+    assert journal.pending(root) == []
+    assert [event["details"] for event in AuditLog(root).query(type="recovery-complete")][0].startswith(
+        "Interrupted WRITE for job `crashed`"
+    )
+
+
+def test_crash_in_g_is_recovered_at_d0(root, run_loop, monkeypatch, read):
+    run_loop(job_id="first")
+    client_before = read(CLIENT_INDEX)
+    counters = counter_values(root)
+
+    # The second loop writes the server domain. While it is in step C,
+    # a loop on the client domain crashes in step G, after the second
+    # loop's READ has already looked for journals.
+    crashed = LoopController(root)
+    crash_in_g(monkeypatch, crashed)
+    controller = LoopController(root)
+    post_write = controller.post_write
+
+    def post_write_with_crash(targets, edits):
+        with pytest.raises(Crash):
+            run_loop(job_id="crashed", controller=crashed)
+        crash(crashed)
+        return post_write(targets, edits)
+
+    monkeypatch.setattr(controller, "post_write", post_write_with_crash)
+    result = run_loop({SERVER_INDEX: read(SERVER_INDEX) + "\n- server\n"}, job_id="server", controller=controller)
+
+    assert read(CLIENT_INDEX) == client_before
+    assert read(SERVER_INDEX).endswith("\n- server\n")
+    assert result["loopId"] == counters[COUNTER] + 1
+    assert counter_values(root)[COUNTER] == counters[COUNTER] + 1
+    checkpoints = read("cascade/checkpoints/loop_checkpoint.md")
+    assert "jobId `server`" in checkpoints and "jobId `crashed`" not in checkpoints
+    assert journal.pending(root) == []
+    assert len(AuditLog(root).query(type="recovery-complete")) == 1
+
+
+def test_lock_conflict_enters_safe_hold(root, run_loop, read):
+    before = read(CLIENT_INDEX)
+    other = ScopeLocks(root)
+    other.acquire("other-job", ["client"], "other-agent")
+    controller = LoopController(root, holder="blocked")
+    controller.locks.wait = 0
+    try:
+        with pytest.raises(SafeHoldError) as info:
+            run_loop(job_id="blocked", controller=controller)
+    finally:
+        other.release()
+    assert info.value.event == "lockConflict"
+    assert "other-job" in info.value.reason
+    assert read(CLIENT_INDEX) == before
+    assert "lockConflict" in read("cascade/lifecycle/drift_flag.md")
+    event = AuditLog(root).query(type="lockConflict")[0]
+    assert event["severity"] == "CRITICAL"
+
+
+def test_journal_manifest_records_targets(root):
+    pending = journal.WriteJournal.begin(root, "job-7", [CLIENT_INDEX])
+    with open(pending.directory / journal.MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["jobId"] == "job-7"
+    assert list(manifest["targets"]) == [CLIENT_INDEX]
+    pending.commit()
+    assert journal.pending(root) == []
@@ -0,0 +1,94 @@
+import pytest
+
+from contextcascade.lifespans import LifespanError, LifespanEvaluator, compile_table
+from contextcascade.locks import GLOBAL_SCOPE
+from contextcascade.loop import LoopController
+
+TABLE = """# Lifespans
+
+| Domain Scope | `reread_threshold` | `prune_threshold` | `merge_threshold` |
+|--------------|--------------------|-------------------|-------------------|
+| global (`counter.md`) | 5 | 7 | - |
+| client | 3 | `0` | 8 |
+
+Notes after the table.
+"""
+GLOBAL = "cascade/lifecycle/counter.md"
+CLIENT = "cascade/lifecycle/client.md"
+
+
+def _due(actions):
+    return [(action["action"], action["scope"], action["window"]) for action in actions]
+
+
+def test_compile_table(root):
+    table = compile_table(TABLE, root)
+    assert table.scopes == ["global", "client"]
+    assert table.keys == [GLOBAL, CLIENT]
+    assert list(table.columns["force_reread"]) == [5, 3]
+    assert list(table.columns["schedule_prune"]) == [7, 0]
+    assert list(table.columns["schedule_merge"]) == [0, 8]
+    assert list(table.rows["schedule_prune"]) == [0]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "# No table here\n",
+        TABLE.replace("| client | 3 |", "| client | three |"),
+        TABLE.replace("| client | 3 | `0` | 8 |", "| client | 3 |"),
+    ],
+)
+def test_compile_table_rejects_bad_tables(root, text):
+    with pytest.raises(LifespanError):
+        compile_table(text, root)
+
+
+def test_thresholds_are_windows(root):
+    table = compile_table(TABLE, root)
+    assert table.evaluate({GLOBAL: 4, CLIENT: 2}) == []
+    assert _due(table.evaluate({GLOBAL: 7, CLIENT: 8})) == [
+        ("force_reread", "global", 1),
+        ("force_reread", "client", 2),
+        ("schedule_prune", "global", 1),
+        ("schedule_merge", "client", 1),
+    ]
+    marks = {"force_reread:" + GLOBAL: 1}
+    assert _due(table.evaluate({GLOBAL: 9}, marks)) == [("schedule_prune", "global", 1)]
+    assert _due(table.evaluate({GLOBAL: 10}, marks)) == [("force_reread", "global", 2), ("schedule_prune", "global", 1)]
+
+
+def test_acknowledge_persists_and_merges_marks(root):
+    first = LifespanEvaluator(root)
+    second = LifespanEvaluator(root)
+    table = first.table
+    values = {key: 0 for key in table.keys}
+    values[table.keys[0]] = table.columns["force_reread"][0] * 2
+    actions = first.evaluate(values)
+    assert actions
+    first.acknowledge(actions)
+    assert first.evaluate(values) == []
+
+    # A second evaluator, loaded before the first acknowledged, keeps the
+    # first one's marks and never lowers them.
+    other = dict(actions[0], counter=table.keys[1])
+    second.acknowledge([other, dict(actions[0], window=1)])
+    reloaded = LifespanEvaluator(root)
+    assert reloaded.marks[f"force_reread:{table.keys[0]}"] == 2
+    assert reloaded.marks[f"force_reread:{table.keys[1]}"] == 2
+    assert len(reloaded.marks) == len(actions) + 1
+    assert reloaded.evaluate(values) == []
+
+
+def test_loop_acknowledges_under_the_global_lock(root, run_loop, monkeypatch):
+    held = []
+    controller = LoopController(root)
+
+    def acknowledge(self, actions):
+        held.append(GLOBAL_SCOPE in controller.locks.held)
+
+    monkeypatch.setattr(LifespanEvaluator, "acknowledge", acknowledge)
+    with controller:
+        run_loop(controller=controller)
+    assert held == [True]
+    assert not controller.locks.held
@@ -0,0 +1,64 @@
+import pytest
+
+from conftest import CLIENT_INDEX
+from contextcascade.loadmode import LoadModeResolver
+from contextcascade.meta import MetaIndex
+from contextcascade.tree import key_path
+
+NOTE = "cascade/domains/client/notes/deep.md"
+
+
+def make_resolver(root):
+    index = MetaIndex(root)
+    index.refresh()
+    return index, LoadModeResolver(index)
+
+
+def test_lean_is_core_indexes_and_counters(root):
+    index, resolver = make_resolver(root)
+    lean = resolver.resolve("lean")
+    assert {"cascade/index.md", CLIENT_INDEX, "cascade/lifecycle/counter.md"} <= lean
+    for key in lean:
+        meta = index.get(key)
+        assert (
+            meta["fileType"] == "counter"
+            or meta.get("subtype") == "index"
+            or (meta["fileType"] in ("structural", "immutable") and key.count("/") == 1)
+        )
+    assert "cascade/domains/client/architecture.md" not in lean
+
+
+def test_domain_and_full_modes(root):
+    index, resolver = make_resolver(root)
+    client = resolver.resolve("domain", "client")
+    assert CLIENT_INDEX in client
+    assert all(index.get(key)["routeScope"] == "client" for key in client)
+    full = resolver.resolve("full")
+    assert full == {key for key, meta in index.items() if meta is not None}
+    assert client < full
+    assert resolver.resolve("domain", "no-such-scope") == frozenset()
+
+
+def test_bad_modes_are_rejected(root):
+    _, resolver = make_resolver(root)
+    with pytest.raises(ValueError):
+        resolver.resolve("domain")
+    with pytest.raises(ValueError):
+        resolver.resolve("everything")
+
+
+def test_sets_follow_the_index_generation(root):
+    index, resolver = make_resolver(root)
+    lean = resolver.resolve("lean")
+    assert resolver.resolve("lean") is lean
+
+    path = key_path(root, NOTE)
+    path.parent.mkdir()
+    path.write_text(
+        '<!-- @meta {"fileType": "structural", "subtype": "index", "editPolicy": "readonly"} -->\n# Deep\n',
+        encoding="utf-8",
+    )
+    index.refresh()
+    assert NOTE in resolver.resolve("lean")
+    assert NOTE in resolver.resolve("full")
+    assert NOTE in resolver.resolve("domain", "global")
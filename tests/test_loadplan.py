@@ -0,0 +1,59 @@
+from contextcascade import archive, validate
+from contextcascade.loadplan import LoadPlanner
+from contextcascade.meta import MetaIndex
+from contextcascade.tokens import TokenLedger
+from contextcascade.tree import key_path
+
+
+def make_planner(root):
+    index = MetaIndex(root)
+    index.refresh()
+    ledger = TokenLedger(root)
+    ledger.refresh()
+    return LoadPlanner(root, index, ledger)
+
+
+def test_plan_fits_budget(root):
+    plan = make_planner(root).plan("client", budget=4000)
+    assert plan["files"]
+    assert plan["used"] <= 4000
+    assert sum(tokens for _, tokens in plan["files"]) == plan["used"]
+
+
+def test_written_plan_passes_validation(root):
+    planner = make_planner(root)
+    key = planner.write(planner.plan("client", budget=4000))
+    assert key == "cascade/load_plans/auto_plan_client.md"
+    assert validate.main(["--root", root, "--no-cache", str(key_path(root, key))]) == 0
+
+
+RECENT = "cascade/change_log/recent.md"
+SUMMARY = "cascade/change_log/summary.md"
+
+
+def fill_buffer(root, run_loop, loops=4):
+    for i in range(loops):
+        run_loop(job_id=f"job-{i}", intent="A long change description. " * 60)
+
+
+def test_archived_summary_is_not_substituted(root, run_loop):
+    fill_buffer(root, run_loop)
+    log = archive.Archive(root, SUMMARY)
+    log.append(("- **ChangeID:** old\n  **Description:** " + "history " * 400 + "\n").encode("utf-8"))
+    log.compress(1)
+
+    planner = make_planner(root)
+    cost = planner.ledger.tokens(RECENT)
+    assert planner.ledger.tokens(SUMMARY) < cost
+    plan = planner.plan("global", budget=cost * 2)
+    assert plan["substituted"] == {}
+
+
+def test_summary_with_entries_is_substituted(root, run_loop):
+    fill_buffer(root, run_loop)
+    path = key_path(root, SUMMARY)
+    path.write_text(path.read_text(encoding="utf-8") + "\n- **ChangeID:** legacy\n  **Description:** kept\n", encoding="utf-8")
+
+    planner = make_planner(root)
+    plan = planner.plan("global", budget=planner.ledger.tokens(RECENT) * 2)
+    assert plan["substituted"] == {RECENT: SUMMARY}
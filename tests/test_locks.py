@@ -0,0 +1,28 @@
+from contextcascade.locks import VIEW_FILE, ScopeLocks, lock_states, render_view
+from contextcascade.tree import key_path
+
+
+def test_render_view_keeps_crlf(root):
+    path = key_path(root, VIEW_FILE)
+    before = path.read_bytes()
+    assert b"\r\n" in before
+
+    locks = ScopeLocks(root)
+    locks.acquire("job-1", ["client"], "agent")
+    render_view(root)
+    held = path.read_bytes()
+    assert b"| job-1   | in-progress  |\r\n" in held
+    assert held.count(b"\r\n") == before.count(b"\r\n")
+
+    locks.release()
+    render_view(root)
+    assert path.read_bytes() == before
+
+
+def test_failed_lock_is_reported_until_cleared(root):
+    locks = ScopeLocks(root)
+    locks.acquire("job-2", ["server"], "agent")
+    locks.release("failed")
+    states = {info["scope"]: info for info in lock_states(root)}
+    assert states["server"]["status"] == "failed"
+    assert states["server"]["jobId"] == "job-2"
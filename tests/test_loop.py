@@ -0,0 +1,45 @@
+import pathlib
+
+import pytest
+
+from conftest import CLIENT_INDEX
+from contextcascade.counters import read_count
+from contextcascade.loop import SafeHoldError
+
+
+def test_loop_writes_target_and_logs(root, run_loop, read):
+    result = run_loop(job_id="append")
+    assert result["written"] == [CLIENT_INDEX]
+    assert read(CLIENT_INDEX).endswith("\n- append\n")
+    assert "append" in read("cascade/checkpoints/loop_checkpoint.md")
+
+
+def test_counter_views_follow_the_store(root, run_loop, read):
+    first = run_loop(job_id="first")
+    second = run_loop(job_id="second")
+    assert second["loopId"] == first["loopId"] + 1
+    assert "cascade/lifecycle/counter.md" in second["rendered"]
+    assert read_count(read("cascade/lifecycle/counter.md")) == second["loopId"]
+    assert read_count(read("cascade/lifecycle/client.md")) == read_count(read("cascade/lifecycle/counter.md"))
+    assert "cascade/lifecycle/server.md" not in second["rendered"]
+
+
+def test_dotdot_target_cannot_bypass_immutability(root, run_loop, read):
+    before = read("cascade/00_BOOTSTRAP.md")
+    with pytest.raises(SafeHoldError) as info:
+        run_loop({"cascade/domains/../00_BOOTSTRAP.md": "pwned"})
+    assert info.value.event == "immutableWriteAttempt"
+    assert "/cascade/00_BOOTSTRAP.md" in info.value.reason
+    assert read("cascade/00_BOOTSTRAP.md") == before
+
+
+@pytest.mark.parametrize("target", ["../../outside.md", "cascade/domains/../../outside.md", "/cascade/../outside.md"])
+def test_target_outside_root_enters_safe_hold(root, run_loop, read, target):
+    with pytest.raises(SafeHoldError) as info:
+        run_loop({target: "escaped"})
+    assert info.value.event == "gateViolation"
+    assert "outside the cascade root" in info.value.reason
+    parent = pathlib.Path(root).parent
+    assert not (parent / "outside.md").exists()
+    assert not (parent.parent / "outside.md").exists()
+    assert "gateViolation" in read("cascade/lifecycle/drift_flag.md")
@@ -0,0 +1,89 @@
+import hashlib
+
+from conftest import CLIENT_INDEX, SERVER_INDEX
+from contextcascade import merkle
+from contextcascade.audit import AuditLog
+from contextcascade.loop import LoopController
+from contextcascade.tree import key_path
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_update_matches_full_rebuild():
+    files = {
+        "cascade/index.md": _digest("index"),
+        "cascade/domains/client/index.md": _digest("client"),
+        "cascade/domains/server/index.md": _digest("server"),
+        "cascade/audit/meta_audit.md": _digest("audit"),
+    }
+    tree = merkle.MerkleTree(files)
+    changes = {
+        "cascade/domains/client/index.md": _digest("client v2"),
+        "cascade/domains/server/index.md": None,
+        "cascade/domains/schema/rules/new.md": _digest("new"),
+    }
+    tree.update(changes)
+    files.update(changes)
+    rebuilt = merkle.MerkleTree({key: digest for key, digest in files.items() if digest is not None})
+    assert tree.root == rebuilt.root
+    assert tree.nodes == rebuilt.nodes
+    assert "cascade/domains/server" not in tree.nodes
+
+    restored = merkle.MerkleTree.from_dict(tree.to_dict())
+    assert restored.root == tree.root
+    assert restored.diff(rebuilt) == []
+    assert restored.update({"cascade/index.md": _digest("index v2")}).diff(rebuilt) == ["cascade/index.md"]
+
+
+def test_loop_keeps_record_current(root, run_loop):
+    run_loop(job_id="first")
+    recorded = merkle.load_recorded(root)
+    assert recorded is not None
+    # Only the lock view, rendered after step G, may differ.
+    assert set(merkle.changes_since(recorded, root)) <= {"cascade/_locks/active_edit.lock"}
+
+    run_loop(job_id="second")
+    assert not AuditLog(root).query(type="unexpectedMutation")
+    assert set(merkle.changes_since(merkle.load_recorded(root), root)) <= {"cascade/_locks/active_edit.lock"}
+
+
+def test_edit_outside_loop_is_reported_once(root, run_loop, read):
+    run_loop(job_id="first")
+    path = key_path(root, SERVER_INDEX)
+    path.write_text(read(SERVER_INDEX) + "\nhand edit\n", encoding="utf-8")
+
+    controller = LoopController(root)
+    run_loop(job_id="second", controller=controller)
+    events = AuditLog(root).query(type="unexpectedMutation")
+    assert len(events) == 1
+    assert f"/{SERVER_INDEX}" in events[0]["details"]
+    assert f"/{CLIENT_INDEX}" not in events[0]["details"]
+    assert merkle.unexpected_mutations(root, ["cascade/_locks/active_edit.lock"]) == []
+
+    run_loop(job_id="third")
+    assert len(AuditLog(root).query(type="unexpectedMutation")) == 1
+
+
+def test_changes_since_compares_roots_then_diffs(root, monkeypatch, read):
+    recorded = merkle.record(root)
+    calls = []
+    diff = merkle.MerkleTree.diff
+
+    def counting_diff(self, other):
+        calls.append(other.root)
+        return diff(self, other)
+
+    monkeypatch.setattr(merkle.MerkleTree, "diff", counting_diff)
+    assert merkle.changes_since(recorded, root) == {}
+    assert calls == []
+
+    key_path(root, SERVER_INDEX).write_text(read(SERVER_INDEX) + "\nedited\n", encoding="utf-8")
+    key_path(root, "cascade/temp_notes/scratch.md").write_text("new\n", encoding="utf-8")
+    key_path(root, CLIENT_INDEX).unlink()
+    changes = merkle.changes_since(recorded, root)
+    assert len(calls) == 1
+    assert set(changes) == {SERVER_INDEX, CLIENT_INDEX, "cascade/temp_notes/scratch.md"}
+    assert changes[CLIENT_INDEX] is None
+    assert changes[SERVER_INDEX] == _digest(read(SERVER_INDEX))
@@ -0,0 +1,69 @@
+import os
+
+from conftest import CLIENT_INDEX
+from contextcascade.meta import MetaIndex
+from contextcascade.tree import key_path
+
+SCOPELESS = "cascade/temp_notes/scopeless.md"
+
+
+def test_query_treats_missing_route_scope_as_global(root):
+    key_path(root, SCOPELESS).write_text('<!-- @meta {"fileType": "temporary", "editPolicy": "replaceOnly"} -->\n')
+    index = MetaIndex(root)
+    index.refresh()
+    assert SCOPELESS in index.by_scope("global")
+    assert SCOPELESS in index.query(routeScope="global")
+    assert SCOPELESS in index.query(routeScope="global", fileType="temporary")
+    assert SCOPELESS not in index.query(routeScope="client")
+
+
+def test_same_tick_rewrite_is_picked_up(root):
+    path = key_path(root, CLIENT_INDEX)
+    os.utime(path)
+    index = MetaIndex(root)
+    index.refresh()
+    assert index.get(CLIENT_INDEX)["routeScope"] == "client"
+    index.save()
+    st = path.stat()
+
+    # Rewritten within the same mtime tick it was indexed in: same size
+    # and mtime, so only the racy-mtime guard can tell.
+    path.write_text(path.read_text(encoding="utf-8").replace('"client"', '"cliemt"', 1), encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    index = MetaIndex(root)
+    index.refresh()
+    assert index.get(CLIENT_INDEX)["routeScope"] == "cliemt"
+
+
+def test_refresh_reads_headers_only(root, monkeypatch):
+    path = key_path(root, CLIENT_INDEX)
+    index = MetaIndex(root)
+    index.refresh()
+    generation = index.generation
+
+    # A body the size of many read chunks: only the header is read back.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n" + "body line\n" * 100_000)
+    read = []
+    real_open = open
+
+    def tracking_open(file, mode="r", *args, **kwargs):
+        handle = real_open(file, mode, *args, **kwargs)
+        if str(file) == str(path):
+            real_read = handle.read
+
+            def counted(size=-1):
+                data = real_read(size)
+                read.append(len(data))
+                return data
+
+            handle.read = counted
+        return handle
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    assert index.refresh() == 0
+    monkeypatch.undo()
+    assert 0 < sum(read) < 64 * 1024
+    assert index.generation == generation
+    assert index.get(CLIENT_INDEX)["routeScope"] == "client"
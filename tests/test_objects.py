@@ -0,0 +1,141 @@
+import hashlib
+import os
+
+import pytest
+
+from conftest import CLIENT_INDEX, SERVER_INDEX
+from contextcascade import archive
+from contextcascade.hashcache import HashCache
+from contextcascade.integrity import SNAPSHOT_FILE, format_snapshot, verify
+from contextcascade.locks import GLOBAL_SCOPE, LockConflict, ScopeLocks
+from contextcascade.objects import ObjectStore, preserve_snapshot, restore_snapshot
+from contextcascade.tree import key_path
+
+CLIENT = CLIENT_INDEX.partition("/")[2]
+SERVER = SERVER_INDEX.partition("/")[2]
+NEW = "domains/client/new.md"
+SUMMARY = "cascade/change_log/summary.md"
+
+
+def _entry(n):
+    return f"### Change {n}\n- **ChangeID:** change-{n}\n- **Timestamp:** 2025-01-0{n}T00:00:00Z\n- words\n".encode()
+
+
+def _blob(store, text):
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    store.put(data)
+    return digest
+
+
+def test_update_tree_matches_write_tree(root):
+    store = ObjectStore(root)
+    files = {"index.md": _blob(store, "index"), CLIENT: _blob(store, "client"), SERVER: _blob(store, "server")}
+    base = store.write_tree(files)
+    changes = {CLIENT: _blob(store, "client v2"), SERVER: None, NEW: _blob(store, "new")}
+    tree = store.update_tree(base, changes)
+    files.update(changes)
+    assert tree == store.write_tree({rel: digest for rel, digest in files.items() if digest is not None})
+    assert "server" not in store.read_tree(store.read_tree(tree)["domains"][1])
+    assert store.update_tree(tree, {}) == tree
+    assert store.update_tree(store.write_tree({SERVER: files["index.md"]}), {SERVER: None}) is None
+
+
+def test_changed_snapshot_matches_full_snapshot(root, read):
+    store = ObjectStore(root)
+    hashes = HashCache(root)
+    store.snapshot(hashes, loop_id=1)
+    key_path(root, CLIENT_INDEX).write_text(read(CLIENT_INDEX) + "\n- edited\n", encoding="utf-8")
+    key_path(root, SERVER_INDEX).unlink()
+    tree = store.snapshot(hashes, loop_id=2, changed=[CLIENT_INDEX, SERVER_INDEX])
+    assert store.checkpoints() == [1, 2]
+    assert store.resolve(2) == store.resolve("HEAD") == tree
+    assert store.snapshot(hashes) == tree
+    assert SERVER not in store.flatten(tree)
+
+
+def test_live_restore_rewrites_only_changed_files(root, read):
+    store = ObjectStore(root)
+    hashes = HashCache(root)
+    store.snapshot(hashes, loop_id=1)
+    original = read(CLIENT_INDEX)
+    key_path(root, CLIENT_INDEX).write_text(original + "\n- edited\n", encoding="utf-8")
+    key_path(root, "cascade/" + NEW).write_text("new\n", encoding="utf-8")
+    key_path(root, SERVER_INDEX).unlink()
+
+    result = store.restore_tree(1, hashes)
+    assert result == {"restored": [CLIENT, SERVER], "removed": [], "extra": [NEW]}
+    assert read(CLIENT_INDEX) == original
+    assert key_path(root, SERVER_INDEX).exists()
+    assert key_path(root, CLIENT_INDEX).stat().st_nlink == 1
+
+    assert store.restore_tree(1, hashes, prune=True) == {"restored": [], "removed": [NEW], "extra": []}
+    assert not key_path(root, "cascade/" + NEW).exists()
+
+
+def test_restore_into_dest_links_and_prunes(root, tmp_path):
+    store = ObjectStore(root)
+    tree = store.snapshot(HashCache(root), loop_id=1)
+    dest = tmp_path / "at_1"
+    result = store.restore_tree(1, dest=dest, link=True)
+    assert set(result["restored"]) == set(store.flatten(tree))
+    digest = store.flatten(tree)[CLIENT]
+    assert os.path.samefile(dest / CLIENT, store.find(digest))
+
+    (dest / "stray.md").write_text("stray\n", encoding="utf-8")
+    assert store.restore_tree(1, dest=dest) == {"restored": [], "removed": [], "extra": ["stray.md"]}
+    assert store.restore_tree(1, dest=dest, prune=True)["removed"] == ["stray.md"]
+
+
+def test_live_restore_rewinds_summary_archive(root):
+    store = ObjectStore(root)
+    hashes = HashCache(root)
+    log = archive.Archive(root, SUMMARY)
+    log.append(_entry(1))
+    store.snapshot(hashes, loop_id=1)
+    index = log.index_path.read_bytes()
+    log.compress(1)
+    log.append(_entry(2))
+    tree = store.snapshot(hashes, loop_id=2, changed=[])
+    assert sorted(store.archived(tree)) == [
+        "_archive/change_log/summary/index.jsonl",
+        "_archive/change_log/summary/segments/000001.segz",
+        "_archive/change_log/summary/segments/000002.seg",
+    ]
+
+    result = store.restore_tree(1, hashes)
+    assert "_archive/change_log/summary/segments/000001.seg" in result["restored"]
+    assert sorted(result["removed"]) == [
+        "_archive/change_log/summary/segments/000001.segz",
+        "_archive/change_log/summary/segments/000002.seg",
+    ]
+    assert log.index_path.read_bytes() == index
+    log = archive.Archive(root, SUMMARY)
+    assert log.by_id("change-1") and not log.by_id("change-2")
+
+
+def test_restore_snapshot_repairs_under_global_lock(root):
+    store = ObjectStore(root)
+    hashes = HashCache(root)
+    original = key_path(root, CLIENT_INDEX).read_bytes()
+    with open(key_path(root, SNAPSHOT_FILE), "a", encoding="utf-8") as f:
+        f.write("\n" + format_snapshot({CLIENT_INDEX: hashlib.sha256(original).hexdigest()}) + "\n")
+    assert verify(root, hashes) == []
+    assert preserve_snapshot(root, store, hashes) == []
+    key_path(root, CLIENT_INDEX).write_bytes(original + b"tampered\n")
+    assert [key for key, _, _ in verify(root, hashes)] == [CLIENT_INDEX]
+
+    holder = ScopeLocks(root)
+    holder.acquire("other-job", [GLOBAL_SCOPE])
+    try:
+        with pytest.raises(LockConflict):
+            restore_snapshot(root, store, hashes, locks=ScopeLocks(root, wait=0))
+    finally:
+        holder.release()
+    assert key_path(root, CLIENT_INDEX).read_bytes() != original
+
+    assert restore_snapshot(root, store, hashes) == ([CLIENT_INDEX], [])
+    assert key_path(root, CLIENT_INDEX).read_bytes() == original
+    locks = ScopeLocks(root, wait=0)
+    locks.acquire("after", [GLOBAL_SCOPE])
+    locks.release()
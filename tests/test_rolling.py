@@ -0,0 +1,36 @@
+import os
+
+from contextcascade.rolling import LogIndex
+from contextcascade.tree import key_path
+
+RECENT = "cascade/change_log/recent.md"
+SUMMARY = "cascade/change_log/summary.md"
+ENTRY = "- **ChangeID:** {n}\n  **Details:** words\n"
+
+
+def test_append_drops_placeholder_and_sweep_moves_entries(root):
+    logs = LogIndex(root)
+    assert logs.count(RECENT) == 0
+    before = logs.count(SUMMARY)
+    assert logs.append(RECENT, [ENTRY.format(n=1), ENTRY.format(n=2)]) == 2
+    text = key_path(root, RECENT).read_text(encoding="utf-8")
+    assert "(No entries yet" not in text and text.endswith(ENTRY.format(n=2))
+
+    assert logs.sweep(RECENT, SUMMARY) == 2
+    assert logs.count(RECENT) == 0
+    assert logs.count(SUMMARY) == before + 2
+    logs.save()
+    assert LogIndex(root).count(SUMMARY) == before + 2
+
+
+def test_same_size_rewrite_in_the_same_tick_is_rescanned(root):
+    logs = LogIndex(root)
+    logs.append(RECENT, [ENTRY.format(n=1), ENTRY.format(n=2)])
+    assert logs.count(RECENT) == 2
+
+    path = key_path(root, RECENT)
+    st = path.stat()
+    # Same size, same mtime: the second entry becomes a continuation line.
+    path.write_bytes(path.read_bytes().replace(b"- **ChangeID:** 2", b"  **ChangeID:** 2"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert logs.count(RECENT) == 1
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from contextcascade.hashcache import hash_file
+from contextcascade.loop import SafeHoldError
+from contextcascade.spans import SpanIndex, find_spans
+from contextcascade.tree import key_path
+
+NOTE = "cascade/temp_notes/protected.md"
+
+
+@pytest.mark.parametrize(
+    "text, protected",
+    [
+        ("<!-- PROTECTED -->\nkeep\n<!-- END PROTECTED -->\n", True),
+        ("intro\n<!-- PROTECTED --> do not edit\nkeep\n<!-- END PROTECTED -->\n", True),
+        ("intro\r\n<!-- PROTECTED -->\r\nkeep\r\n<!-- END PROTECTED -->\r\n", True),
+        ("Mark blocks with `<!-- PROTECTED -->` comments.\n", False),
+    ],
+)
+def test_spans_agree_with_integrity(root, text, protected):
+    path = key_path(root, NOTE)
+    path.write_bytes(text.encode("utf-8"))
+    assert hash_file(path)[1] is protected
+    assert bool(find_spans(path.read_bytes())) is protected
+
+
+def test_check_edit(root):
+    path = key_path(root, NOTE)
+    original = b"intro\n<!-- PROTECTED -->\nkeep\n<!-- END PROTECTED -->\noutro\n"
+    path.write_bytes(original)
+    spans = SpanIndex(root)
+    assert spans.check_edit(NOTE, original.replace(b"outro", b"changed")) is None
+    assert "modified" in spans.check_edit(NOTE, original.replace(b"keep", b"lost"))
+    assert "removed" in spans.check_edit(NOTE, b"intro\n")
+
+
+def test_overlaps_is_an_interval_query(root):
+    path = key_path(root, NOTE)
+    data = b"intro\n<!-- PROTECTED -->\nkeep\n<!-- END PROTECTED -->\noutro\n"
+    path.write_bytes(data)
+    spans = SpanIndex(root)
+    start, end, _ = spans.spans(NOTE)[0]
+    assert spans.overlaps(NOTE, 0, start) is None
+    assert spans.overlaps(NOTE, start - 1, start + 1)[:2] == [start, end]
+    assert spans.overlaps(NOTE, start + 3, start + 3)[:2] == [start, end]
+    assert spans.overlaps(NOTE, end, len(data)) is None
+    assert spans.check_range(NOTE, len(data), len(data), b"- appended\n") is None
+    assert "overlaps" in spans.check_range(NOTE, start + 2, start + 4, b"x")
+    assert "new protected span" in spans.check_range(NOTE, len(data), len(data), b"<!-- PROTECTED -->\n")
+
+
+def test_same_tick_rewrite_is_rescanned(root):
+    path = key_path(root, NOTE)
+    path.write_bytes(b"intro\n" + b"x" * 18 + b"\nkeep\n")
+    spans = SpanIndex(root)
+    assert spans.spans(NOTE) == []
+    spans.save()
+    st = path.stat()
+    # Same size and mtime, within the racy window.
+    path.write_bytes(b"intro\n<!-- PROTECTED -->\nkeep\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert len(SpanIndex(root).spans(NOTE)) == 1
+
+
+def test_log_append_with_marker_enters_safe_hold(root, run_loop, read):
+    before = read("cascade/change_log/recent.md")
+    with pytest.raises(SafeHoldError) as info:
+        run_loop(job_id="marker", intent="sneaky\n<!-- PROTECTED -->\nlocked")
+    assert info.value.event == "protectedOverlap"
+    assert "/cascade/change_log/recent.md" in info.value.reason
+    assert read("cascade/change_log/recent.md") == before
@@ -0,0 +1,54 @@
+from conftest import CLIENT_INDEX
+from contextcascade import archive
+from contextcascade.tokens import TokenLedger, get_tokenizer
+from contextcascade.tree import key_path
+
+ENTRY = "### Change cold\n- **ChangeID:** cold-1\n- **Timestamp:** 2025-01-01T00:00:00Z\n- archived words here\n"
+HOT_ENTRY = "### Change hot\n- **ChangeID:** hot-1\n- **Timestamp:** 2025-01-02T00:00:00Z\n- newer words\n"
+
+
+def make_archive(root):
+    log = archive.Archive(root, "cascade/change_log/summary.md")
+    log.append(ENTRY.encode("utf-8"))
+    log.compress(1)
+    log.append(HOT_ENTRY.encode("utf-8"))
+    return log
+
+
+def test_counts_cold_and_hot_segments(root):
+    make_archive(root)
+    ledger = TokenLedger(root)
+    ledger.refresh()
+    count = get_tokenizer().count
+    cold = "cascade/_archive/change_log/summary/segments/000001.segz"
+    hot = "cascade/_archive/change_log/summary/segments/000002.seg"
+    assert ledger.tokens(cold) == count(ENTRY)
+    assert ledger.tokens(hot) == count(HOT_ENTRY)
+    assert ledger.domains["/cascade/_archive/"] == {"tokens": count(ENTRY) + count(HOT_ENTRY), "files": 2}
+
+
+def test_warm_refresh_reads_nothing(root, monkeypatch):
+    make_archive(root)
+    ledger = TokenLedger(root)
+    ledger.refresh()
+    ledger.save()
+
+    def chunks(self):
+        raise AssertionError("cold segment decompressed")
+
+    monkeypatch.setattr(archive.ColdSegment, "chunks", chunks)
+    ledger = TokenLedger(root)
+    stats = ledger.refresh()
+    assert stats["tokenized"] == stats["reused"] == stats["removed"] == 0
+    assert stats["cached"] == len(ledger.files)
+
+
+def test_changed_file_is_recounted(root):
+    ledger = TokenLedger(root)
+    ledger.refresh()
+    before = ledger.tokens(CLIENT_INDEX)
+    path = key_path(root, CLIENT_INDEX)
+    path.write_text(path.read_text(encoding="utf-8") + "\nmore words in the index\n", encoding="utf-8")
+    stats = ledger.refresh()
+    assert stats["tokenized"] == 1
+    assert ledger.tokens(CLIENT_INDEX) > before
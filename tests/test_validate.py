@@ -0,0 +1,71 @@
+import json
+import os
+
+from conftest import CLIENT_INDEX
+from contextcascade import validate
+from contextcascade.tree import key_path
+
+META = '<!-- @meta {{"fileType": "permanent", "editPolicy": "{policy}", "routeScope": "client"}} -->\n# Notes\n'
+NOTES = "cascade/domains/client/notes.md"
+
+
+def _cached_keys(root):
+    with open(validate.BatchValidator(root).cache_file, encoding="utf-8") as f:
+        return set(json.load(f)["files"])
+
+
+def test_unchanged_tree_is_served_from_cache(root):
+    first = validate.BatchValidator(root).run()
+    assert first["checked"] == len(first["files"]) > 0
+    second = validate.BatchValidator(root).run()
+    assert second["checked"] == 0
+    assert second["cached"] == len(first["files"])
+    assert second["files"] == first["files"]
+
+
+def test_parallel_run_matches_serial(root, monkeypatch):
+    serial = validate.BatchValidator(root, jobs=1, use_cache=False).run()
+    monkeypatch.setattr(validate, "PARALLEL_THRESHOLD", 1)
+    assert validate.BatchValidator(root, jobs=2, use_cache=False).run() == serial
+
+
+def test_same_size_rewrite_in_the_same_tick_is_revalidated(root):
+    path = key_path(root, NOTES)
+    path.write_text(META.format(policy="readonly"), encoding="utf-8")
+    assert validate.BatchValidator(root).run([path])["valid"]
+
+    st = path.stat()
+    path.write_text(META.format(policy="readOnly"), encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    report = validate.BatchValidator(root).run([path])
+    assert report["checked"] == 1
+    assert report["files"][NOTES]["message"] == f'Invalid editPolicy "readOnly" in {NOTES}'
+
+
+def test_missing_path_is_a_failure(root):
+    path = key_path(root, NOTES)
+    path.write_text(META.format(policy="readonly"), encoding="utf-8")
+    validate.BatchValidator(root).run([path])
+    path.unlink()
+    report = validate.BatchValidator(root).run([path, key_path(root, CLIENT_INDEX)])
+    assert not report["valid"] and report["failed"] == 1
+    assert report["files"][NOTES]["message"].startswith(f"Cannot read {NOTES}")
+    assert report["files"][CLIENT_INDEX]["valid"]
+    assert NOTES not in _cached_keys(root)
+
+
+def test_deleted_files_are_pruned_from_the_cache(root):
+    path = key_path(root, NOTES)
+    path.write_text(META.format(policy="readonly"), encoding="utf-8")
+    validate.BatchValidator(root).run()
+    assert NOTES in _cached_keys(root)
+    path.unlink()
+    report = validate.BatchValidator(root).run()
+    assert NOTES not in report["files"]
+    assert NOTES not in _cached_keys(root)
+
+
+def test_meta_block_must_open_the_file():
+    text = "# Title\n\n" + META.format(policy="readonly")
+    assert validate.validate_content(text, NOTES)["message"] == f"No @meta block found in {NOTES}"
+    assert validate.validate_content("\n  " + META.format(policy="readonly"), NOTES)["valid"]